@@ -0,0 +1,93 @@
+"""
+Columnar catalogue benchmark.
+
+Loads the same synthetic catalogue into InventoryManager twice, once with Product
+objects (the default) and once with columnar=True, each in a fresh process and data
+directory. For both modes it prints:
+- the memory allocated while the catalogue is loaded (tracemalloc)
+- the time for a bulk price change (apply_price_change)
+- the time for an inventory valuation (get_inventory_value)
+- the time for a low-stock filter (get_low_stock_products)
+- the time to write the changed catalogue (flush)
+
+Usage (from the repository root):
+    python -m benchmarks.columnar_catalogue [products]
+"""
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from decimal import Decimal
+
+from src.data.storage import JsonStorage
+from src.inventory.inventory_manager import InventoryManager
+
+CATEGORIES = ("Books", "Garden", "Kitchen", "Toys", "Tools")
+
+
+def write_catalogue(data_dir: str, count: int) -> None:
+    products = {
+        f"p{i:07d}": {
+            "id": f"p{i:07d}",
+            "name": f"Product {i}",
+            "description": f"Benchmark product number {i}",
+            "price": str(Decimal(100 + i % 9900) / 100),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "stock_quantity": i % 50,
+        }
+        for i in range(count)
+    }
+    with open(os.path.join(data_dir, "products.json"), "w", encoding="utf-8") as file:
+        json.dump(products, file)
+
+
+def measure(columnar: bool, count: int, results) -> None:
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_catalogue(data_dir, count)
+        storage = JsonStorage(data_dir=data_dir)
+        tracemalloc.start()
+        manager = InventoryManager(columnar=columnar, storage=storage)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        timings = {"memory_mb": memory / 2 ** 20}
+        with manager.batch():
+            start = time.perf_counter()
+            manager.apply_price_change(Decimal(10))
+            timings["price_change"] = time.perf_counter() - start
+            start = time.perf_counter()
+            manager.get_inventory_value()
+            timings["valuation"] = time.perf_counter() - start
+            start = time.perf_counter()
+            manager.get_low_stock_products(5)
+            timings["low_stock"] = time.perf_counter() - start
+            start = time.perf_counter()
+        timings["flush"] = time.perf_counter() - start
+        results.put(timings)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{count} products")
+    print(f"{'mode':>9} {'memory MB':>10} {'price s':>8} {'value s':>8} {'low s':>8} {'flush s':>8}")
+    results = multiprocessing.Queue()
+    measured = {}
+    for label, columnar in (("objects", False), ("columnar", True)):
+        # InventoryManager is a singleton, so every mode runs in its own process
+        worker = multiprocessing.Process(target=measure, args=(columnar, count, results))
+        worker.start()
+        timings = results.get()
+        worker.join()
+        measured[label] = timings
+        print(f"{label:>9} {timings['memory_mb']:>10.1f} {timings['price_change']:>8.3f} "
+              f"{timings['valuation']:>8.3f} {timings['low_stock']:>8.3f} {timings['flush']:>8.3f}")
+    objects, columnar = measured["objects"], measured["columnar"]
+    print(f"memory: {objects['memory_mb'] / columnar['memory_mb']:.1f}x smaller, "
+          f"price change: {objects['price_change'] / columnar['price_change']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Concurrency stress test for InventoryManager.
+
+Starts an increasing number of order worker threads against a shared catalogue.
+Each worker repeatedly reserves a few random products, simulates the rest of order
+processing (payment, shipping quote, ...) with a short sleep, then commits, or
+releases when the order is abandoned. The workers call InventoryManager directly;
+the benchmark adds no locking of its own.
+
+Every worker count is run against two InventoryManager configurations: the default
+striped locking over product ids and lock_stripes=1, where every stock change
+shares a single lock (the baseline). InventoryManager is a singleton, so each
+configuration runs in its own process and data directory. Throughput is printed
+for both, with the striped/single ratio. For each configuration the stock invariant
+is checked: initial stock == remaining stock + committed units.
+
+Usage (from the repository root):
+    python -m benchmarks.inventory_stress [products] [seconds_per_run] [work_ms]
+"""
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from decimal import Decimal
+
+from src.inventory.inventory_manager import InventoryManager
+from src.models.product import Product
+
+INITIAL_STOCK = 10 ** 9
+WORKER_COUNTS = (1, 2, 4, 8, 16)
+# label -> InventoryManager lock_stripes
+CONFIGURATIONS = (("single", 1), ("striped", 64))
+
+
+def populate(manager: InventoryManager, count: int) -> list:
+    with manager.batch():
+        for i in range(count):
+            manager.add_product(Product(
+                id=f"p{i:06d}",
+                name=f"Product {i}",
+                description="Stress test product",
+                price=Decimal("9.99"),
+                category="Stress",
+                stock_quantity=INITIAL_STOCK,
+            ))
+    return [f"p{i:06d}" for i in range(count)]
+
+
+def run(manager: InventoryManager, product_ids: list, workers: int, seconds: float, work_ms: float):
+    deadline = time.perf_counter() + seconds
+    orders = [0] * workers
+    committed = [0] * workers
+
+    def worker(index: int):
+        rng = random.Random(index)
+        while time.perf_counter() < deadline:
+            lines = [(product_id, rng.randint(1, 3)) for product_id in rng.sample(product_ids, 3)]
+            reservation = manager.reserve(lines)
+            if not reservation.ok:
+                continue
+            time.sleep(work_ms / 1000)
+            if rng.random() < 0.1:
+                manager.release(reservation)
+            else:
+                manager.commit(reservation)
+                committed[index] += sum(reservation.lines.values())
+            orders[index] += 1
+            # Read path: lock-free single-product read and catalogue snapshot
+            manager.get_product(rng.choice(product_ids))
+            if orders[index] % 50 == 0:
+                manager.get_all_products()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(orders) / elapsed, sum(committed)
+
+
+def measure(stripes: int, product_count: int, seconds: float, work_ms: float, results) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        manager = InventoryManager(lock_stripes=stripes)
+        product_ids = populate(manager, product_count)
+
+        throughput = {}
+        total_committed = 0
+        for workers in WORKER_COUNTS:
+            throughput[workers], committed = run(manager, product_ids, workers, seconds, work_ms)
+            total_committed += committed
+
+        remaining = sum(manager.get_product(product_id).stock_quantity for product_id in product_ids)
+        expected = INITIAL_STOCK * product_count - total_committed
+        manager.flush()
+        results.put((throughput, "OK" if remaining == expected else f"MISMATCH (expected {expected})"))
+
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    work_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+
+    print(f"{product_count} products, {seconds:.1f}s per run, {work_ms:.1f} ms simulated work per order")
+    results = multiprocessing.Queue()
+    measured = {}
+    for label, stripes in CONFIGURATIONS:
+        # InventoryManager is a singleton, so every configuration runs in its own process
+        worker = multiprocessing.Process(target=measure, args=(stripes, product_count, seconds, work_ms, results))
+        worker.start()
+        measured[label] = results.get()
+        worker.join()
+
+    single, striped = measured["single"][0], measured["striped"][0]
+    print(f"{'workers':>8} {'single/s':>10} {'striped/s':>10} {'striped/single':>15}")
+    for workers in WORKER_COUNTS:
+        print(f"{workers:>8} {single[workers]:>10.0f} {striped[workers]:>10.0f} "
+              f"{striped[workers] / single[workers]:>14.2f}x")
+    for label, (_, status) in measured.items():
+        print(f"stock invariant ({label}): {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Bulk order creation benchmark.
+
+Imports the same synthetic batch of orders twice against a fresh data directory:
+once by calling OrderFactory.create_order and JsonStorage.add_order per order (as the
+customer screen does), once with OrderFactory.create_orders(batch, storage). Both runs
+must create the same number of orders and send one notification per order; the time per
+order and the speed-up are printed.
+
+Usage (from the repository root):
+    python -m benchmarks.order_batch [orders] [products]
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+from src.data.storage import JsonStorage
+from src.inventory.inventory_manager import InventoryManager
+from src.models.customer import Customer
+from src.models.order_factory import OrderFactory, OrderRequest
+from src.models.product import Product
+
+
+def populate(manager: InventoryManager, count: int) -> list:
+    with manager.batch():
+        for i in range(count):
+            manager.add_product(Product(
+                id=f"p{i:06d}",
+                name=f"Product {i}",
+                description="Batch benchmark product",
+                price=Decimal("19.90"),
+                category="Bulk",
+                stock_quantity=10 ** 9,
+            ))
+    return [manager.get_product(f"p{i:06d}") for i in range(count)]
+
+
+def build_batch(products: list, count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    customers = [Customer(f"c{i}", f"Customer {i}", f"c{i}@example.com", "Address", "555") for i in range(50)]
+    return [
+        OrderRequest(
+            customer=rng.choice(customers),
+            products=[(product, rng.randint(1, 5)) for product in rng.sample(products, rng.randint(1, 4))],
+            shipping_type=rng.choice(["fast", "economic", "drone"]),
+            shipping_address="Address",
+        )
+        for _ in range(count)
+    ]
+
+
+def run_loop(batch: list, storage: JsonStorage) -> int:
+    created = 0
+    for request in batch:
+        order = OrderFactory.create_order(request.customer, request.products,
+                                          request.shipping_type, request.shipping_address)
+        if order:
+            storage.add_order(order.to_dict())
+            created += 1
+    return created
+
+
+def run_batch(batch: list, storage: JsonStorage) -> int:
+    return sum(result.ok for result in OrderFactory.create_orders(batch, storage))
+
+
+def main():
+    order_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    product_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        products = populate(InventoryManager(), product_count)
+        print(f"{order_count} orders over {product_count} products")
+        print(f"{'method':>14} {'seconds':>9} {'ms/order':>9} {'created':>8}")
+        timings = {}
+        for label, run in (("create_order", run_loop), ("create_orders", run_batch)):
+            storage = JsonStorage(data_dir=os.path.join(workdir, label))
+            batch = build_batch(products, order_count, seed=1)
+            # Notifications are printed per order; keep them out of the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                created = run(batch, storage)
+                elapsed = time.perf_counter() - start
+            timings[label] = elapsed
+            print(f"{label:>14} {elapsed:>9.2f} {elapsed / order_count * 1000:>9.3f} {created:>8}")
+        print(f"speed-up: {timings['create_order'] / timings['create_orders']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Serializer benchmark for JsonStorage.
+
+Builds a synthetic product catalogue and order history and measures save/load
+throughput for every installed codec. The data is written to plain collections
+("bench_products", "bench_orders") that have no storage hooks: saving "orders"
+itself would also time the status log sync, the customer index rebuild and the
+order partitioning.
+
+Usage (from the repository root):
+    python -m benchmarks.serializer_benchmark [products] [orders]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from src.data.serializers import available_codecs
+from src.data.storage import JsonStorage
+
+
+def build_catalogue(count: int) -> dict:
+    categories = ["Electronics", "Books", "Clothing", "Home", "Sports", "Toys"]
+    return {
+        f"p{i:07d}": {
+            "id": f"p{i:07d}",
+            "name": f"Product {i}",
+            "description": f"Synthetic description for product {i} " * 3,
+            "price": f"{random.uniform(1, 5000):.2f}",
+            "category": random.choice(categories),
+            "stock_quantity": random.randint(0, 500),
+        }
+        for i in range(count)
+    }
+
+
+def build_orders(count: int, product_ids: list) -> list:
+    start = datetime(2023, 1, 1)
+    statuses = ["created", "confirmed", "processing", "shipped", "delivered", "cancelled"]
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "customer_id": f"c{random.randint(0, count // 10 or 1):06d}",
+            "total_price": f"{random.uniform(10, 9000):.2f}",
+            "shipping_cost": random.choice(["10.00", "50.00", "100.00"]),
+            "status": random.choice(statuses),
+            "date": (start + timedelta(minutes=i)).isoformat(),
+            "items": [[random.choice(product_ids), random.randint(1, 5), random.randint(100, 500000)]],
+        }
+        for i in range(count)
+    ]
+
+
+def measure(storage: JsonStorage, name: str, data, repeat: int = 3):
+    save_times, load_times = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        storage.save_data(name, data)
+        save_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        storage.load_data(name)
+        load_times.append(time.perf_counter() - started)
+    size = os.path.getsize(storage._get_file_path(name))
+    return min(save_times), min(load_times), size
+
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    order_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+    random.seed(42)
+    catalogue = build_catalogue(product_count)
+    orders = build_orders(order_count, list(catalogue))
+
+    print(f"{product_count} products, {order_count} orders")
+    print(f"{'codec':<12} {'dataset':<9} {'size MB':>8} {'save s':>8} {'load s':>8} {'save MB/s':>10} {'load MB/s':>10}")
+    for codec in available_codecs():
+        with tempfile.TemporaryDirectory() as data_dir:
+            # Cache and fsync disabled: only serialization and file I/O are measured.
+            storage = JsonStorage(data_dir, cache_max_bytes=0, durable=False, serializer=codec)
+            for label, data in (("products", catalogue), ("orders", orders)):
+                save_s, load_s, size = measure(storage, f"bench_{label}", data)
+                mb = size / (1024 * 1024)
+                print(f"{codec:<12} {label:<9} {mb:>8.1f} {save_s:>8.3f} {load_s:>8.3f} "
+                      f"{mb / save_s:>10.1f} {mb / load_s:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
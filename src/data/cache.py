@@ -0,0 +1,136 @@
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from typing import Any, Iterable, Optional, Tuple
+
+
+def stat_signature(paths: Iterable[str]) -> Optional[Tuple]:
+    """Dosyaların (mtime, boyut, inode) bilgisinden doğrulama imzası üretir. Hiçbiri yoksa None döner."""
+    signature = []
+    found = False
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            signature.append(None)
+            continue
+        found = True
+        signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+    return tuple(signature) if found else None
+
+
+def copy_json(value: Any) -> Any:
+    """JSON yapıları için copy.deepcopy'den hızlı savunmacı kopya."""
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
+
+
+def readonly(value: Any) -> Any:
+    if isinstance(value, dict):
+        return ReadOnlyDict(value)
+    if isinstance(value, list):
+        return ReadOnlyList(value)
+    return value
+
+
+class ReadOnlyDict(Mapping):
+    """Önbellekteki sözlüğe kopyalamadan salt okunur erişim sağlar."""
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getitem__(self, key):
+        return readonly(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __repr__(self):
+        return f"ReadOnlyDict({self._data!r})"
+
+    def copy(self) -> dict:
+        return copy_json(self._data)
+
+
+class ReadOnlyList(Sequence):
+    """Önbellekteki listeye kopyalamadan salt okunur erişim sağlar."""
+    __slots__ = ("_data",)
+
+    def __init__(self, data: list):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ReadOnlyList(self._data[index])
+        return readonly(self._data[index])
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"ReadOnlyList({self._data!r})"
+
+    def copy(self) -> list:
+        return copy_json(self._data)
+
+
+class ReadCache:
+    """
+    Dosya başına ayrıştırılmış veriyi tutan LRU önbellek.
+    Bellek sınırı, kayıtların dosya boyutu üzerinden yaklaşık olarak hesaplanır.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Tuple, Any, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, signature: Tuple) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, key: str, signature: Tuple, value: Any) -> None:
+        size = sum(part[1] for part in signature if part)
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (signature, value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
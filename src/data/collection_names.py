@@ -0,0 +1,7 @@
+# Envanter katmanının depolarda tuttuğu koleksiyonların adları. Depolar (ör. SqliteStorage'ın JSON
+# göçü) bu koleksiyonları envanter sınıflarını içe aktarmadan bu adlarla okur.
+
+# Yeniden sipariş eşikleri (bkz. InventoryManager.set_reorder_threshold)
+REORDER_THRESHOLDS = "reorder_thresholds"
+# Stok defterinin ürün ID'si -> slot eşlemesi (bkz. StockLedger)
+STOCK_SLOTS = "stock_slots"
@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class ConcurrentModificationError(Exception):
+    """Karşılaştır-ve-değiştir kaydı, yeniden denemelere rağmen çakışmayla sonuçlandığında fırlatılır."""
+
+
+class InterProcessLock:
+    """
+    Bir dosya için süreçler arası danışma kilidi (advisory lock).
+    Aynı süreç içinde iş parçacıkları arasında yeniden girilebilir (reentrant) çalışır;
+    dosya kilidi yalnızca en dıştaki edinimde alınır.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                self._lock_fd(self._fd)
+            except BaseException:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._unlock_fd(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    @staticmethod
+    def _lock_fd(fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            return
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                # LK_LOCK yaklaşık 10 saniye sonra vazgeçer; kilit alınana kadar tekrar denenir.
+                time.sleep(0.01)
+
+    @staticmethod
+    def _unlock_fd(fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+class StripedLock:
+    """
+    Anahtarları sabit sayıda kilide (şerit) dağıtan kilit kümesi. Farklı şeritlere düşen anahtarlar
+    birbirini beklemez; aynı şeritteki anahtarlar sıralanır. Kilitler yeniden girilebilirdir.
+    """
+
+    def __init__(self, stripes: int = 64):
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def _index(self, key) -> int:
+        return hash(key) % len(self._locks)
+
+    def hold(self, *keys):
+        """Verilen anahtarların şeritlerini kilitleyen bağlam yöneticisi döner."""
+        # Şeritler her zaman artan sırada alınır; iki çoklu kilitleme birbirini kilitlenmeye (deadlock) sokmaz.
+        return _StripeGuard([self._locks[index] for index in sorted({self._index(key) for key in keys})])
+
+
+class _StripeGuard:
+    def __init__(self, locks):
+        self._locks = locks
+
+    def __enter__(self):
+        acquired = []
+        try:
+            for lock in self._locks:
+                lock.acquire()
+                acquired.append(lock)
+        except BaseException:
+            for lock in reversed(acquired):
+                lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for lock in reversed(self._locks):
+            lock.release()
+        return False
+
+
+def lock_range(fd: int, start: int, length: int) -> None:
+    """Dosyanın [start, start + length) bayt aralığını süreçler arası özel olarak kilitler (yalnızca POSIX)."""
+    fcntl.lockf(fd, fcntl.LOCK_EX, length, start)
+
+
+def unlock_range(fd: int, start: int, length: int) -> None:
+    fcntl.lockf(fd, fcntl.LOCK_UN, length, start)
+
+
+def supports_range_locks() -> bool:
+    return fcntl is not None
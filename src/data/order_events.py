@@ -0,0 +1,56 @@
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class OrderEventLog:
+    """
+    Sipariş durum değişikliklerinin append-only günlüğü.
+    Her satır bir siparişin yeni durumunu ve zamanını tutar: {"id", "status", "at"}; status None ise
+    sipariş silinmiştir. {"reset": true} satırı, sonrasındaki satırların tüm siparişlerin durumunu
+    baştan kurduğunu belirtir (günlük mevcut siparişlerden ilk kez kurulduğunda).
+    Okuyucular günlüğü kaldıkları bayt konumundan itibaren okuyarak bellekteki durumlarını günceller.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def append(self, changes: Iterable[Tuple[str, Optional[str]]], at: Optional[str] = None,
+               reset: bool = False) -> None:
+        """(sipariş ID'si, durum) çiftlerini tek bir yazmayla ekler; reset=True önce bir sıfırlama satırı yazar."""
+        at = at or datetime.now().isoformat()
+        lines = [json.dumps({"reset": True, "at": at}, separators=(",", ":"))] if reset else []
+        lines.extend(json.dumps({"id": order_id, "status": status, "at": at}, separators=(",", ":"))
+                     for order_id, status in changes)
+        if not lines:
+            return
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+    def read(self, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        offset'ten sonraki tamamlanmış satırları ve bir sonraki okumanın başlayacağı konumu döner.
+        Yarım yazılmış son satır bir sonraki okumaya bırakılır.
+        """
+        if not self.exists():
+            return [], 0
+        with open(self.path, "rb") as file:
+            if offset > os.fstat(file.fileno()).st_size:
+                # Günlük kısaldıysa (silinip yeniden yazıldıysa) baştan okunur.
+                offset = 0
+            file.seek(offset)
+            raw = file.read()
+        end = raw.rfind(b"\n") + 1
+        events = []
+        for line in raw[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events, offset + end
@@ -0,0 +1,245 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+
+def _encode(key: str, value: Any) -> str:
+    return json.dumps({"key": key, "value": value}, separators=(",", ":")) + "\n"
+
+
+class OrderIndexLog:
+    """
+    Sipariş ID'si -> değer eşlemesini append-only bir JSON satır dosyasında (<ad>.jsonl) tutar.
+
+    Her satır {"key": sipariş ID'si, "value": değer} biçimindedir; value null ise girdi silinmiştir.
+    Bellekteki durum, dosyanın okunan son bayt konumuyla birlikte saklanır; sonraki okumalar yalnızca
+    yeni satırları (başka süreçlerin eklemeleri dahil) uygular. Toplu değişiklikler tek yazmayla eklenir,
+    bu yüzden bir sipariş eklemek ya da silmek indeksin tamamını yeniden yazmaz. Silinmiş satırlar canlı
+    girdileri aştığında dosya sıkıştırılır. Alt sınıflar _apply'ı genişleterek türetilmiş indeksleri
+    güncel tutar.
+
+    Salt okunur depoda (storage.read_only) dosya yazılmaz: dosya yoksa ensure() girdileri yalnızca
+    bellekte bir kez kurar.
+    """
+    # Sıkıştırma için asgari gereksiz (üzerine yazılmış ya da silinmiş) satır sayısı
+    COMPACT_MIN_LINES = 1000
+
+    def __init__(self, storage, name: str):
+        self.path = os.path.join(storage.data_dir, f"{name}.jsonl")
+        self._lock = storage._lock
+        # Paylaşımlı modda ekleme ve yeniden yazma süreçler arası kilit altında yapılır.
+        self._file_lock = storage._file_lock(name) if storage.shared else nullcontext()
+        self._read_only = storage.read_only
+        self._in_memory = False  # salt okunur modda girdiler dosyasız kuruldu mu
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._offset = 0
+        self._lines = 0
+        self.entries: Dict[str, Any] = {}
+        self._reset()
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _reset(self) -> None:
+        self.entries = {}
+        self._lines = 0
+
+    def _apply(self, key: str, value: Any) -> None:
+        if value is None:
+            self.entries.pop(key, None)
+        else:
+            self.entries[key] = value
+
+    def refresh(self) -> None:
+        """Son okumadan sonra eklenen satırları uygular; dosya yeniden yazıldıysa baştan okur."""
+        with self._lock:
+            try:
+                file = open(self.path, "rb")
+            except FileNotFoundError:
+                if not self._in_memory:
+                    self._reset()
+                    self._file_id, self._offset = None, 0
+                return
+            with file:
+                stat = os.fstat(file.fileno())
+                file_id = (stat.st_dev, stat.st_ino)
+                if file_id != self._file_id or stat.st_size < self._offset:
+                    self._reset()
+                    self._file_id, self._offset = file_id, 0
+                if stat.st_size == self._offset:
+                    return
+                file.seek(self._offset)
+                raw = file.read()
+            # Yarım yazılmış son satır bir sonraki okumaya bırakılır.
+            end = raw.rfind(b"\n") + 1
+            for line in raw[:end].splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self._apply(entry["key"], entry.get("value"))
+                self._lines += 1
+            self._offset += end
+
+    def ensure(self, build: Callable[[], Dict[str, Any]]) -> "OrderIndexLog":
+        """Dosya yoksa build()'in döndürdüğü girdilerle bir kez kurar; güncel indeksi döner."""
+        if not self.exists() and self._read_only:
+            with self._lock:
+                if not self._in_memory:
+                    self._load(build())
+                    self._in_memory = True
+            return self
+        if not self.exists():
+            with self._lock, self._file_lock:
+                if not self.exists():
+                    self.rewrite(build())
+        self.refresh()
+        return self
+
+    @contextmanager
+    def locked(self):
+        """
+        İndeksi (paylaşımlı modda süreçler arasında da) kilitleyip günceller; blok içindeki kontrol ile
+        write() arasına başka bir yazma giremez.
+        """
+        with self._lock, self._file_lock:
+            self.refresh()
+            yield self
+
+    def write(self, changes: Iterable[Tuple[str, Any]]) -> None:
+        """(sipariş ID'si, değer ya da silmek için None) çiftlerini tek bir yazmayla ekler."""
+        if self._read_only:
+            raise ValueError(f"Index '{self.path}' is read-only")
+        changes = list(changes)
+        if not changes:
+            return
+        raw = "".join(_encode(key, value) for key, value in changes).encode("utf-8")
+        with self._lock, self._file_lock:
+            self.refresh()
+            with open(self.path, "ab") as file:
+                file.write(raw)
+                stat = os.fstat(file.fileno())
+            file_id = (stat.st_dev, stat.st_ino)
+            if self._file_id in (None, file_id) and stat.st_size == self._offset + len(raw):
+                # Dosya okunan yerden itibaren yalnızca bu satırları içeriyor: yeniden okunmadan bellekte uygulanır.
+                self._file_id, self._offset = file_id, stat.st_size
+                for key, value in changes:
+                    self._apply(key, value)
+                self._lines += len(changes)
+            else:
+                self.refresh()
+            garbage = self._lines - len(self.entries)
+            if garbage > self.COMPACT_MIN_LINES and garbage > len(self.entries):
+                self.rewrite(self.entries)
+
+    def rewrite(self, entries: Dict[str, Any]) -> None:
+        """Dosyayı yalnızca verilen girdilerden oluşacak şekilde yeniden yazar (toptan kurma ve sıkıştırma)."""
+        if self._read_only:
+            raise ValueError(f"Index '{self.path}' is read-only")
+        with self._lock, self._file_lock:
+            # Geçici dosya adı benzersizdir; aynı anda yeniden yazan iki süreç birbirinin dosyasını ezmez.
+            fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp",
+                                             dir=os.path.dirname(self.path) or ".")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    for key, value in entries.items():
+                        file.write(_encode(key, value))
+                    file.flush()
+                    stat = os.fstat(file.fileno())
+                os.replace(temp_path, self.path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            # Yeni dosyanın içeriği zaten bilindiğinden yeniden okunmaz (yeniden adlandırma inode'u korur).
+            self._load(entries)
+            self._file_id, self._offset = (stat.st_dev, stat.st_ino), stat.st_size
+
+
+    def _load(self, entries: Dict[str, Any]) -> None:
+        entries = list(entries.items())
+        self._reset()
+        for key, value in entries:
+            self._apply(key, value)
+        self._lines = len(entries)
+
+
+class OrderLinesIndex(OrderIndexLog):
+    """
+    Sipariş kalemleri: sipariş ID'si -> [[ürün ID'si, adet, birim fiyat (kuruş)], ...].
+    Ürün ID'si -> ürünü içeren sipariş ID'leri (eklenme sırasıyla) bellekte türetilir.
+    """
+
+    def _reset(self) -> None:
+        super()._reset()
+        self.by_product: Dict[str, Dict[str, None]] = {}
+
+    def _apply(self, key: str, value: Any) -> None:
+        for product_id, _, _ in self.entries.get(key) or ():
+            order_ids = self.by_product.get(product_id)
+            if order_ids is not None:
+                order_ids.pop(key, None)
+                if not order_ids:
+                    del self.by_product[product_id]
+        super()._apply(key, value)
+        for product_id, _, _ in value or ():
+            self.by_product.setdefault(product_id, {})[key] = None
+
+
+class CustomerOrderIndex(OrderIndexLog):
+    """
+    Sipariş ID'si -> [müşteri ID'si, tutar (kuruş)].
+    Müşteri ID'si -> {sipariş ID'si: tutar} (eklenme sırasıyla) ve müşteri başına toplam harcama bellekte türetilir.
+    """
+
+    def _reset(self) -> None:
+        super()._reset()
+        self.by_customer: Dict[str, Dict[str, int]] = {}
+        self.spend: Dict[str, int] = {}
+
+    def _apply(self, key: str, value: Any) -> None:
+        old = self.entries.get(key)
+        if old is not None and (value is None or value[0] != old[0]):
+            customer_id, cents = old
+            orders = self.by_customer[customer_id]
+            del orders[key]
+            if orders:
+                self.spend[customer_id] -= cents
+            else:
+                del self.by_customer[customer_id]
+                del self.spend[customer_id]
+        super()._apply(key, value)
+        if value is not None:
+            customer_id, cents = value
+            orders = self.by_customer.setdefault(customer_id, {})
+            # Aynı müşterinin siparişi yeniden yazılırsa sırası korunur, eski tutarı toplamdan düşülür.
+            self.spend[customer_id] = self.spend.get(customer_id, 0) + cents - orders.get(key, 0)
+            orders[key] = cents
+
+
+class CustomerEmailIndex(OrderIndexLog):
+    """
+    Müşteri ID'si -> e-posta. E-posta -> müşteri ID'si bellekte türetilir; giriş ve e-posta kontrolü
+    müşteri dosyasını taramadan yapılır. Müşteri kaydının kendisi (parola dahil) indekse yazılmaz.
+
+    Önceki sürümün tam müşteri kaydı tutan satırları okunurken e-postaya indirgenir ve legacy işaretlenir;
+    depo böyle bir dosyayı yalnızca e-postalarla yeniden yazar.
+    """
+
+    def _reset(self) -> None:
+        super()._reset()
+        self.by_email: Dict[str, str] = {}
+        self.legacy = False
+
+    def _apply(self, key: str, value: Any) -> None:
+        if isinstance(value, dict):
+            self.legacy = True
+            value = value.get("email")
+        old = self.entries.get(key)
+        if old is not None and self.by_email.get(old) == key:
+            del self.by_email[old]
+        super()._apply(key, value)
+        if value is not None:
+            self.by_email[value] = key
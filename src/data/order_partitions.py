@@ -0,0 +1,310 @@
+import os
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from src.data.cache import stat_signature
+from src.data.wal import WriteAheadLog
+
+DateLike = Union[str, datetime, None]
+
+# Dönem adı -> ISO tarih dizgesinden alınacak önek uzunluğu
+_PERIODS = {
+    "year": 4,    # 2025
+    "month": 7,   # 2025-05
+    "day": 10,    # 2025-05-22
+}
+UNDATED = "undated"
+
+
+class OrderPartitions:
+    """
+    Siparişleri dönem (yıl/ay/gün) bazlı parça dosyalarında tutar.
+
+    orders_manifest parçaların listesini ve özetini tutar. Her siparişin hangi parçada
+    olduğu ve müşterisi append-only orders_index.log dosyasında saklanır. Yazma ve durum
+    güncellemeleri yalnızca ilgili parçaya dokunur; tarih aralığı sorguları yalnızca
+    kesişen parçaları açar.
+    """
+    MANIFEST = "orders_manifest"
+
+    def __init__(self, storage, period: str = "month"):
+        if period not in _PERIODS:
+            raise ValueError(f"Unknown partition period: {period}")
+        self.storage = storage
+        self.period = period
+        self._index_log = WriteAheadLog(os.path.join(storage.data_dir, "orders_index.log"))
+        self._index_cache = (None, {})
+        # Paylaşımlı modda indeks günlüğüne ekleme ve yeniden yazma süreçler arası kilit altında yapılır.
+        self._index_lock = storage._file_lock("orders_index") if storage.shared else nullcontext()
+        if storage.read_only:
+            # Salt okunur depoda parçalar olduğu gibi okunur; eski dosya bölünmez, dönem değiştirilmez.
+            return
+        manifest = storage.load_data(self.MANIFEST)
+        if manifest is not None and manifest.get("period") == period:
+            return
+        # Göç ve yeniden bölme manifest kilidi altında yapılır ve manifest kilit altında yeniden okunur:
+        # aynı anda açılan ikinci süreç, ilkinin taşıdığı siparişleri boş bir listeyle ezmez.
+        with storage._file_lock(self.MANIFEST) if storage.shared else nullcontext():
+            manifest = storage.load_data(self.MANIFEST)
+            if manifest is None:
+                self._migrate_legacy_file()
+            elif manifest.get("period") != period:
+                self._repartition(manifest.get("period"))
+
+    def partition_key(self, date: DateLike) -> str:
+        if not date:
+            return UNDATED
+        if isinstance(date, datetime):
+            date = date.isoformat()
+        return date[:_PERIODS[self.period]]
+
+    def partition_name(self, key: str) -> str:
+        return f"orders_{key}"
+
+    def partition_keys(self, start: DateLike = None, end: DateLike = None,
+                       customer_id: Optional[str] = None) -> List[str]:
+        keys = sorted(self._manifest()["partitions"])
+        if customer_id is not None:
+            # Sipariş indeksi müşterinin siparişlerinin bulunduğu parçaları söyler.
+            used = {entry[0] for entry in self._index().values() if entry[1] == customer_id}
+            keys = [key for key in keys if key in used]
+        if start is None and end is None:
+            return keys
+        low = self.partition_key(start) if start else None
+        high = self.partition_key(end) if end else None
+        return [
+            key for key in keys
+            if key != UNDATED and (low is None or key >= low) and (high is None or key <= high)
+        ]
+
+    # Okuma
+    def load_orders(self, start: DateLike = None, end: DateLike = None, view: bool = False) -> List[Dict[str, Any]]:
+        return list(self.iter_orders(start, end, view=view))
+
+    def iter_orders(self, start: DateLike = None, end: DateLike = None, view: bool = False) -> Iterator[Dict[str, Any]]:
+        load = self.storage.load_view if view else self.storage.load_data
+        start, end = _iso(start), _iso(end)
+        for key in self.partition_keys(start, end):
+            for order in load(self.partition_name(key), default=[]):
+                date = order.get("date") or ""
+                if start and date < start:
+                    continue
+                if end and date > end:
+                    continue
+                yield order
+
+    def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._index().get(order_id)
+        if entry is None:
+            return None
+        return self.storage.get_record(self.partition_name(entry[0]), order_id)
+
+    # Yazma
+    def put_order(self, order: Dict[str, Any]) -> None:
+        order_id = order["id"]
+        key = self.partition_key(order.get("date"))
+        entry = self._index().get(order_id)
+        if entry is not None and entry[0] != key:
+            self.storage.delete_record(self.partition_name(entry[0]), order_id)
+            self._adjust_manifest(entry[0], -1)
+        if key in self._manifest()["partitions"]:
+            self.storage.put_record(self.partition_name(key), order_id, order)
+        else:
+            # Parça henüz yok: başka bir süreç aynı anda oluşturuyor olabilir, bu yüzden dosya körü körüne
+            # yazılmaz; oku-değiştir-yaz (paylaşımlı modda CAS) ile oluşturulur ya da sonuna eklenir.
+            def put(orders):
+                for index, existing in enumerate(orders):
+                    if existing.get("id") == order_id:
+                        orders[index] = order
+                        break
+                else:
+                    orders.append(order)
+                return True
+
+            self.storage.update(self.partition_name(key), put, default=[])
+        # Parça manifestte ancak sipariş yazıldıktan sonra kaydedilir.
+        if entry is None or entry[0] != key:
+            self._adjust_manifest(key, 1, order.get("date"))
+        if entry is None or list(entry) != [key, order.get("customer_id")]:
+            self._put_index(order_id, [key, order.get("customer_id")])
+
+    def update_order(self, order_id: str, changes: Dict[str, Any]) -> bool:
+        entry = self._index().get(order_id)
+        if entry is None:
+            return False
+        if "date" in changes or "customer_id" in changes:
+            # Sipariş başka bir parçaya taşınabilir.
+            order = self.get_order(order_id)
+            if order is None:
+                return False
+            order.update(changes)
+            self.put_order(order)
+            return True
+
+        def apply(orders):
+            for order in orders:
+                if order.get("id") == order_id:
+                    order.update(changes)
+                    return True
+            return False
+
+        return self.storage.update(self.partition_name(entry[0]), apply, default=[])
+
+    def modify_order(self, order_id: str, apply) -> bool:
+        """apply(orders)'u siparişin parçasının oku-değiştir-yaz döngüsünde çalıştırır (bkz. JsonStorage.modify_order)."""
+        entry = self._index().get(order_id)
+        if entry is None:
+            return False
+        return self.storage.update(self.partition_name(entry[0]), apply, default=[])
+
+    def delete_order(self, order_id: str) -> bool:
+        entry = self._index().get(order_id)
+        if entry is None:
+            return False
+        self.storage.delete_record(self.partition_name(entry[0]), order_id)
+        self._put_index(order_id, None)
+        self._adjust_manifest(entry[0], -1)
+        return True
+
+    def delete_customer_orders(self, customer_id: str) -> int:
+        """Müşterinin siparişlerini yalnızca ilgili parçaları yeniden yazarak siler."""
+        index = dict(self._index())
+        doomed = {order_id: entry[0] for order_id, entry in index.items() if entry[1] == customer_id}
+        if not doomed:
+            return 0
+        counts = {}
+        for key in set(doomed.values()):
+            def remove(orders):
+                remaining = [order for order in orders if order.get("id") not in doomed]
+                counts[key] = len(remaining)
+                changed = len(remaining) != len(orders)
+                orders[:] = remaining
+                return changed
+
+            self.storage.update(self.partition_name(key), remove, default=[])
+        with self._index_lock:
+            # İndeks kilit altında yeniden okunur; bu arada başka bir sürecin taşıdığı siparişler silinmez.
+            # Silinenler indeks günlüğüne tek yazmayla eklenir.
+            index = self._index()
+            removed = [order_id for order_id in doomed
+                       if index.get(order_id) is not None and index[order_id][1] == customer_id]
+            for order_id in removed:
+                del index[order_id]
+            self._index_log.append_many(("del", order_id, None) for order_id in removed)
+            self._index_cache = (stat_signature((self._index_log.path, self._index_log.compacting_path)), index)
+
+        def set_counts(manifest):
+            for key, count in counts.items():
+                manifest["partitions"].setdefault(key, {"count": 0, "first": None, "last": None})["count"] = count
+            return True
+
+        self.storage.update(self.MANIFEST, set_counts, default={"period": self.period, "partitions": {}})
+        return len(doomed)
+
+    def replace_all(self, orders: List[Dict[str, Any]]) -> None:
+        """Tüm sipariş listesini yeniden parçalara böler (toplu kaydetme/göç için)."""
+        old_keys = set(self._manifest()["partitions"])
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for order in orders:
+            groups.setdefault(self.partition_key(order.get("date")), []).append(order)
+
+        manifest = {"period": self.period, "partitions": {}}
+        index = {}
+        for key, group in groups.items():
+            self.storage.save_data(self.partition_name(key), group)
+            manifest["partitions"][key] = _summary(group)
+            for order in group:
+                index[order["id"]] = [key, order.get("customer_id")]
+        for key in old_keys - set(groups):
+            self._remove_partition_file(key)
+        self._rewrite_index(index)
+        self.storage.save_data(self.MANIFEST, manifest)
+
+    def _manifest(self) -> Dict[str, Any]:
+        manifest = self.storage.load_data(self.MANIFEST)
+        if manifest is None:
+            manifest = {"period": self.period, "partitions": {}}
+        return manifest
+
+    def _index(self) -> Dict[str, List[str]]:
+        # Günlük başka bir süreç tarafından değiştirilmişse yeniden okunur.
+        paths = (self._index_log.path, self._index_log.compacting_path)
+        signature = stat_signature(paths)
+        cached_signature, index = self._index_cache
+        if signature != cached_signature:
+            index = {}
+            for op, order_id, entry in self._index_log.entries():
+                if op == "put":
+                    index[order_id] = entry
+                else:
+                    index.pop(order_id, None)
+            self._index_cache = (signature, index)
+        return index
+
+    def _put_index(self, order_id: str, entry: Optional[List[str]]) -> None:
+        with self._index_lock:
+            # Kilit altında okunan indeks diğer süreçlerin eklemelerini de içerir; önbellek imzası
+            # ancak bu durumda yeni günlüğe güvenle eşitlenebilir.
+            index = self._index()
+            if entry is None:
+                index.pop(order_id, None)
+                self._index_log.append("del", order_id)
+            else:
+                index[order_id] = entry
+                self._index_log.append("put", order_id, entry)
+            self._index_cache = (stat_signature((self._index_log.path, self._index_log.compacting_path)), index)
+
+    def _rewrite_index(self, index: Dict[str, List[str]]) -> None:
+        with self._index_lock:
+            self._index_log.rewrite(index)
+            self._index_cache = (stat_signature((self._index_log.path, self._index_log.compacting_path)), index)
+
+    def _adjust_manifest(self, key: str, delta: int, date: DateLike = None) -> None:
+        def adjust(manifest):
+            summary = manifest["partitions"].setdefault(key, {"count": 0, "first": None, "last": None})
+            summary["count"] = max(0, summary["count"] + delta)
+            if date:
+                summary["first"] = min(filter(None, (summary["first"], date)))
+                summary["last"] = max(filter(None, (summary["last"], date)))
+            return True
+
+        self.storage.update(self.MANIFEST, adjust, default={"period": self.period, "partitions": {}})
+
+    def _remove_partition_file(self, key: str) -> None:
+        self.storage.drop_collection(self.partition_name(key))
+
+    def _migrate_legacy_file(self) -> None:
+        # Eski tek dosyalık orders.json varsa parçalara bölünür ve yedek olarak saklanır.
+        legacy_path = self.storage._get_file_path("orders")
+        orders = self.storage._load_uncached("orders")
+        self.replace_all(orders if isinstance(orders, list) else [])
+        if os.path.exists(legacy_path):
+            os.replace(legacy_path, f"{legacy_path}.bak")
+        self.storage.drop_collection("orders")
+
+    def _repartition(self, old_period: Optional[str]) -> None:
+        current = self.period
+        self.period = old_period if old_period in _PERIODS else current
+        orders = self.load_orders()
+        old_keys = self.partition_keys()
+        self.period = current
+        for key in old_keys:
+            self._remove_partition_file(key)
+        self.storage.save_data(self.MANIFEST, {"period": current, "partitions": {}})
+        self.replace_all(orders)
+
+
+def _iso(date: DateLike) -> Optional[str]:
+    if isinstance(date, datetime):
+        return date.isoformat()
+    return date or None
+
+
+def _summary(orders: List[Dict[str, Any]]) -> Dict[str, Any]:
+    dates = [order.get("date") for order in orders if order.get("date")]
+    return {
+        "count": len(orders),
+        "first": min(dates) if dates else None,
+        "last": max(dates) if dates else None,
+    }
@@ -0,0 +1,118 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, BinaryIO, Dict, Iterator, List
+
+try:
+    import orjson
+except ImportError:  # isteğe bağlı bağımlılık
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # isteğe bağlı bağımlılık
+    msgpack = None
+
+
+class Codec(ABC):
+    """Depolama katmanının kullandığı serileştirici arayüzü."""
+    name: str = ""
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, raw: bytes) -> Any:
+        pass
+
+
+class JsonCodec(Codec):
+    """Standart kütüphane ile boşluksuz (compact) JSON."""
+    name = "json"
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, raw: bytes) -> Any:
+        if orjson is not None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # orjson'un desteklemediği geçerli JSON (ör. 64 bitten büyük tamsayılar) için
+                pass
+        return json.loads(raw)
+
+
+class PrettyJsonCodec(JsonCodec):
+    """Eski girintili (indent=2) biçim; dosyaları elle okumak gerektiğinde kullanılır."""
+    name = "json-pretty"
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, indent=2).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data)
+
+
+class MsgpackCodec(Codec):
+    name = "msgpack"
+
+    def dumps(self, data: Any) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, raw: bytes) -> Any:
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+_CODECS: Dict[str, Codec] = {
+    JsonCodec.name: JsonCodec(),
+    PrettyJsonCodec.name: PrettyJsonCodec(),
+}
+if orjson is not None:
+    _CODECS[OrjsonCodec.name] = OrjsonCodec()
+if msgpack is not None:
+    _CODECS[MsgpackCodec.name] = MsgpackCodec()
+
+
+def available_codecs() -> List[str]:
+    return list(_CODECS)
+
+
+def get_codec(name: str) -> Codec:
+    codec = _CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Serializer '{name}' is not available (installed: {', '.join(_CODECS)})")
+    return codec
+
+
+def is_json(head: bytes) -> bool:
+    """Dosyanın ilk baytlarından JSON olup olmadığını anlar; aksi halde msgpack kabul edilir."""
+    stripped = head.lstrip(b" \t\r\n")
+    return not stripped or stripped[:1] in b'{["-0123456789tfn'
+
+
+def detect_codec(raw: bytes) -> Codec:
+    if is_json(raw[:64]):
+        return _CODECS[JsonCodec.name]
+    if msgpack is None:
+        raise ValueError("File is not JSON and msgpack is not installed")
+    return _CODECS[MsgpackCodec.name]
+
+
+def iter_msgpack_records(file: BinaryIO) -> Iterator[Any]:
+    """En üst düzeyi dizi ya da sözlük olan bir msgpack dosyasının kayıtlarını tek tek üretir."""
+    unpacker = msgpack.Unpacker(file, raw=False, strict_map_key=False)
+    first = file.read(1)
+    file.seek(0)
+    code = first[0] if first else 0
+    if 0x80 <= code <= 0x8F or code in (0xDE, 0xDF):
+        for _ in range(unpacker.read_map_header()):
+            unpacker.skip()
+            yield unpacker.unpack()
+    else:
+        for _ in range(unpacker.read_array_header()):
+            yield unpacker.unpack()
@@ -0,0 +1,612 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from decimal import Decimal
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.data.collection_names import REORDER_THRESHOLDS, STOCK_SLOTS
+from src.data.order_partitions import OrderPartitions
+from src.data.serializers import detect_codec
+from src.data.stock_ledger_file import read_stock_ledger
+from src.data.storage import JsonStorage, _format_cents, _to_cents
+
+
+# Koleksiyon adı -> (tablo, anahtar sütunu, sütunlar). Sütun dışındaki alanlar 'extra' içinde JSON olarak saklanır.
+_TABLES = {
+    "products": ("products", "id", ["id", "name", "description", "price", "category", "stock_quantity"]),
+    "orders": ("orders", "id", ["id", "customer_id", "total_price", "shipping_cost", "status", "date"]),
+    "customers": ("customers", "id", ["id", "name", "email", "password", "address", "phone"]),
+    "admins": ("admins", "email", ["email", "password"]),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    description TEXT,
+    price TEXT,
+    category TEXT,
+    stock_quantity INTEGER,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS orders (
+    id TEXT PRIMARY KEY,
+    customer_id TEXT,
+    total_price TEXT,
+    shipping_cost TEXT,
+    status TEXT,
+    date TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS order_items (
+    order_id TEXT NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    product_id TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    unit_price_cents INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS customers (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    email TEXT,
+    password TEXT,
+    address TEXT,
+    phone TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS admins (
+    email TEXT PRIMARY KEY,
+    password TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS collections (
+    name TEXT PRIMARY KEY,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS order_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id TEXT,
+    status TEXT,
+    at TEXT NOT NULL,
+    reset INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_customers_email ON customers(email);
+CREATE INDEX IF NOT EXISTS idx_orders_customer_id ON orders(customer_id);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status);
+CREATE INDEX IF NOT EXISTS idx_orders_date ON orders(date);
+CREATE INDEX IF NOT EXISTS idx_order_items_order_id ON order_items(order_id);
+CREATE INDEX IF NOT EXISTS idx_order_items_product_id ON order_items(product_id);
+"""
+
+
+class SqliteStorage:
+    """
+    JsonStorage ile aynı arayüze sahip SQLite tabanlı veri saklama sınıfı.
+    Ürünler, siparişler, sipariş kalemleri ve müşteriler gerçek tablolarda tutulur;
+    tek kayıt okuma/güncelleme işlemleri dosya boyutundan bağımsızdır.
+
+    InventoryManager'ın deposu olarak kullanılabilir: update() oku-değiştir-yaz döngüsünü yazma kilidi
+    baştan alınmış tek bir işlemde yapar, stok defteri (stock.ledger) veritabanının dizininde (data_dir)
+    tutulur. Veritabanı eşzamanlılığı kendisi sağladığından dosya kilitleri gerekmez (shared=False).
+    Kataloğu dosyadaki bayt konumlarıyla okuyan tembel mod (lazy=True) yalnızca JsonStorage ile çalışır.
+    """
+    LIST_COLLECTIONS = {"orders"}
+    # İşlemler süreçler arasında SQLite tarafından sıralanır; dosya kilidi kullanan sınıflar kilit almaz.
+    shared = False
+
+    def __init__(self, db_path: str = os.path.join("data", "ecommerce.db")):
+        self.db_path = db_path
+        # Veritabanı dışında tutulan dosyaların (ör. stok defteri) dizini
+        self.data_dir = os.path.dirname(db_path) or "."
+        os.makedirs(self.data_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self._ensure_admin_account()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _ensure_admin_account(self):
+        if not self.load_data("admins", default={}):
+            self.put_record("admins", "admin@example.com", {
+                "email": "admin@example.com",
+                "password": "123"
+            })
+
+    def save_data(self, filename: str, data: Any):
+        spec = _TABLES.get(filename)
+        with self._lock, self._transaction():
+            if spec is None:
+                self._conn.execute("INSERT OR REPLACE INTO collections (name, data) VALUES (?, ?)",
+                                   (filename, json.dumps(data)))
+                return
+            table, key_column, _ = spec
+            self._conn.execute(f"DELETE FROM {table}")
+            if filename == "orders":
+                self._conn.execute("DELETE FROM order_items")
+            records = data.values() if isinstance(data, dict) else data
+            keys = data.keys() if isinstance(data, dict) else [record.get(key_column) for record in data]
+            for key, record in zip(keys, records):
+                self._insert(filename, key, record)
+            if filename == "orders":
+                self._sync_order_events()
+
+    def load_data(self, filename: str, default: Any = None) -> Any:
+        spec = _TABLES.get(filename)
+        with self._lock:
+            if spec is None:
+                row = self._conn.execute("SELECT data FROM collections WHERE name = ?", (filename,)).fetchone()
+                return json.loads(row["data"]) if row else default
+            table, key_column, _ = spec
+            rows = self._conn.execute(f"SELECT * FROM {table} ORDER BY rowid").fetchall()
+            items = self._load_items() if filename == "orders" else {}
+            records = [self._row_to_record(filename, row, items) for row in rows]
+        if filename in self.LIST_COLLECTIONS:
+            return records
+        return {record[key_column]: record for record in records}
+
+    # Veritabanından dönen nesneler zaten bağımsız kopyalardır.
+    load_view = load_data
+
+    def update(self, filename: str, mutator: Callable[[Any], bool], default: Any = None) -> bool:
+        """
+        Koleksiyonu okur, mutator ile yerinde değiştirir ve kaydeder (bkz. JsonStorage.update).
+        Okuma ve yazma, yazma kilidi baştan alınmış (BEGIN IMMEDIATE) tek bir işlemde yapılır; başka bir
+        bağlantının değişikliği araya giremez.
+        """
+        with self._lock, self._transaction(immediate=True):
+            data = self.load_data(filename, default)
+            changed = mutator(data)
+            if changed:
+                self.save_data(filename, data)
+            return changed
+
+    def save_raw(self, filename: str, content: bytes):
+        """Önceden serileştirilmiş (JSON ya da msgpack) içeriği çözüp koleksiyona kaydeder (bkz. JsonStorage.save_raw)."""
+        self.save_data(filename, detect_codec(content).loads(content))
+
+    def drop_collection(self, filename: str):
+        """Koleksiyonun tüm kayıtlarını kaldırır."""
+        if filename in _TABLES:
+            self.save_data(filename, [] if filename in self.LIST_COLLECTIONS else {})
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM collections WHERE name = ?", (filename,))
+
+    def flush(self):
+        """İşlemler kayıt anında kalıcıdır; bekleyen yazma yoktur (JsonStorage.flush ile uyumluluk için)."""
+
+    def _file_lock(self, filename: str):
+        # Oku-değiştir-yaz döngüleri veritabanı işlemleriyle korunur; ayrı bir dosya kilidi gerekmez.
+        return nullcontext()
+
+    def get_record(self, filename: str, key: str) -> Optional[Dict[str, Any]]:
+        """Tek bir kaydı birincil anahtarıyla okur."""
+        table, key_column, _ = _TABLES[filename]
+        with self._lock:
+            row = self._conn.execute(f"SELECT * FROM {table} WHERE {key_column} = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            items = self._load_items(key) if filename == "orders" else {}
+            return self._row_to_record(filename, row, items)
+
+    def put_record(self, filename: str, key: str, value: Any):
+        """Koleksiyondaki tek bir kaydı ekler ya da günceller."""
+        if filename not in _TABLES:
+            data = self.load_data(filename, default={})
+            data[key] = value
+            self.save_data(filename, data)
+            return
+        with self._lock, self._transaction():
+            self._delete(filename, key)
+            self._insert(filename, key, value)
+
+    def delete_record(self, filename: str, key: str) -> bool:
+        """Koleksiyondan tek bir kaydı siler. Kayıt yoksa False döner."""
+        if filename not in _TABLES:
+            data = self.load_data(filename, default={})
+            if key not in data:
+                return False
+            del data[key]
+            self.save_data(filename, data)
+            return True
+        with self._lock, self._transaction():
+            deleted = self._delete(filename, key) > 0
+            if deleted and filename == "orders":
+                self._log_order_statuses([(key, None)])
+            return deleted
+
+    # Sipariş işlemleri
+    def add_order(self, order: Dict[str, Any]):
+        self.add_orders([order])
+
+    def add_orders(self, orders: Iterable[Dict[str, Any]]):
+        """Birden çok siparişi (ve kalemlerini) tek bir işlemde ekler."""
+        with self._lock, self._transaction():
+            changes = []
+            for order in orders:
+                self._delete("orders", order["id"])
+                self._insert("orders", order["id"], order)
+                changes.append((order["id"], order.get("status")))
+            self._log_order_statuses(changes)
+
+    def update_order(self, order_id: str, **changes) -> bool:
+        """Siparişin verilen alanlarını günceller. Sipariş bulunamazsa False döner."""
+        _, _, columns = _TABLES["orders"]
+        if changes and all(field in columns and field != "id" for field in changes):
+            assignments = ", ".join(f"{field} = ?" for field in changes)
+            with self._lock, self._transaction():
+                cursor = self._conn.execute(f"UPDATE orders SET {assignments} WHERE id = ?",
+                                            list(changes.values()) + [order_id])
+                updated = cursor.rowcount > 0
+                if updated and "status" in changes:
+                    self._log_order_statuses([(order_id, changes["status"])])
+            return updated
+        with self._lock, self._transaction():
+            order = self.get_record("orders", order_id)
+            if order is None:
+                return False
+            order.update(changes)
+            self.put_record("orders", order_id, order)
+            if "status" in changes:
+                self._log_order_statuses([(order_id, changes["status"])])
+            return True
+
+    def modify_order(self, order_id: str, mutator) -> bool:
+        """
+        Siparişi yazma kilidi baştan alınmış (BEGIN IMMEDIATE) tek bir işlemde okuyup mutator'a verir ve
+        yazar; kontrol ile yazma arasına başka bir bağlantı giremez (bkz. JsonStorage.modify_order).
+        """
+        with self._lock, self._transaction(immediate=True):
+            order = self.get_record("orders", order_id)
+            if order is None:
+                return False
+            old = dict(order)
+            if not mutator(order):
+                return False
+            if any(order.get(field) != old.get(field) for field in ("id", "date", "customer_id", "total_price")):
+                raise ValueError("modify_order cannot change id, date, customer_id, total_price")
+            self.put_record("orders", order_id, order)
+            if order.get("status") != old.get("status"):
+                self._log_order_statuses([(order_id, order.get("status"))])
+            return True
+
+    def load_orders(self, start=None, end=None) -> List[Dict[str, Any]]:
+        """Tarihi [start, end] aralığındaki siparişleri date indeksi üzerinden döner."""
+        start = start.isoformat() if isinstance(start, datetime) else start
+        end = end.isoformat() if isinstance(end, datetime) else end
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM orders WHERE (? IS NULL OR date >= ?) AND (? IS NULL OR date <= ?) ORDER BY rowid",
+                (start, start, end, end)
+            ).fetchall()
+            items = self._load_items() if rows else {}
+        return [self._row_to_record("orders", row, items) for row in rows]
+
+    def iter_orders(self, customer_id: Optional[str] = None, status: Optional[str] = None,
+                    start=None, end=None, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Siparişleri filtreleri SQL'e aktararak parti parti okur ve tek tek üretir."""
+        start = start.isoformat() if isinstance(start, datetime) else start
+        end = end.isoformat() if isinstance(end, datetime) else end
+        conditions, params = [], []
+        for clause, value in (("customer_id = ?", customer_id), ("status = ?", status),
+                              ("date >= ?", start), ("date <= ?", end)):
+            if value is not None:
+                conditions.append(clause)
+                params.append(value)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT rowid, * FROM orders{where}{' AND' if where else ' WHERE'} rowid > ? "
+                    f"ORDER BY rowid LIMIT ?",
+                    params + [last_rowid, batch_size]
+                ).fetchall()
+                items = {}
+                for row in rows:
+                    items.update(self._load_items(row["id"]))
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_record("orders", row, items)
+            last_rowid = rows[-1]["rowid"]
+
+    def delete_customer_orders(self, customer_id: str) -> int:
+        """Müşterinin tüm siparişlerini siler ve silinen sipariş sayısını döner."""
+        with self._lock, self._transaction():
+            order_ids = [row["id"] for row in
+                         self._conn.execute("SELECT id FROM orders WHERE customer_id = ?", (customer_id,))]
+            self._conn.execute(
+                "DELETE FROM order_items WHERE order_id IN (SELECT id FROM orders WHERE customer_id = ?)",
+                (customer_id,)
+            )
+            deleted = self._conn.execute("DELETE FROM orders WHERE customer_id = ?", (customer_id,)).rowcount
+            self._log_order_statuses([(order_id, None) for order_id in order_ids])
+            return deleted
+
+    # Müşteri -> sipariş sorguları (idx_orders_customer_id indeksi üzerinden)
+    def get_customer_order_ids(self, customer_id: str) -> List[str]:
+        """Müşterinin siparişlerinin ID'leri (eklenme sırasıyla)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM orders WHERE customer_id = ? ORDER BY rowid",
+                                      (customer_id,)).fetchall()
+        return [row["id"] for row in rows]
+
+    def get_customer_orders(self, customer_id: str) -> List[Dict[str, Any]]:
+        """Müşterinin siparişleri (kalemleri olmadan)."""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM orders WHERE customer_id = ? ORDER BY rowid",
+                                      (customer_id,)).fetchall()
+        return [self._row_to_record("orders", row, {}) for row in rows]
+
+    def get_customer_order_summary(self, customer_id: str) -> Dict[str, Any]:
+        """Müşterinin sipariş sayısı ve toplam harcaması (Decimal)."""
+        orders = self.get_customer_orders(customer_id)
+        spend = sum(_to_cents(order.get("total_price", "0")) for order in orders)
+        return {"orders": len(orders), "spend": Decimal(spend) / 100}
+
+    def customer_order_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Siparişi olan tüm müşterilerin özetleri: müşteri ID'si -> {'orders', 'spend'}."""
+        summaries: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            rows = self._conn.execute("SELECT customer_id, total_price FROM orders WHERE customer_id IS NOT NULL")
+            for row in rows:
+                summary = summaries.setdefault(row["customer_id"], {"orders": 0, "spend": 0})
+                summary["orders"] += 1
+                summary["spend"] += _to_cents(row["total_price"] or "0")
+        for summary in summaries.values():
+            summary["spend"] = Decimal(summary["spend"]) / 100
+        return summaries
+
+    # Sipariş durum günlüğü (order_events tablosu; offset = son okunan seq)
+    def read_order_events(self, offset: int = 0):
+        """
+        offset'ten sonraki sipariş durum olaylarını ve yeni offset'i döner (bkz. JsonStorage.read_order_events).
+        """
+        with self._lock:
+            if not self._conn.execute("SELECT 1 FROM order_events LIMIT 1").fetchone():
+                with self._transaction():
+                    self._sync_order_events()
+            rows = self._conn.execute("SELECT * FROM order_events WHERE seq > ? ORDER BY seq", (offset,)).fetchall()
+        events = [{"reset": True, "at": row["at"]} if row["reset"] else
+                  {"id": row["order_id"], "status": row["status"], "at": row["at"]} for row in rows]
+        return events, rows[-1]["seq"] if rows else offset
+
+    def _log_order_statuses(self, changes) -> None:
+        # Açık işlemin içinde çağrılır. Tablo boşsa (eski veritabanı) önce mevcut siparişlerden kurulur.
+        if not self._conn.execute("SELECT 1 FROM order_events LIMIT 1").fetchone():
+            self._sync_order_events()
+            return
+        at = datetime.now().isoformat()
+        self._conn.executemany("INSERT INTO order_events (order_id, status, at) VALUES (?, ?, ?)",
+                               [(order_id, status, at) for order_id, status in changes])
+
+    def _sync_order_events(self) -> None:
+        # Açık işlemin içinde çağrılır. Tablo boşsa tüm siparişlerle kurulur; doluysa yalnızca son durumu
+        # farklı olan ve silinen siparişler eklenir (toptan kayıtlar günlüğü büyütmez).
+        at = datetime.now().isoformat()
+        if not self._conn.execute("SELECT 1 FROM order_events LIMIT 1").fetchone():
+            self._conn.execute("INSERT INTO order_events (at, reset) VALUES (?, 1)", (at,))
+            self._conn.execute("INSERT INTO order_events (order_id, status, at) "
+                               "SELECT id, status, ? FROM orders WHERE status IS NOT NULL ORDER BY rowid", (at,))
+            return
+        logged: Dict[str, str] = {}
+        for row in self._conn.execute(
+                "SELECT order_id, status FROM order_events "
+                "WHERE seq > COALESCE((SELECT MAX(seq) FROM order_events WHERE reset = 1), 0) ORDER BY seq"):
+            if row["status"] is None:
+                logged.pop(row["order_id"], None)
+            else:
+                logged[row["order_id"]] = row["status"]
+        current = self._conn.execute("SELECT id, status FROM orders WHERE status IS NOT NULL ORDER BY rowid").fetchall()
+        changes = [(row["id"], row["status"]) for row in current if logged.get(row["id"]) != row["status"]]
+        current_ids = {row["id"] for row in current}
+        changes.extend((order_id, None) for order_id in logged if order_id not in current_ids)
+        self._conn.executemany("INSERT INTO order_events (order_id, status, at) VALUES (?, ?, ?)",
+                               [(order_id, status, at) for order_id, status in changes])
+
+    # Sipariş kalemleri (order_items tablosu, product_id indeksli)
+    def get_order_items(self, order_id: str) -> List[Dict[str, Any]]:
+        """Siparişin kalemleri: [{'product_id', 'quantity', 'price'}, ...] (kalemsiz siparişlerde boş liste)."""
+        with self._lock:
+            return self._load_items(order_id).get(order_id, [])
+
+    def get_product_order_ids(self, product_id: str) -> List[str]:
+        """Ürünü içeren siparişlerin ID'leri (ör. geri çağırma için)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT order_id FROM order_items WHERE product_id = ? GROUP BY order_id ORDER BY MIN(rowid)",
+                (product_id,)
+            ).fetchall()
+        return [row["order_id"] for row in rows]
+
+    def get_product_sales(self, product_id: str) -> Dict[str, Any]:
+        """Ürünün satış özeti: sipariş sayısı, toplam adet ve ciro (Decimal)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(DISTINCT order_id) AS orders, COALESCE(SUM(quantity), 0) AS quantity, "
+                "COALESCE(SUM(quantity * unit_price_cents), 0) AS revenue_cents "
+                "FROM order_items WHERE product_id = ?",
+                (product_id,)
+            ).fetchone()
+        return {"orders": row["orders"], "quantity": row["quantity"], "revenue": Decimal(row["revenue_cents"]) / 100}
+
+    def register_customer(self, id, name, email, password, address, phone):
+        with self._lock, self._transaction():
+            # Aynı e-posta daha önce kayıtlı mı kontrol et (email indeksi üzerinden)
+            if self._conn.execute("SELECT 1 FROM customers WHERE email = ?", (email,)).fetchone():
+                return False
+            self._insert("customers", id, {
+                'id': id,
+                'name': name,
+                'email': email,
+                'password': password,
+                'address': address,
+                'phone': phone
+            })
+        return True
+
+    def delete_customer(self, customer_id: str) -> bool:
+        """Müşteriyi siler; e-posta indeksi veritabanı tarafından güncel tutulur."""
+        return self.delete_record("customers", customer_id)
+
+    def authenticate_customer(self, email, password):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM customers WHERE email = ? AND password = ?",
+                                     (email, password)).fetchone()
+        return self._row_to_record("customers", row, {}) if row else None
+
+    def authenticate_admin(self, email: str, password: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT password FROM admins WHERE email = ?", (email,)).fetchone()
+        return bool(row) and row["password"] == password
+
+    def migrate_from_json(self, data_dir: str = "data") -> bool:
+        """
+        JsonStorage ile tutulan veri dizinini veritabanına bir kez aktarır.
+        Kaynak, dosya adlarıyla değil salt okunur bir JsonStorage üzerinden okunur: parçalı siparişler
+        (orders_manifest'teki dönemle), kalem günlüğündeki sipariş kalemleri, stok defterindeki güncel stoklar,
+        sipariş durum geçmişi ve msgpack gibi diğer biçimlerdeki dosyalar da aktarılır. Kaynak dizine hiçbir
+        dosya yazılmaz. Aktarım daha önce yapılmışsa hiçbir şey yapmaz ve False döner.
+        """
+        with self._lock, self._transaction():
+            if self._conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+                return False
+            if os.path.isdir(data_dir):
+                self._import_json_storage(data_dir)
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                               (os.path.abspath(data_dir),))
+            return True
+
+    def _import_json_storage(self, data_dir: str) -> None:
+        # Günlük modu, günlük modunda yazılmış koleksiyonların henüz anlık görüntüye işlenmemiş
+        # değişikliklerini de okur; günlüğü olmayan koleksiyonlar doğrudan anlık görüntüden okunur.
+        options = dict(log_mode=True, cache_max_bytes=0, read_only=True)
+        source = JsonStorage(data_dir, **options)
+        manifest = source.load_data(OrderPartitions.MANIFEST)
+        if manifest is not None:
+            source = JsonStorage(data_dir, partition_orders=manifest.get("period", "month"), **options)
+
+        products = source.load_data("products")
+        if products is not None:
+            # Güncel stoklar defterdedir; ürün kayıtlarındaki miktar eski olabilir.
+            stocks = read_stock_ledger(os.path.join(data_dir, "stock.ledger"),
+                                       source.load_data(STOCK_SLOTS, default={}))
+            for product_id, product in products.items():
+                if product_id in stocks:
+                    product["stock_quantity"] = stocks[product_id]
+            self.save_data("products", products)
+
+        for name in ("customers", "admins", REORDER_THRESHOLDS):
+            data = source.load_data(name)
+            if data is not None:
+                self.save_data(name, data)
+
+        # Durum geçmişi siparişlerden önce aktarılır; save_data yalnızca geçmişle uyuşmayan durumları ekler.
+        if not self._conn.execute("SELECT 1 FROM order_events LIMIT 1").fetchone():
+            events, _ = source.read_order_events(0)
+            self._conn.executemany(
+                "INSERT INTO order_events (order_id, status, at, reset) VALUES (?, ?, ?, ?)",
+                [(event.get("id"), event.get("status"), event["at"], 1 if event.get("reset") else 0)
+                 for event in events]
+            )
+        orders = []
+        for order in source.iter_orders():
+            items = source.get_order_items(order["id"])
+            if items:
+                order["items"] = items
+            orders.append(order)
+        self.save_data("orders", orders)
+
+    def _transaction(self, immediate: bool = False):
+        return _Transaction(self._conn, immediate)
+
+    def _insert(self, filename: str, key: str, record: Dict[str, Any]):
+        table, key_column, columns = _TABLES[filename]
+        record = dict(record)
+        record.setdefault(key_column, key)
+        items = record.pop("items", None) if filename == "orders" else None
+        values = [record.pop(column, None) for column in columns]
+        extra = json.dumps(record) if record else None
+        placeholders = ", ".join("?" for _ in range(len(columns) + 1))
+        self._conn.execute(f"INSERT INTO {table} ({', '.join(columns)}, extra) VALUES ({placeholders})",
+                           values + [extra])
+        if items:
+            self._conn.executemany(
+                "INSERT INTO order_items (order_id, product_id, quantity, unit_price_cents) VALUES (?, ?, ?, ?)",
+                [(key, item.get("product_id"), item.get("quantity", 1), _to_cents(item.get("price", "0")))
+                 for item in items]
+            )
+
+    def _delete(self, filename: str, key: str) -> int:
+        table, key_column, _ = _TABLES[filename]
+        if filename == "orders":
+            self._conn.execute("DELETE FROM order_items WHERE order_id = ?", (key,))
+        return self._conn.execute(f"DELETE FROM {table} WHERE {key_column} = ?", (key,)).rowcount
+
+    def _load_items(self, order_id: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        query = "SELECT order_id, product_id, quantity, unit_price_cents FROM order_items"
+        params = ()
+        if order_id is not None:
+            query += " WHERE order_id = ?"
+            params = (order_id,)
+        items: Dict[str, List[Dict[str, Any]]] = {}
+        for row in self._conn.execute(query + " ORDER BY rowid", params):
+            items.setdefault(row["order_id"], []).append({
+                "product_id": row["product_id"],
+                "quantity": row["quantity"],
+                "price": _format_cents(row["unit_price_cents"]),
+            })
+        return items
+
+    @staticmethod
+    def _row_to_record(filename: str, row: sqlite3.Row, items: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        _, key_column, columns = _TABLES[filename]
+        record = {column: row[column] for column in columns if row[column] is not None}
+        if row["extra"]:
+            record.update(json.loads(row["extra"]))
+        if record[key_column] in items:
+            record["items"] = items[record[key_column]]
+        return record
+
+
+class _Transaction:
+    """İç içe kullanılabilen basit BEGIN/COMMIT bağlam yöneticisi."""
+
+    def __init__(self, conn: sqlite3.Connection, immediate: bool = False):
+        self._conn = conn
+        self._immediate = immediate  # yazma kilidi okumadan önce alınır
+        self._owner = False
+
+    def __enter__(self):
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN IMMEDIATE" if self._immediate else "BEGIN")
+            self._owner = True
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._owner:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+if __name__ == "__main__":
+    # Kullanım: python -m src.data.sqlite_storage [json_dizini] [veritabani_yolu]
+    source = sys.argv[1] if len(sys.argv) > 1 else "data"
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.join(source, "ecommerce.db")
+    migrated = SqliteStorage(target).migrate_from_json(source)
+    print("Migration completed" if migrated else "Database was already migrated")
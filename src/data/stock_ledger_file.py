@@ -0,0 +1,31 @@
+import os
+from struct import Struct
+from typing import Dict, Mapping
+
+# Stok defteri dosyasının biçimi: sihirli dizgeyi ve slot nesil sayacını içeren sabit uzunlukta bir başlık,
+# ardından slot başına 8 baytlık işaretli bir tamsayı (bkz. StockLedger). Nesil sayacı bir slot her
+# boşaltıldığında artar; önbelleğindeki slot eşlemesi eskiyen süreçler bunu görüp eşlemeyi yeniden okur.
+MAGIC = b"STKLDG01"
+GENERATION_OFFSET = len(MAGIC)
+HEADER_SIZE = 16
+SLOT = Struct("<q")
+
+
+def read_stock_ledger(path: str, slots: Mapping[str, int]) -> Dict[str, int]:
+    """
+    Defter dosyasındaki miktarları slot eşlemesine göre ürün ID'si -> miktar olarak okur.
+    Dosya yalnızca okunur: kilit dosyası oluşturulmaz, eksik ya da geçersiz dosya yeniden kurulmaz.
+    Dosyanın dışında kalan slotlar atlanır.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "rb") as file:
+        raw = file.read()
+    if raw[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Invalid stock ledger file: {path}")
+    quantities = {}
+    for product_id, slot in slots.items():
+        offset = HEADER_SIZE + slot * SLOT.size
+        if offset + SLOT.size <= len(raw):
+            quantities[product_id] = SLOT.unpack_from(raw, offset)[0]
+    return quantities
@@ -1,54 +1,1034 @@
+import atexit
+import io
 import json
 import os
-from typing import Dict, Any, Optional
+import random
+import threading
+import time
+from collections.abc import Mapping
+from contextlib import nullcontext
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from src.data.cache import ReadCache, ReadOnlyList, copy_json, readonly, stat_signature
+from src.data.locking import ConcurrentModificationError, InterProcessLock
+from src.data.order_events import OrderEventLog
+from src.data.order_indexes import CustomerEmailIndex, CustomerOrderIndex, OrderLinesIndex
+from src.data.order_partitions import OrderPartitions
+from src.data.serializers import JsonCodec, detect_codec, get_codec, is_json, iter_msgpack_records
+from src.data.streaming import iter_json_records
+from src.data.wal import WriteAheadLog, to_records, from_records
+
+_MISSING = object()
+
+
+def _write_temp(path: str, content: bytes, durable: bool = True) -> str:
+    """İçeriği hedefin yanındaki geçici dosyaya yazar (isteğe bağlı fsync) ve geçici yolu döner."""
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(content)
+            file.flush()
+            if durable:
+                os.fsync(file.fileno())
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return temp_path
+
+
+def _to_cents(price: Any) -> int:
+    return int((Decimal(str(price)) * 100).to_integral_value())
+
+
+def _format_cents(cents: int) -> str:
+    # Kuruş her zaman iki basamakla yazılır: 500 -> '5.00' (kayıtlardaki fiyat biçimiyle aynı).
+    return str((Decimal(cents) / 100).quantize(Decimal("0.01")))
+
+
+def _atomic_write(path: str, content: bytes, durable: bool = True):
+    # Yeniden adlandırma atomiktir: okuyucular ya eski ya da yeni dosyanın tamamını görür.
+    os.replace(_write_temp(path, content, durable), path)
 
 class JsonStorage:
     """
     Uygulama için JSON tabanlı veri saklama sınıfı.
     Kullanıcı ve admin verilerini JSON dosyalarında tutar.
+
+    log_mode=True olduğunda değişiklikler dosyanın tamamı yeniden yazılmak yerine
+    koleksiyon başına append-only bir günlüğe eklenir; günlük belirli sayıda kayda
+    ulaşınca arka planda anlık görüntüye (snapshot) sıkıştırılır.
+
+    Okumalar, dosyanın mtime/boyut/inode bilgisiyle doğrulanan bir LRU önbellekten
+    karşılanır; cache_max_bytes=0 önbelleği kapatır.
+
+    partition_orders="month" (ya da "year"/"day") verildiğinde siparişler dönem bazlı
+    parça dosyalarında tutulur (bkz. OrderPartitions).
+
+    Siparişlerin durum değişiklikleri (ekleme, durum güncellemesi, silme) ayrıca append-only
+    order_events.log günlüğüne yazılır (bkz. OrderEventLog, OrderLifecycle). Müşteri -> sipariş
+    indeksi (customer_orders) sipariş sayısını ve toplam harcamayı müşteri başına hazır tutar.
+    Müşteri e-posta indeksi (customer_emails) girişte müşteriyi dosyayı taramadan ID'siyle bulur.
+
+    Dosyalar her zaman geçici dosya + yeniden adlandırma ile atomik yazılır. group_commit_window
+    (saniye) verildiğinde aynı dosyaya bu süre içinde yapılan kayıtlar tek bir fiziksel yazma ve
+    fsync ile birleştirilir; bekleyen kayıtlar okumalarda görünür ve flush() ile hemen yazılır.
+
+    serializer dosyaların yazılma biçimini seçer ("json", "json-pretty", kuruluysa "orjson"
+    ve "msgpack"); okurken biçim dosya içeriğinden otomatik anlaşılır.
+
+    shared=True, aynı veri dizinini kullanan birden fazla süreç içindir: her dosya yazımı dosyaya
+    özel bir danışma kilidi altında yapılır ve dosyanın sürüm numarasını (<ad>.version) artırır.
+    update() oku-değiştir-yaz döngüsünü karşılaştır-ve-değiştir (CAS) ile yapar ve çakışmada
+    yeniden dener. Grup kaydı bu modda kapalıdır; günlük modu ile birlikte kullanılamaz.
+
+    read_only=True veri dizinini olduğu gibi okur (ör. başka bir depoya göç için): açılışta varsayılan
+    admin eklenmez, eski biçimler dönüştürülmez; henüz kurulmamış indeksler yalnızca bellekte kurulur.
+    Dosyaya yazacak her işlem ValueError fırlatır.
     """
-    def __init__(self, data_dir: str = "data"):
+    # Henüz dosyası olmayan koleksiyonlar için varsayılan yapı liste olur.
+    LIST_COLLECTIONS = {"orders"}
+
+    def __init__(self, data_dir: str = "data", log_mode: bool = False, compact_threshold: int = 1000,
+                 cache_max_bytes: int = 64 * 1024 * 1024, partition_orders: Optional[str] = None,
+                 group_commit_window: float = 0.0, durable: bool = True, serializer: str = "json",
+                 shared: bool = False, cas_retries: int = 50, read_only: bool = False):
+        if shared and log_mode:
+            raise ValueError("log_mode cannot be combined with shared=True")
         self.data_dir = data_dir
-        self._ensure_data_directory()
-        self._ensure_admin_account()
+        self.log_mode = log_mode
+        self.compact_threshold = compact_threshold
+        self.shared = shared
+        self.read_only = read_only
+        self.cas_retries = cas_retries
+        # Günlük modunda yazmalar zaten küçük eklemeler olduğundan, paylaşımlı modda ise diğer
+        # süreçler bekleyen yazmaları göremeyeceğinden grup kaydı kullanılmaz.
+        self.group_commit_window = 0.0 if (log_mode or shared or read_only) else group_commit_window
+        self.durable = durable
+        self._codec = get_codec(serializer)
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, Any] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        if self.group_commit_window:
+            atexit.register(self.flush)
+        self._file_locks: Dict[str, InterProcessLock] = {}
+        self._logs: Dict[str, WriteAheadLog] = {}
+        # Günlük modunda koleksiyonun bilinen son hali: anahtar -> serileştirilmiş kayıt
+        self._log_state: Dict[str, Tuple[bool, Dict[str, str]]] = {}
+        self._log_counts: Dict[str, int] = {}
+        self._compacting: Dict[str, threading.Thread] = {}
+        self._cache = ReadCache(cache_max_bytes) if cache_max_bytes else None
+        # Liste koleksiyonları için önbellekteki veri nesnesine bağlı ID -> kayıt eşlemesi (bkz. _get_record)
+        self._id_maps: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
+        if not read_only:
+            self._ensure_data_directory()
+        self._order_events = OrderEventLog(os.path.join(data_dir, "order_events.log"))
+        # Günlükten okunmuş son durumlar: (okunan bayt konumu, sipariş ID'si -> durum); bkz. _logged_order_statuses
+        self._logged_statuses: Tuple[int, Dict[str, str]] = (0, {})
+        self._order_lines = OrderLinesIndex(self, self.ORDER_LINES)
+        self._customer_orders = CustomerOrderIndex(self, self.CUSTOMER_ORDER_INDEX)
+        self._customer_emails = CustomerEmailIndex(self, self.CUSTOMER_EMAIL_INDEX)
+        if not read_only:
+            self._ensure_admin_account()
+        self._orders = OrderPartitions(self, partition_orders) if partition_orders else None
 
     def _ensure_data_directory(self):
         os.makedirs(self.data_dir, exist_ok=True)
 
+    def _check_writable(self):
+        if self.read_only:
+            raise ValueError(f"Storage at '{self.data_dir}' is read-only")
+
     def _get_file_path(self, filename: str) -> str:
         return os.path.join(self.data_dir, f"{filename}.json")
 
     def _ensure_admin_account(self):
-        admins = self.load_data("admins", default={})
-        if not admins:
+        def add_default_admin(admins):
+            if admins:
+                return False
             admins["admin@example.com"] = {
                 "email": "admin@example.com",
                 "password": "123"
             }
-            self.save_data("admins", admins)
+            return True
+
+        self.update("admins", add_default_admin, default={})
 
     def save_data(self, filename: str, data: Any):
-        path = self._get_file_path(filename)
-        with open(path, "w") as file:
-            json.dump(data, file, indent=2)
+        self._save_data(filename, data)
+        if filename == 'orders':
+            # Koleksiyon toptan değişti; durum günlüğüne yalnızca farklılaşan siparişler eklenir,
+            # müşteri indeksi kaydedilen siparişlerden tek yazmayla yeniden kurulur.
+            self._sync_order_events()
+            self._customer_orders.rewrite(self._customer_order_entries(data))
+        elif filename == 'customers':
+            self._reindex_customers(data)
+
+    def _save_data(self, filename: str, data: Any):
+        if filename == 'orders' and self._orders is not None:
+            self._orders.replace_all(data)
+            return
+        if self.log_mode:
+            with self._lock:
+                try:
+                    is_list, records = to_records(data)
+                except TypeError:
+                    self._write_snapshot(filename, data)
+                    self._get_log(filename).clear()
+                    self._log_state.pop(filename, None)
+                    return
+                self._save_to_log(filename, is_list, records)
+            return
+        self._write_snapshot(filename, data)
 
     def load_data(self, filename: str, default: Any = None) -> Any:
+        if filename == 'orders' and self._orders is not None:
+            return self._orders.load_orders()
+        data = self._load_cached(filename)
+        if data is _MISSING:
+            return default
+        return copy_json(data) if self._cache is not None else data
+
+    def load_view(self, filename: str, default: Any = None) -> Any:
+        """Veriyi kopyalamadan salt okunur bir görünüm olarak döner; yalnızca okuyan ekranlar içindir."""
+        if filename == 'orders' and self._orders is not None:
+            return ReadOnlyList(self._orders.load_orders(view=True))
+        data = self._load_cached(filename)
+        if data is _MISSING:
+            return default
+        return readonly(data)
+
+    def _source_paths(self, filename: str):
+        path = self._get_file_path(filename)
+        if self.log_mode:
+            log = self._get_log(filename)
+            return path, log.path, log.compacting_path
+        return (path,)
+
+    def _load_cached(self, filename: str) -> Any:
+        pending = self._pending.get(filename, _MISSING)
+        if pending is not _MISSING:
+            return pending
+        if self._cache is None:
+            return self._load_uncached(filename)
+        signature = stat_signature(self._source_paths(filename))
+        if signature is None:
+            return _MISSING
+        hit, data = self._cache.get(filename, signature)
+        if hit:
+            return data
+        data = self._load_uncached(filename)
+        if data is not _MISSING:
+            self._cache.put(filename, signature, data)
+        return data
+
+    def _load_uncached(self, filename: str) -> Any:
+        if self.log_mode:
+            with self._lock:
+                if self._get_log(filename).exists():
+                    is_list, records = self._replay(filename)
+                    return from_records(is_list, records)
+        return self._read_snapshot(filename, _MISSING)
+
+    def put_record(self, filename: str, key: str, value: Any):
+        """Koleksiyondaki tek bir kaydı ekler ya da günceller."""
+        self._put_record(filename, key, value)
+        if filename == 'customers':
+            self._index_customers([(key, value)])
+
+    def _put_record(self, filename: str, key: str, value: Any):
+        with self._lock:
+            if filename == 'orders' and self._orders is not None:
+                self._orders.put_order(value)
+                return
+            if self.log_mode:
+                is_list, state = self._get_log_state(filename)
+                if not state and not os.path.exists(self._get_file_path(filename)):
+                    self._write_snapshot(filename, from_records(is_list, {key: value}))
+                    state[key] = self._encode(value)
+                    return
+                state[key] = self._encode(value)
+                self._append_log(filename, "put", key, value)
+                return
+
+            def put(data):
+                if isinstance(data, list):
+                    for index, item in enumerate(data):
+                        if isinstance(item, dict) and item.get("id") == key:
+                            data[index] = value
+                            break
+                    else:
+                        data.append(value)
+                else:
+                    data[key] = value
+                return True
+
+            self._update(filename, put, default=[] if filename in self.LIST_COLLECTIONS else {})
+
+    def delete_record(self, filename: str, key: str) -> bool:
+        """Koleksiyondan tek bir kaydı siler. Kayıt yoksa False döner."""
+        order = self._get_order(key) if filename == 'orders' else None
+        deleted = self._delete_record(filename, key)
+        if deleted and filename == 'orders':
+            self._drop_order_lines([key])
+            self._log_order_statuses([(key, None)])
+            if order is not None:
+                self._unindex_customer_orders([order])
+        if deleted and filename == 'customers':
+            self._index_customers([(key, None)])
+        return deleted
+
+    def _delete_record(self, filename: str, key: str) -> bool:
+        with self._lock:
+            if filename == 'orders' and self._orders is not None:
+                return self._orders.delete_order(key)
+            if self.log_mode:
+                is_list, state = self._get_log_state(filename)
+                if key not in state:
+                    return False
+                del state[key]
+                self._append_log(filename, "del", key)
+                return True
+
+            def delete(data):
+                if isinstance(data, list):
+                    for index, item in enumerate(data):
+                        if isinstance(item, dict) and item.get("id") == key:
+                            del data[index]
+                            return True
+                    return False
+                if not data or key not in data:
+                    return False
+                del data[key]
+                return True
+
+            return self._update(filename, delete)
+
+    def update(self, filename: str, mutator: Callable[[Any], bool], default: Any = None) -> bool:
+        """
+        Koleksiyonu okur, mutator ile yerinde değiştirir ve kaydeder.
+        mutator değişiklik yaptıysa True, kayda gerek yoksa False dönmelidir; sonuç aynen döndürülür.
+        Paylaşımlı modda kayıt karşılaştır-ve-değiştir ile yapılır ve çakışmada yeniden denenir.
+        """
+        if filename != 'customers':
+            return self._update(filename, mutator, default)
+        result = None
+
+        def capture(data):
+            nonlocal result
+            changed = mutator(data)
+            result = data if changed else None
+            return changed
+
+        changed = self._update(filename, capture, default)
+        if result is not None:
+            self._reindex_customers(result)
+        return changed
+
+    def _update(self, filename: str, mutator: Callable[[Any], bool], default: Any = None) -> bool:
+        if not self.shared:
+            with self._lock:
+                data = self.load_data(filename, default)
+                changed = mutator(data)
+                if changed:
+                    self._save_data(filename, data)
+                return changed
+
+        for attempt in range(self.cas_retries):
+            data, version = self.load_versioned(filename, default)
+            changed = mutator(data)
+            if not changed:
+                return changed
+            if self.compare_and_swap(filename, data, version):
+                return changed
+            # Çakışma: başka bir süreç araya girdi; rastgele artan beklemeyle tekrar denenir.
+            time.sleep(random.uniform(0, 0.001 * (2 ** min(attempt, 8))))
+        raise ConcurrentModificationError(f"Could not update '{filename}' after {self.cas_retries} attempts")
+
+    def load_versioned(self, filename: str, default: Any = None) -> Tuple[Any, int]:
+        """Koleksiyonu sürüm numarasıyla birlikte, tutarlı bir çift olarak okur."""
+        with self._file_lock(filename):
+            return self.load_data(filename, default), self._read_version(filename)
+
+    def compare_and_swap(self, filename: str, data: Any, expected_version: int) -> bool:
+        """Dosyanın sürümü hâlâ expected_version ise veriyi yazar; aksi halde False döner."""
+        with self._lock, self._file_lock(filename):
+            if self._read_version(filename) != expected_version:
+                return False
+            self._write_file(filename, data)
+            return True
+
+    def _file_lock(self, filename: str) -> InterProcessLock:
+        with self._lock:
+            lock = self._file_locks.get(filename)
+            if lock is None:
+                lock = InterProcessLock(self._get_file_path(filename) + ".lock")
+                self._file_locks[filename] = lock
+            return lock
+
+    def _read_version(self, filename: str) -> int:
+        try:
+            with open(self._get_file_path(filename) + ".version", "r") as file:
+                return int(file.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _write_version(self, filename: str, version: int):
+        _atomic_write(self._get_file_path(filename) + ".version", str(version).encode("ascii"), durable=False)
+
+    def drop_collection(self, filename: str):
+        """Koleksiyonun dosyasını, günlüğünü ve önbellek kaydını kaldırır."""
+        self._check_writable()
+        with self._lock:
+            self._pending.pop(filename, None)
+            path = self._get_file_path(filename)
+            if os.path.exists(path):
+                os.remove(path)
+            self._get_log(filename).clear()
+            self._log_state.pop(filename, None)
+            self._log_counts.pop(filename, None)
+            self._id_maps.pop(filename, None)
+            if self._cache is not None:
+                self._cache.invalidate(filename)
+
+    def save_raw(self, filename: str, content: bytes):
+        """
+        Önceden serileştirilmiş içeriği dosyaya olduğu gibi (atomik olarak) yazar. İçeriği kendisi
+        üreten ve kayıtların dosyadaki konumlarını bilmesi gereken çağıranlar içindir (bkz. LazyCatalogue).
+        """
+        if self.log_mode:
+            raise ValueError("save_raw cannot be used with log_mode=True")
+        self._check_writable()
+        with self._lock:
+            self._pending.pop(filename, None)
+        with self._file_lock(filename) if self.shared else nullcontext():
+            _atomic_write(self._get_file_path(filename), content, self.durable)
+            if self.shared:
+                self._write_version(filename, self._read_version(filename) + 1)
+            if self._cache is not None:
+                self._cache.invalidate(filename)
+
+    def compact(self, filename: str, wait: bool = True):
+        """Günlüğü anlık görüntüye sıkıştırır."""
+        thread = self._start_compaction(filename)
+        if thread and wait:
+            thread.join()
+
+    def flush(self):
+        """Grup kaydı penceresinde bekleyen tüm kayıtları diske yazar."""
+        with self._flush_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                pending = dict(self._pending)
+            for filename, data in pending.items():
+                self._write_file(filename, data)
+                with self._lock:
+                    # Yazma sırasında daha yeni bir kayıt geldiyse bekleyen listede kalır.
+                    if self._pending.get(filename) is data:
+                        del self._pending[filename]
+
+    def _write_snapshot(self, filename: str, data: Any):
+        self._check_writable()
+        if self.group_commit_window:
+            with self._lock:
+                self._pending[filename] = copy_json(data)
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.group_commit_window, self.flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+            return
+        self._write_file(filename, data)
+
+    def _write_file(self, filename: str, data: Any):
+        self._check_writable()
+        with self._file_lock(filename) if self.shared else nullcontext():
+            _atomic_write(self._get_file_path(filename), self._codec.dumps(data), self.durable)
+            if self.shared:
+                self._write_version(filename, self._read_version(filename) + 1)
+            if self._cache is not None:
+                self._cache.put(filename, stat_signature(self._source_paths(filename)), copy_json(data))
+
+    def _read_snapshot(self, filename: str, default: Any = None) -> Any:
         path = self._get_file_path(filename)
         if not os.path.exists(path):
             return default
-        with open(path, "r") as file:
-            return json.load(file)
+        with open(path, "rb") as file:
+            raw = file.read()
+        return detect_codec(raw).loads(raw)
 
-    def register_customer(self, id, name, email, password, address, phone):
-        customers = self.load_data('customers', default={})
+    # Günlük (write-ahead log) modu
+    def _get_log(self, filename: str) -> WriteAheadLog:
+        log = self._logs.get(filename)
+        if log is None:
+            log = WriteAheadLog(os.path.join(self.data_dir, f"{filename}.log"))
+            self._logs[filename] = log
+        return log
+
+    @staticmethod
+    def _encode(value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"))
+
+    def _replay(self, filename: str) -> Tuple[bool, Dict[str, Any]]:
+        snapshot = self._read_snapshot(filename)
+        if snapshot is None:
+            snapshot = [] if filename in self.LIST_COLLECTIONS else {}
+        is_list, records = to_records(snapshot)
+        for op, key, value in self._get_log(filename).entries():
+            if op == "put":
+                records[key] = value
+            else:
+                records.pop(key, None)
+        return is_list, records
+
+    def _get_log_state(self, filename: str) -> Tuple[bool, Dict[str, str]]:
+        state = self._log_state.get(filename)
+        if state is None:
+            is_list, records = self._replay(filename)
+            state = (is_list, {key: self._encode(value) for key, value in records.items()})
+            self._log_state[filename] = state
+            self._log_counts[filename] = self._get_log(filename).entry_count()
+        return state
 
-        #Aynı e-posta daha önce kayıtlı mı kontrol et
-        for customer_id, customer in customers.items():
-            if customer['email'] == email:
+    def _save_to_log(self, filename: str, is_list: bool, records: Dict[str, Any]):
+        if not os.path.exists(self._get_file_path(filename)) and not self._get_log(filename).exists():
+            self._write_snapshot(filename, from_records(is_list, records))
+            self._log_state[filename] = (is_list, {key: self._encode(value) for key, value in records.items()})
+            self._log_counts[filename] = 0
+            return
+
+        _, state = self._get_log_state(filename)
+        for key, value in records.items():
+            encoded = self._encode(value)
+            if state.get(key) != encoded:
+                state[key] = encoded
+                self._append_log(filename, "put", key, value)
+        for key in [key for key in state if key not in records]:
+            del state[key]
+            self._append_log(filename, "del", key)
+
+    def _append_log(self, filename: str, op: str, key: str, value: Any = None):
+        self._check_writable()
+        self._get_log(filename).append(op, key, value)
+        self._log_counts[filename] = self._log_counts.get(filename, 0) + 1
+        if self._log_counts[filename] >= self.compact_threshold:
+            self._start_compaction(filename)
+
+    def _start_compaction(self, filename: str) -> Optional[threading.Thread]:
+        self._check_writable()
+        with self._lock:
+            running = self._compacting.get(filename)
+            if running and running.is_alive():
+                return running
+            is_list, state = self._get_log_state(filename)
+            if not self._get_log(filename).rotate():
+                return None
+            # Döndürme anındaki durumun kopyası arka planda anlık görüntüye yazılır.
+            items = list(state.items())
+            self._log_counts[filename] = 0
+            thread = threading.Thread(target=self._compact_worker,
+                                      args=(filename, is_list, items), daemon=True)
+            self._compacting[filename] = thread
+            thread.start()
+            return thread
+
+    def _compact_worker(self, filename: str, is_list: bool, items):
+        path = self._get_file_path(filename)
+        if isinstance(self._codec, JsonCodec) and self._codec.name != "json-pretty":
+            # Kayıtlar zaten JSON olarak tutulduğundan yeniden serileştirmeden birleştirilir.
+            if is_list:
+                body = "[" + ",".join(encoded for _, encoded in items) + "]"
+            else:
+                body = "{" + ",".join(f"{json.dumps(key)}:{encoded}" for key, encoded in items) + "}"
+            content = body.encode("utf-8")
+        else:
+            records = {key: json.loads(encoded) for key, encoded in items}
+            content = self._codec.dumps(from_records(is_list, records))
+        temp_path = _write_temp(path, content, self.durable)
+        with self._lock:
+            os.replace(temp_path, path)
+            self._get_log(filename).finish_compaction()
+
+    def get_record(self, filename: str, key: str) -> Optional[Dict[str, Any]]:
+        """Tek bir kaydı anahtarıyla okur; liste koleksiyonlarında kayıt 'id' alanıyla bulunur."""
+        if filename == 'orders':
+            order = self._get_order(key)
+            if order is not None:
+                items = self.get_order_items(key)
+                if items:
+                    order['items'] = items
+            return order
+        return self._get_record(filename, key)
+
+    def _get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        # Sipariş kaydı, kalemleri eklenmeden
+        return self._orders.get_order(order_id) if self._orders is not None else self._get_record('orders', order_id)
+
+    def _get_record(self, filename: str, key: str) -> Optional[Dict[str, Any]]:
+        if self._cache is not None and not (filename == 'orders' and self._orders is not None):
+            data = self._load_cached(filename)
+            if isinstance(data, list):
+                # Önbellekteki nesneler yerinde değiştirilmez (yazmalar yeni bir kopya koyar); bu yüzden
+                # ID eşlemesi aynı nesne için bir kez kurulur ve sonraki aramalar O(1) olur.
+                memo = self._id_maps.get(filename)
+                if memo is None or memo[0] is not data:
+                    memo = (data, {item.get("id"): item for item in data if isinstance(item, dict)})
+                    self._id_maps[filename] = memo
+                record = memo[1].get(key)
+                return copy_json(record) if record is not None else None
+        data = self.load_view(filename)
+        if data is None:
+            return None
+        if isinstance(data, Mapping):
+            record = data.get(key)
+        else:
+            record = next((item for item in data if isinstance(item, Mapping) and item.get("id") == key), None)
+        return record.copy() if isinstance(record, Mapping) else None
+
+    # Sipariş işlemleri
+    def add_order(self, order: Dict[str, Any]):
+        """
+        Siparişi ekler. 'items' ({product_id, quantity, price} listesi) verilmişse kalemler sipariş
+        kaydından ayrılarak sipariş kalemleri koleksiyonuna yazılır ve ürün -> sipariş indeksine eklenir.
+        """
+        order = dict(order)
+        items = order.pop('items', None)
+        if items:
+            self._put_order_lines({order['id']: items})
+        self.put_record('orders', order['id'], order)
+        self._log_order_statuses([(order['id'], order.get('status'))])
+        self._index_customer_orders([order])
+
+    def add_orders(self, orders: Iterable[Dict[str, Any]]):
+        """
+        Birden çok siparişi ekler (bkz. add_order). Sipariş dosyası, kalemler ve ürün indeksi sipariş başına
+        değil, toplu olarak birer kez yazılır. Parçalı ve günlük modlarında siparişler yine tek tek eklenir;
+        bu modlarda tek sipariş eklemek zaten dosyanın tamamını yeniden yazmaz.
+        """
+        records = []
+        items_by_order = {}
+        for order in orders:
+            order = dict(order)
+            items = order.pop('items', None)
+            if items:
+                items_by_order[order['id']] = items
+            records.append(order)
+        if not records:
+            return
+        with self._lock:
+            if items_by_order:
+                self._put_order_lines(items_by_order)
+            if self._orders is not None or self.log_mode:
+                for order in records:
+                    self.put_record('orders', order['id'], order)
+            else:
+                new_ids = {order['id'] for order in records}
+
+                def append(existing):
+                    # put_record gibi: aynı ID'li eski kayıtların yerine yenileri yazılır.
+                    existing[:] = [o for o in existing if not (isinstance(o, dict) and o.get('id') in new_ids)]
+                    existing.extend(records)
+                    return True
+
+                self.update('orders', append, default=[])
+            self._log_order_statuses([(order['id'], order.get('status')) for order in records])
+            self._index_customer_orders(records)
+
+    def update_order(self, order_id: str, **changes) -> bool:
+        """Siparişin verilen alanlarını günceller. Sipariş bulunamazsa False döner."""
+        # Müşterisi ya da tutarı değişen sipariş müşteri indeksinde yeniden konumlandırılır.
+        reindex = 'customer_id' in changes or 'total_price' in changes
+        old = self._get_order(order_id) if reindex else None
+        updated = self._update_order(order_id, changes)
+        if updated and 'status' in changes:
+            self._log_order_statuses([(order_id, changes['status'])])
+        if updated and old is not None:
+            self._index_customer_orders([dict(old, **changes)])
+        return updated
+
+    # modify_order ile değiştirilemeyen alanlar: parça yeri ve müşteri indeksi bunlara bağlıdır (bkz. update_order).
+    _FIXED_ORDER_FIELDS = ('id', 'date', 'customer_id', 'total_price')
+
+    def modify_order(self, order_id: str, mutator: Callable[[Dict[str, Any]], bool]) -> bool:
+        """
+        Siparişi, bulunduğu dosyanın oku-değiştir-yaz döngüsü içinde (paylaşımlı modda CAS ile) mutator'a verir.
+        mutator'ın kontrol ettiği kayıt yazılan kayıttır; araya başka bir sürecin yazması girerse döngü
+        güncel kayıtla yeniden çalışır (ör. durum geçişi doğrulaması). mutator kaydı yerinde değiştirip True
+        dönmelidir; fırlattığı hata hiçbir şey yazılmadan iletilir. Sipariş yoksa ya da mutator False dönerse
+        False döner. id, date, customer_id ve total_price bu yolla değiştirilemez.
+        """
+        statuses: Dict[str, Any] = {}
+
+        def apply(orders):
+            for order in orders:
+                if isinstance(order, dict) and order.get('id') == order_id:
+                    fixed = [order.get(field) for field in self._FIXED_ORDER_FIELDS]
+                    old_status = order.get('status')
+                    if not mutator(order):
+                        return False
+                    if [order.get(field) for field in self._FIXED_ORDER_FIELDS] != fixed:
+                        raise ValueError(f"modify_order cannot change {', '.join(self._FIXED_ORDER_FIELDS)}")
+                    statuses.update(old=old_status, new=order.get('status'))
+                    return True
+            return False
+
+        with self._lock:
+            if self._orders is not None:
+                changed = self._orders.modify_order(order_id, apply)
+            elif self.log_mode:
+                order = self._get_order(order_id)
+                changed = order is not None and apply([order])
+                if changed:
+                    self.put_record('orders', order_id, order)
+            else:
+                changed = self.update('orders', apply, default=[])
+            if changed and statuses['new'] != statuses['old']:
+                self._log_order_statuses([(order_id, statuses['new'])])
+        return changed
+
+    def _update_order(self, order_id: str, changes: Dict[str, Any]) -> bool:
+        with self._lock:
+            if self._orders is not None:
+                return self._orders.update_order(order_id, changes)
+            if self.log_mode:
+                order = self.get_record('orders', order_id)
+                if order is None:
+                    return False
+                order.update(changes)
+                self.put_record('orders', order_id, order)
+                return True
+
+            def apply(orders):
+                for order in orders:
+                    if isinstance(order, dict) and order.get('id') == order_id:
+                        order.update(changes)
+                        return True
                 return False
 
-        # Yeni musteri verisi ekle
-        customers[id] = {
+            return self.update('orders', apply, default=[])
+
+    def load_orders(self, start=None, end=None) -> list:
+        """Tarihi [start, end] aralığındaki siparişleri döner; parçalı modda yalnızca ilgili parçalar okunur."""
+        if self._orders is not None:
+            return self._orders.load_orders(start, end)
+        start = start.isoformat() if isinstance(start, datetime) else start
+        end = end.isoformat() if isinstance(end, datetime) else end
+        return [
+            order for order in self.load_data('orders', default=[])
+            if (not start or (order.get('date') or '') >= start) and (not end or (order.get('date') or '') <= end)
+        ]
+
+    def iter_orders(self, customer_id: Optional[str] = None, status: Optional[str] = None,
+                    start=None, end=None) -> Iterator[Dict[str, Any]]:
+        """
+        Siparişleri tek tek üretir; filtreler okuma sırasında uygulanır.
+        Önbellekte olmayan dosyalar akış halinde okunduğundan bellek kullanımı sipariş sayısıyla büyümez.
+        """
+        start = start.isoformat() if isinstance(start, datetime) else start
+        end = end.isoformat() if isinstance(end, datetime) else end
+        if self._orders is not None:
+            names = [self._orders.partition_name(key)
+                     for key in self._orders.partition_keys(start, end, customer_id=customer_id)]
+        else:
+            names = ['orders']
+        for name in names:
+            for order in self.iter_records(name):
+                if not isinstance(order, dict):
+                    continue
+                if customer_id is not None and order.get('customer_id') != customer_id:
+                    continue
+                if status is not None and order.get('status') != status:
+                    continue
+                date = order.get('date') or ''
+                if (start and date < start) or (end and date > end):
+                    continue
+                yield order
+
+    def iter_records(self, filename: str) -> Iterator[Any]:
+        """Koleksiyondaki kayıtları (liste elemanları ya da sözlük değerleri) tek tek üretir."""
+        data = self._pending.get(filename, _MISSING)
+        if data is _MISSING and self._cache is not None:
+            signature = stat_signature(self._source_paths(filename))
+            hit, data = self._cache.get(filename, signature) if signature else (False, _MISSING)
+            if not hit:
+                data = _MISSING
+        if data is _MISSING and self.log_mode and self._get_log(filename).exists():
+            data = self._load_uncached(filename)
+        if data is not _MISSING:
+            # Bellekteki veri zaten hazır; kayıtlar tek tek kopyalanarak verilir.
+            for record in (data.values() if isinstance(data, dict) else data):
+                yield copy_json(record)
+            return
+        path = self._get_file_path(filename)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as file:
+            head = file.read(64)
+            file.seek(0)
+            if is_json(head):
+                yield from iter_json_records(io.TextIOWrapper(file, encoding="utf-8"))
+            else:
+                yield from iter_msgpack_records(file)
+
+    def delete_customer_orders(self, customer_id: str) -> int:
+        """Müşterinin tüm siparişlerini (ve kalemlerini) siler; silinen sipariş sayısını döner."""
+        with self._lock:
+            order_ids = [order.get('id') for order in self.iter_orders(customer_id=customer_id)]
+            deleted = self._delete_customer_orders(customer_id)
+            if deleted:
+                self._drop_order_lines(order_ids)
+                self._log_order_statuses([(order_id, None) for order_id in order_ids])
+                self._unindex_customer_orders([{'id': order_id, 'customer_id': customer_id} for order_id in order_ids])
+            return deleted
+
+    def _delete_customer_orders(self, customer_id: str) -> int:
+        with self._lock:
+            if self._orders is not None:
+                return self._orders.delete_customer_orders(customer_id)
+            deleted = 0
+
+            def remove(orders):
+                nonlocal deleted
+                remaining = [o for o in orders if not (isinstance(o, dict) and o.get('customer_id') == customer_id)]
+                deleted = len(orders) - len(remaining)
+                orders[:] = remaining
+                return deleted > 0
+
+            self.update('orders', remove, default=[])
+            return deleted
+
+    # Sipariş kalemleri ve ürün -> sipariş indeksi (order_lines.jsonl, bkz. OrderLinesIndex)
+    # Kalemler normalize ve kısa biçimde tutulur: sipariş ID'si -> [[ürün ID'si, adet, birim fiyat (kuruş)], ...]
+    ORDER_LINES = "order_lines"
+    # Önceki sürümlerin kalemleri ve ürün indeksini tuttuğu koleksiyonlar; ilk erişimde günlüğe taşınır.
+    _LEGACY_ORDER_LINES = ("order_lines", "product_orders")
+
+    def _put_order_lines(self, items_by_order: Dict[str, Any]) -> None:
+        self._lines_index().write(
+            (order_id, [[item.get('product_id'), int(item.get('quantity', 1)), _to_cents(item.get('price', '0'))]
+                        for item in items])
+            for order_id, items in items_by_order.items()
+        )
+
+    def _drop_order_lines(self, order_ids) -> None:
+        """Silinen siparişlerin kalemlerini tek yazmayla kaldırır; ürün indeksi kendiliğinden güncellenir."""
+        with self._lock:
+            index = self._lines_index()
+            index.write((order_id, None) for order_id in dict.fromkeys(order_ids) if order_id in index.entries)
+
+    def _lines_index(self) -> OrderLinesIndex:
+        if not self._order_lines.exists():
+            self._order_lines.ensure(lambda: self.load_data(self.ORDER_LINES, default={}))
+            if not self.read_only:
+                for name in self._LEGACY_ORDER_LINES:
+                    self.drop_collection(name)
+        self._order_lines.refresh()
+        return self._order_lines
+
+    def get_order_items(self, order_id: str) -> list:
+        """Siparişin kalemleri: [{'product_id', 'quantity', 'price'}, ...] (kalemsiz siparişlerde boş liste)."""
+        with self._lock:
+            lines = self._lines_index().entries.get(order_id, ())
+            return [
+                {'product_id': product_id, 'quantity': quantity, 'price': _format_cents(cents)}
+                for product_id, quantity, cents in lines
+            ]
+
+    def get_product_order_ids(self, product_id: str) -> list:
+        """Ürünü içeren siparişlerin ID'leri (ör. geri çağırma için); eşleşen sipariş sayısıyla orantılı sürer."""
+        with self._lock:
+            return list(self._lines_index().by_product.get(product_id, ()))
+
+    def get_product_sales(self, product_id: str) -> Dict[str, Any]:
+        """Ürünün satış özeti: sipariş sayısı, toplam adet ve ciro (Decimal)."""
+        with self._lock:
+            index = self._lines_index()
+            order_ids = index.by_product.get(product_id, ())
+            quantity = 0
+            revenue_cents = 0
+            for order_id in order_ids:
+                for line_product_id, line_quantity, cents in index.entries[order_id]:
+                    if line_product_id == product_id:
+                        quantity += line_quantity
+                        revenue_cents += line_quantity * cents
+            return {'orders': len(order_ids), 'quantity': quantity, 'revenue': Decimal(revenue_cents) / 100}
+
+    # Müşteri -> sipariş indeksi (customer_orders.jsonl, bkz. CustomerOrderIndex)
+    # Sipariş ID'si -> [müşteri ID'si, tutar (kuruş)]; müşteri başına siparişler ve harcama bellekte türetilir.
+    CUSTOMER_ORDER_INDEX = "customer_orders"
+
+    @staticmethod
+    def _customer_order_entries(orders) -> Dict[str, list]:
+        return {order.get('id'): [order['customer_id'], _to_cents(order.get('total_price', '0'))]
+                for order in orders if isinstance(order, dict) and order.get('customer_id') is not None}
+
+    def _index_customer_orders(self, orders) -> None:
+        with self._lock:
+            # İndeks bu çağrıda kurulsa bile siparişler ayrıca yazılır: indeksi başka bir süreç kurmuş olabilir ya da
+            # kurulum bu siparişleri görmemiş olabilir. Yazmalar aynı değeri koyduğundan tekrarlanmaları zararsızdır.
+            self._customer_index().write(self._customer_order_entries(orders).items())
+
+    def _unindex_customer_orders(self, orders) -> None:
+        with self._lock:
+            index = self._customer_index()
+            index.write((order.get('id'), None) for order in orders if order.get('id') in index.entries)
+
+    def _customer_index(self) -> CustomerOrderIndex:
+        if not self._customer_orders.exists():
+            # İndeks henüz yok (ya da önceki sürümün customer_orders.json dosyası var); siparişlerden bir kez kurulur.
+            self._customer_orders.ensure(lambda: self._customer_order_entries(self.iter_orders()))
+            if not self.read_only:
+                self.drop_collection(self.CUSTOMER_ORDER_INDEX)
+        self._customer_orders.refresh()
+        return self._customer_orders
+
+    def get_customer_order_ids(self, customer_id: str) -> list:
+        """Müşterinin siparişlerinin ID'leri (eklenme sırasıyla)."""
+        with self._lock:
+            return list(self._customer_index().by_customer.get(customer_id, ()))
+
+    def get_customer_orders(self, customer_id: str) -> list:
+        """Müşterinin siparişleri (kalemleri olmadan); yalnızca müşterinin kendi siparişleri okunur."""
+        orders = (self._get_order(order_id) for order_id in self.get_customer_order_ids(customer_id))
+        return [order for order in orders if order is not None]
+
+    def get_customer_order_summary(self, customer_id: str) -> Dict[str, Any]:
+        """Müşterinin sipariş sayısı ve toplam harcaması (Decimal)."""
+        with self._lock:
+            index = self._customer_index()
+            orders = index.by_customer.get(customer_id)
+            if not orders:
+                return {'orders': 0, 'spend': Decimal(0)}
+            return {'orders': len(orders), 'spend': Decimal(index.spend[customer_id]) / 100}
+
+    def customer_order_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Siparişi olan tüm müşterilerin özetleri: müşteri ID'si -> {'orders', 'spend'} (bkz. get_customer_order_summary)."""
+        with self._lock:
+            index = self._customer_index()
+            return {customer_id: {'orders': len(orders), 'spend': Decimal(index.spend[customer_id]) / 100}
+                    for customer_id, orders in index.by_customer.items()}
+
+    # Sipariş durum günlüğü
+    ORDER_EVENTS = "order_events"
+
+    def _log_order_statuses(self, changes) -> None:
+        """Sipariş durum değişikliklerini günlüğe ekler; günlük henüz yoksa mevcut siparişlerden kurulur."""
+        self._check_writable()
+        with self._lock, self._file_lock(self.ORDER_EVENTS) if self.shared else nullcontext():
+            if not self._order_events.exists():
+                # Değişiklikler zaten siparişlere yazıldı; günlüğün ilk hali onları da içerir.
+                self._sync_order_events()
+                return
+            self._order_events.append(changes)
+
+    def _sync_order_events(self) -> None:
+        """
+        Günlüğü mevcut siparişlerle eşitler. Günlük yoksa tüm siparişlerle kurulur; varsa yalnızca
+        günlükteki son durumu farklı olan siparişler ve silinen siparişler eklenir, böylece toptan
+        kayıtlar günlüğü büyütmez.
+        """
+        self._check_writable()
+        with self._lock, self._file_lock(self.ORDER_EVENTS) if self.shared else nullcontext():
+            current = {order.get('id'): order.get('status') for order in self.iter_orders()
+                       if order.get('status') is not None}
+            if not self._order_events.exists():
+                self._order_events.append(current.items(), reset=True)
+                return
+            logged = self._logged_order_statuses()
+            changes = [(order_id, status) for order_id, status in current.items() if logged.get(order_id) != status]
+            changes.extend((order_id, None) for order_id in logged if order_id not in current)
+            self._order_events.append(changes)
+
+    def _logged_order_statuses(self) -> Dict[str, str]:
+        """Günlüğe göre siparişlerin son durumları; günlük kaldığı yerden okunur (kilit altında çağrılır)."""
+        offset, statuses = self._logged_statuses
+        events, offset = self._order_events.read(offset)
+        for event in events:
+            if event.get("reset"):
+                statuses.clear()
+            elif event.get("status") is None:
+                statuses.pop(event.get("id"), None)
+            else:
+                statuses[event.get("id")] = event["status"]
+        self._logged_statuses = (offset, statuses)
+        return statuses
+
+    def read_order_events(self, offset: int = 0) -> Tuple[list, int]:
+        """
+        Sipariş durum günlüğünü offset'ten itibaren okur: (olaylar, yeni offset). Olaylar
+        {'id', 'status', 'at'} (silinen siparişte status None) ya da {'reset': True, 'at'} biçimindedir.
+        Salt okunur depoda günlük yoksa kurulmaz; olay listesi boş döner.
+        """
+        if not self._order_events.exists() and not self.read_only:
+            with self._lock, self._file_lock(self.ORDER_EVENTS) if self.shared else nullcontext():
+                if not self._order_events.exists():
+                    self._sync_order_events()
+        return self._order_events.read(offset)
+
+    # Müşteri e-posta indeksi (customer_emails.jsonl, bkz. CustomerEmailIndex)
+    # Müşteri ID'si -> e-posta. Müşteri dosyasına yapılan her yazma indekse yalnızca e-postası değişen müşterileri
+    # ekler; indeks yalnızca dosyası yoksa müşterilerden yeniden kurulur. Kayıtların kendisi müşteri dosyasından okunur.
+    CUSTOMER_EMAIL_INDEX = "customer_emails"
+
+    def _email_index(self) -> CustomerEmailIndex:
+        if not self._customer_emails.exists():
+            # İndeks henüz yok (ya da önceki sürümün customer_emails.json dosyası var); müşterilerden bir kez kurulur.
+            self._customer_emails.ensure(lambda: self._customer_emails_of(self.load_data('customers', default={})))
+            if not self.read_only:
+                self.drop_collection(self.CUSTOMER_EMAIL_INDEX)
+        self._customer_emails.refresh()
+        if self._customer_emails.legacy and not self.read_only:
+            # Önceki sürüm tam müşteri kayıtlarını (parolalar dahil) yazmıştı; dosya yalnızca e-postalarla yeniden yazılır.
+            with self._customer_emails.locked() as index:
+                if index.legacy:
+                    index.rewrite(index.entries)
+        return self._customer_emails
+
+    @staticmethod
+    def _customer_email(customer) -> Optional[str]:
+        return customer.get('email') if isinstance(customer, dict) else None
+
+    @classmethod
+    def _customer_emails_of(cls, customers) -> Dict[str, str]:
+        if not isinstance(customers, dict):
+            return {}
+        emails = ((customer_id, cls._customer_email(customer)) for customer_id, customer in customers.items())
+        return {customer_id: email for customer_id, email in emails if email is not None}
+
+    def _index_customers(self, changes) -> None:
+        """(müşteri ID'si, kayıt ya da silmek için None) çiftlerinden e-postası değişenleri tek yazmayla ekler."""
+        with self._lock:
+            index = self._email_index()
+            emails = [(customer_id, self._customer_email(customer)) for customer_id, customer in changes]
+            index.write([(customer_id, email) for customer_id, email in emails
+                         if index.entries.get(customer_id) != email])
+
+    def _reindex_customers(self, customers) -> None:
+        # Koleksiyon toptan yazıldı; yalnızca eklenen, e-postası değişen ve silinen müşteriler indekse eklenir.
+        if not isinstance(customers, dict):
+            customers = {}
+        with self._lock:
+            index = self._email_index()
+            changes = list(customers.items())
+            changes.extend((customer_id, None) for customer_id in index.entries if customer_id not in customers)
+            self._index_customers(changes)
+
+    def _find_customer_by_email(self, email) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            customer_id = self._email_index().by_email.get(email)
+        if customer_id is None:
+            return None
+        customer = self.get_record('customers', customer_id)
+        # Kayıt indeks okunduktan sonra silinmiş ya da e-postası değişmiş olabilir.
+        return customer if self._customer_email(customer) == email else None
+
+    def register_customer(self, id, name, email, password, address, phone):
+        # Yeni musteri verisi
+        customer = {
             'id': id,
             'name': name,
             'email': email,
@@ -56,23 +1036,26 @@ class JsonStorage:
             'address': address,
             'phone': phone
         }
-
-        self.save_data('customers', customers)
+        with self._lock:
+            # Aynı e-posta daha önce kayıtlı mı? Kontrol ve kayıt e-posta indeksinin kilidi altında yapılır;
+            # aynı anda kayıt olan iki süreçten yalnızca biri kazanır.
+            with self._email_index().locked() as index:
+                if email in index.by_email:
+                    return False
+                self.put_record('customers', id, customer)
         return True
 
-    def authenticate_customer(self, email, password):
-        customers = self.load_data('customers', default={})
+    def delete_customer(self, customer_id: str) -> bool:
+        """Müşteriyi siler ve e-posta indeksinden çıkarır."""
+        return self.delete_record('customers', customer_id)
 
-        for customer_id, customer_data in customers.items():
-            if (
-                    isinstance(customer_data, dict) and
-                    customer_data.get('email') == email and
-                    customer_data.get('password') == password
-            ):
-                return customer_data
+    def authenticate_customer(self, email, password):
+        customer_data = self._find_customer_by_email(email)
+        if customer_data is not None and customer_data.get('password') == password:
+            return customer_data
 
         return None  #Kimlik doğrulama başarısız
     def authenticate_admin(self, email: str, password: str) -> bool:
-        admins = self.load_data("admins", default={})
+        admins = self.load_view("admins", default={})
         admin = admins.get(email)
         return admin and admin["password"] == password
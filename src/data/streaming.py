@@ -0,0 +1,103 @@
+import json
+from typing import Any, Iterator, TextIO, Tuple
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """Dosyayı parça parça okuyan ve çözümlenmiş kısmı tampondan atan küçük yardımcı."""
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos > len(self.buffer) // 2:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Boşlukları atlar ve sıradaki karakteri döner; dosya bittiyse boş dizge döner."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # Tamponun sonunda biten bir sayı yarım kalmış olabilir; devamı okunana kadar beklenir.
+            if end == len(self.buffer) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(file: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Bir JSON dizisinin elemanlarını dosyanın tamamını belleğe almadan tek tek üretir."""
+    reader = _Reader(file, chunk_size)
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        char = reader.peek()
+        if char == "]":
+            return
+        reader.expect(",")
+
+
+def iter_json_object(file: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Tuple[str, Any]]:
+    """Bir JSON nesnesinin (anahtar, değer) çiftlerini tek tek üretir."""
+    reader = _Reader(file, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        yield key, reader.value()
+        char = reader.peek()
+        if char == "}":
+            return
+        reader.expect(",")
+
+
+def iter_json_records(file: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Dosya dizi ise elemanlarını, nesne ise değerlerini üretir."""
+    reader_start = file.read(1)
+    while reader_start and reader_start in _WHITESPACE:
+        reader_start = file.read(1)
+    file.seek(0)
+    if reader_start == "{":
+        for _, value in iter_json_object(file, chunk_size):
+            yield value
+    elif reader_start == "[":
+        yield from iter_json_array(file, chunk_size)
@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+
+class WriteAheadLog:
+    """
+    Bir koleksiyon için append-only değişiklik günlüğü.
+    Her satır tek bir kaydın eklenmesini/güncellenmesini ("put") ya da silinmesini ("del") tutar.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.compacting_path = f"{path}.compacting"
+
+    def append(self, op: str, key: str, value: Any = None) -> None:
+        self.append_many([(op, key, value)])
+
+    def append_many(self, entries: Iterable[Tuple[str, str, Any]]) -> None:
+        """(op, anahtar, değer) üçlülerini tek bir yazmayla ekler."""
+        lines = []
+        for op, key, value in entries:
+            entry = {"op": op, "key": key}
+            if op == "put":
+                entry["value"] = value
+            lines.append(json.dumps(entry, separators=(",", ":")) + "\n")
+        if not lines:
+            return
+        with open(self.path, "a") as file:
+            file.write("".join(lines))
+
+    def entries(self) -> Iterator[Tuple[str, str, Any]]:
+        # Sıkıştırma sırasında döndürülen eski günlük, yeni günlükten önce uygulanır.
+        for path in (self.compacting_path, self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, "r") as file:
+                for line in file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Yarım yazılmış son satır (çökme) yok sayılır.
+                        continue
+                    yield entry["op"], entry["key"], entry.get("value")
+
+    def entry_count(self) -> int:
+        count = 0
+        for path in (self.compacting_path, self.path):
+            if os.path.exists(path):
+                with open(path, "r") as file:
+                    count += sum(1 for line in file if line.strip())
+        return count
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path) or os.path.exists(self.compacting_path)
+
+    def rotate(self) -> bool:
+        """Aktif günlüğü sıkıştırma dosyasına taşır; yeni yazmalar boş bir günlüğe gider."""
+        if os.path.exists(self.compacting_path) or not os.path.exists(self.path):
+            return False
+        os.replace(self.path, self.compacting_path)
+        return True
+
+    def finish_compaction(self) -> None:
+        if os.path.exists(self.compacting_path):
+            os.remove(self.compacting_path)
+
+    def rewrite(self, records: Dict[str, Any]) -> None:
+        """Günlüğü yalnızca verilen kayıtların 'put' satırlarından oluşacak şekilde yeniden yazar."""
+        # Geçici dosya adı benzersizdir; aynı anda yeniden yazan iki süreç birbirinin dosyasını ezmez.
+        fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(self.path) + ".", suffix=".tmp",
+                                         dir=os.path.dirname(self.path) or ".")
+        try:
+            with os.fdopen(fd, "w") as file:
+                for key, value in records.items():
+                    file.write(json.dumps({"op": "put", "key": key, "value": value}, separators=(",", ":")) + "\n")
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.finish_compaction()
+
+    def clear(self) -> None:
+        for path in (self.path, self.compacting_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def to_records(data: Any) -> Tuple[bool, Dict[str, Any]]:
+    """Koleksiyonu anahtar -> kayıt sözlüğüne çevirir. Listeler kayıtların 'id' alanıyla anahtarlanır."""
+    if isinstance(data, dict):
+        return False, dict(data)
+    if isinstance(data, list) and all(isinstance(item, dict) and "id" in item for item in data):
+        return True, {item["id"]: item for item in data}
+    raise TypeError("Koleksiyon günlük moduyla saklanamaz")
+
+
+def from_records(is_list: bool, records: Dict[str, Any]) -> Any:
+    return list(records.values()) if is_list else records
@@ -1,16 +1,25 @@
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 from decimal import Decimal
 import uuid
+from collections.abc import Mapping
 from typing import Dict, Optional
 from datetime import datetime
 
 from src.models.product import Product
 from src.models.customer import Customer
+from src.models.order import InvalidStatusTransition, OrderStatus
 from src.models.order_factory import OrderFactory
+from src.models.order_lifecycle import OrderLifecycle
 from src.inventory.inventory_manager import InventoryManager
+from src.inventory.reorder import LOW_STOCK, STOCK_REPLENISHED
+from src.notifications.notification_service import NotificationService, AdminNotificationObserver
 from src.data.storage import JsonStorage
 
+# Products listed per page when no search is active
+PRODUCTS_PAGE_SIZE = 200
+
 
 class LoginScreen:
     def __init__(self, root, storage: JsonStorage, on_customer_login, on_admin_login):
@@ -160,6 +169,8 @@ class CustomerApp:
         self.storage = storage
         self.customer_data = customer_data
         self.inventory_manager = InventoryManager()
+        self._rendered_products = None  # (search query, product limit, catalogue version) currently shown
+        self._product_limit = PRODUCTS_PAGE_SIZE
 
         self.frame = ttk.Frame(root)
         self.frame.pack(expand=True, fill='both', padx=10, pady=5)
@@ -183,6 +194,18 @@ class CustomerApp:
         products_frame = ttk.Frame(self.notebook)
         self.notebook.add(products_frame, text='Available Products')
 
+        # Search frame
+        search_frame = ttk.Frame(products_frame)
+        search_frame.pack(fill='x', padx=5, pady=5)
+
+        ttk.Label(search_frame, text="Search:").pack(side=tk.LEFT, padx=5)
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=30)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        search_entry.bind('<KeyRelease>', lambda event: self.update_products_list())
+        ttk.Button(search_frame, text="Show more",
+                   command=self.show_more_products).pack(side=tk.RIGHT, padx=5)
+
         # Products list
         self.products_list = ttk.Treeview(products_frame,
                                           columns=('ID', 'Name', 'Price', 'Stock'),
@@ -233,11 +256,25 @@ class CustomerApp:
         self.update_orders_list()
 
     def update_products_list(self):
-        """Update the products list."""
+        """Update the products list, filtered by the search box."""
+        query = self.search_var.get().strip()
+        # Nothing changed since the last repaint
+        rendered = (query, self._product_limit, self.inventory_manager.catalogue_version)
+        if rendered == self._rendered_products:
+            return
+        self._rendered_products = rendered
+
         for item in self.products_list.get_children():
             self.products_list.delete(item)
 
-        for product in self.inventory_manager.get_all_products().values():
+        if query:
+            products = self.inventory_manager.search_products(query)
+        else:
+            # Only the first pages of the catalogue are loaded; "Show more" extends the list
+            products = {product.id: product
+                        for product in self.inventory_manager.get_products_page(0, self._product_limit)}
+
+        for product in products.values():
             self.products_list.insert('', 'end', values=(
                 product.id,
                 product.name,
@@ -245,23 +282,24 @@ class CustomerApp:
                 product.stock_quantity
             ))
 
+    def show_more_products(self):
+        """List the next page of products."""
+        self._product_limit += PRODUCTS_PAGE_SIZE
+        self.update_products_list()
+
     def update_orders_list(self):
         """Update the orders list."""
         for item in self.orders_list.get_children():
             self.orders_list.delete(item)
 
-        orders = self.storage.load_data('orders', default=[])
-
         # Safely get customer ID with a default value
         customer_id = self.customer_data.get('id')
         if not customer_id:
             messagebox.showerror("Error", "Customer ID not found")
             return
 
-        customer_orders = [order for order in orders
-                           if order.get('customer_id') == customer_id]
-
-        for order in customer_orders:
+        # Read through the customer -> orders index; only this customer's orders are loaded
+        for order in self.storage.get_customer_orders(customer_id):
             self.orders_list.insert('', 'end', values=(
                 order.get('id', 'N/A'),
                 order.get('date', 'N/A'),
@@ -302,16 +340,7 @@ class CustomerApp:
 
             if order:
                 # Save order
-                orders = self.storage.load_data('orders', default=[])
-                orders.append({
-                    'id': order.id,
-                    'customer_id': customer.id,  # Make sure this is the correct ID
-                    'total_price': str(order.total_price),
-                    'shipping_cost': str(order.shipping_cost),
-                    'status': order.status.value,
-                    'date': datetime.now().isoformat()
-                })
-                self.storage.save_data('orders', orders)
+                self.storage.add_order(order.to_dict())
 
                 self.update_products_list()
                 self.update_orders_list()
@@ -333,6 +362,10 @@ class AdminApp:
         self.root = root
         self.storage = storage
         self.inventory_manager = InventoryManager()
+        # Validated status changes and per-status order sets (status filter, fulfilment queues)
+        self.order_lifecycle = OrderLifecycle(storage)
+        self._rendered_products = None  # (search query, product limit, catalogue version) currently shown
+        self._product_limit = PRODUCTS_PAGE_SIZE
 
         self.frame = ttk.Frame(root)
         self.frame.pack(expand=True, fill='both', padx=10, pady=5)
@@ -341,6 +374,13 @@ class AdminApp:
         welcome = ttk.Label(self.frame, text="Admin Dashboard", font=('Helvetica', 14))
         welcome.pack(pady=10)
 
+        # Reorder threshold crossings are reported to the admin while the dashboard is open
+        notification_service = NotificationService()
+        self.stock_observer = AdminNotificationObserver()
+        notification_service.attach(LOW_STOCK, self.stock_observer)
+        notification_service.attach(STOCK_REPLENISHED, self.stock_observer)
+        self.frame.bind('<Destroy>', self.on_destroy)
+
         # Create notebook for tabs
         self.notebook = ttk.Notebook(self.frame)
         self.notebook.pack(expand=True, fill='both')
@@ -350,25 +390,14 @@ class AdminApp:
         self.create_orders_tab()
         self.create_customers_tab()  # Yeni müşteri yönetim sekmesi
 
-        # Load initial data
-        self.load_initial_data()
-
-    def load_initial_data(self):
-        """Load products from storage to inventory manager."""
-        products_data = self.storage.load_data('products', {})
-        for product_id, product_data in products_data.items():
-            try:
-                product = Product(
-                    id=product_id,
-                    name=product_data['name'],
-                    description=product_data.get('description', ''),
-                    price=Decimal(product_data['price']),
-                    category=product_data.get('category', ''),
-                    stock_quantity=int(product_data.get('stock_quantity', 0))
-                )
-                self.inventory_manager.add_product(product)
-            except Exception as e:
-                print(f"Error loading product {product_id}: {str(e)}")
+    def on_destroy(self, event):
+        """Detach the stock observer when the dashboard is closed, so each login attaches exactly one."""
+        # <Destroy> is also delivered for every child widget of the frame
+        if event.widget is not self.frame:
+            return
+        notification_service = NotificationService()
+        notification_service.detach(LOW_STOCK, self.stock_observer)
+        notification_service.detach(STOCK_REPLENISHED, self.stock_observer)
 
     def create_products_tab(self):
         """Create the products management tab."""
@@ -386,7 +415,8 @@ class AdminApp:
             ("Description:", "description"),
             ("Price*:", "price"),
             ("Category:", "category"),
-            ("Stock*:", "stock")
+            ("Stock*:", "stock"),
+            ("Reorder at:", "reorder")
         ]
 
         self.product_entries = {}
@@ -457,6 +487,8 @@ class AdminApp:
 
         # Bind selection event
         self.products_list.bind('<<TreeviewSelect>>', self.on_product_select)
+        # Products at or below their reorder threshold
+        self.products_list.tag_configure('low_stock', foreground='red')
 
         # Search frame
         search_frame = ttk.Frame(products_frame)
@@ -470,6 +502,8 @@ class AdminApp:
 
         ttk.Button(search_frame, text="Refresh",
                    command=self.update_products_list).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(search_frame, text="Show more",
+                   command=self.show_more_products).pack(side=tk.RIGHT, padx=5)
 
         # Initial data load
         self.update_products_list()
@@ -479,6 +513,18 @@ class AdminApp:
         orders_frame = ttk.Frame(self.notebook)
         self.notebook.add(orders_frame, text='Manage Orders')
 
+        # Status filter; a single status is listed from the lifecycle's per-status index
+        filter_frame = ttk.Frame(orders_frame)
+        filter_frame.pack(fill='x', padx=5, pady=5)
+
+        ttk.Label(filter_frame, text="Show:").pack(side=tk.LEFT, padx=5)
+        self.status_filter = tk.StringVar(value="all")
+        filter_combo = ttk.Combobox(filter_frame, textvariable=self.status_filter,
+                                    values=["all"] + [status.value for status in OrderStatus],
+                                    state='readonly', width=15)
+        filter_combo.pack(side=tk.LEFT, padx=5)
+        filter_combo.bind('<<ComboboxSelected>>', lambda e: self.update_orders_list())
+
         # Orders list with scrollbar
         list_frame = ttk.Frame(orders_frame)
         list_frame.pack(fill='both', expand=True, padx=5, pady=5)
@@ -548,7 +594,7 @@ class AdminApp:
         list_frame.pack(fill='both', expand=True, padx=5, pady=5)
 
         self.customers_list = ttk.Treeview(list_frame,
-                                           columns=('ID', 'Name', 'Email', 'Phone', 'Orders'),
+                                           columns=('ID', 'Name', 'Email', 'Phone', 'Orders', 'Spent'),
                                            show='headings')
 
         # Configure columns
@@ -557,12 +603,14 @@ class AdminApp:
         self.customers_list.heading('Email', text='Email')
         self.customers_list.heading('Phone', text='Phone')
         self.customers_list.heading('Orders', text='Orders')
+        self.customers_list.heading('Spent', text='Total Spent')
 
         self.customers_list.column('ID', width=100, anchor='center')
         self.customers_list.column('Name', width=150, anchor='w')
         self.customers_list.column('Email', width=200, anchor='w')
         self.customers_list.column('Phone', width=120, anchor='center')
         self.customers_list.column('Orders', width=80, anchor='center')
+        self.customers_list.column('Spent', width=100, anchor='e')
 
         # Add scrollbars
         y_scroll = ttk.Scrollbar(list_frame, orient='vertical', command=self.customers_list.yview)
@@ -626,6 +674,8 @@ class AdminApp:
             self.product_entries['price'].set(str(product.price))
             self.product_entries['category'].set(product.category)
             self.product_entries['stock'].set(str(product.stock_quantity))
+            threshold = self.inventory_manager.get_reorder_threshold(product.id)
+            self.product_entries['reorder'].set('' if threshold is None else str(threshold))
 
     def clear_product_form(self):
         """Clear the product form."""
@@ -656,9 +706,11 @@ class AdminApp:
                 category=self.product_entries['category'].get().strip(),
                 stock_quantity=int(stock)
             )
+            # Validated with the other fields so an invalid threshold adds nothing
+            threshold = self.read_reorder_threshold()
 
             self.inventory_manager.add_product(product)
-            self.save_products()
+            self.inventory_manager.set_reorder_threshold(product.id, threshold)
             self.update_products_list()
             self.clear_product_form()
             messagebox.showinfo("Success", "Product added successfully!")
@@ -684,19 +736,22 @@ class AdminApp:
                 messagebox.showwarning("Warning", "Please fill in all required fields (*)")
                 return
 
-            product = self.inventory_manager.get_product(product_id)
-            if not product:
-                messagebox.showerror("Error", "Product not found")
-                return
+            fields = dict(
+                name=name,
+                description=self.product_entries['description'].get("1.0", tk.END).strip(),
+                price=Decimal(price),
+                category=self.product_entries['category'].get().strip(),
+                stock_quantity=int(stock)
+            )
+            threshold = self.read_reorder_threshold()
 
             # Ürün bilgilerini güncelle
-            product.name = name
-            product.description = self.product_entries['description'].get("1.0", tk.END).strip()
-            product.price = Decimal(price)
-            product.category = self.product_entries['category'].get().strip()
-            product.stock_quantity = int(stock)
+            updated = self.inventory_manager.update_product(product_id, **fields)
+            if not updated:
+                messagebox.showerror("Error", "Product not found")
+                return
+            self.inventory_manager.set_reorder_threshold(product_id, threshold)
 
-            self.save_products()
             self.update_products_list()
             messagebox.showinfo("Success", "Product updated successfully!")
         except ValueError as e:
@@ -704,6 +759,19 @@ class AdminApp:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update product: {str(e)}")
 
+    def read_reorder_threshold(self) -> Optional[int]:
+        """
+        Parse the reorder threshold field; an empty field means no product threshold.
+        Raises ValueError for a non-numeric or negative value.
+        """
+        value = self.product_entries['reorder'].get().strip()
+        if not value:
+            return None
+        threshold = int(value)
+        if threshold < 0:
+            raise ValueError("Reorder threshold cannot be negative")
+        return threshold
+
     def delete_product(self):
         """Delete the selected product."""
         try:
@@ -720,7 +788,6 @@ class AdminApp:
             if messagebox.askyesno("Confirm Delete",
                                    f"Are you sure you want to delete '{product.name}'?\nThis action cannot be undone."):
                 self.inventory_manager.remove_product(product_id)
-                self.save_products()
                 self.update_products_list()
                 self.clear_product_form()
                 messagebox.showinfo("Success", "Product deleted successfully!")
@@ -729,68 +796,72 @@ class AdminApp:
 
     def save_products(self):
         """Save all products to storage."""
-        self.storage.save_data('products', {
-            p.id: {
-                'id': p.id,
-                'name': p.name,
-                'description': p.description,
-                'price': str(p.price),
-                'category': p.category,
-                'stock_quantity': p.stock_quantity
-            }
-            for p in self.inventory_manager.get_all_products().values()
-        })
+        self.inventory_manager.save_products()
 
     def update_products_list(self):
-        """Update the products list."""
+        """Update the products list, filtered by the search box."""
+        query = self.search_var.get().strip()
+        # Nothing changed since the last repaint
+        rendered = (query, self._product_limit, self.inventory_manager.catalogue_version)
+        if rendered == self._rendered_products:
+            return
+        self._rendered_products = rendered
+
         for item in self.products_list.get_children():
             self.products_list.delete(item)
 
-        for product in self.inventory_manager.get_all_products().values():
+        if query:
+            products = self.inventory_manager.search_products(query)
+        else:
+            # Only the first pages of the catalogue are loaded; "Show more" extends the list
+            products = {product.id: product
+                        for product in self.inventory_manager.get_products_page(0, self._product_limit)}
+
+        below_threshold = self.inventory_manager.get_below_threshold()
+        for product in products.values():
             self.products_list.insert('', 'end', values=(
                 product.id,
                 product.name,
                 f"${product.price:.2f}",
                 product.stock_quantity,
                 product.category
-            ))
+            ), tags=('low_stock',) if product.id in below_threshold else ())
 
     def search_products(self, event=None):
-        """Search products by name or category."""
-        search_term = self.search_var.get().lower()
-
-        for item in self.products_list.get_children():
-            values = self.products_list.item(item)['values']
-            if (search_term in values[1].lower() or  # Name
-                    search_term in values[4].lower()):  # Category
-                self.products_list.item(item, tags=('match',))
-                self.products_list.selection_set(item)
-            else:
-                self.products_list.item(item, tags=('no_match',))
-                self.products_list.selection_remove(item)
+        """Filter the products list by name, description or category."""
+        self.update_products_list()
 
     # Order management methods
+    def show_more_products(self):
+        """List the next page of products."""
+        self._product_limit += PRODUCTS_PAGE_SIZE
+        self.update_products_list()
+
     def update_orders_list(self):
         """Update the orders list."""
         for item in self.orders_list.get_children():
             self.orders_list.delete(item)
 
         try:
-            orders = self.storage.load_data('orders', default=[])
-            customers = self.storage.load_data('customers', default={})
+            status_filter = self.status_filter.get()
+            if status_filter == "all":
+                orders = self.storage.load_view('orders', default=[])
+            else:
+                # Only the orders currently in the chosen status are read
+                orders = [self.storage.get_record('orders', order_id)
+                          for order_id in self.order_lifecycle.order_ids(OrderStatus(status_filter))]
+            customer_names = {}
 
             for order in orders:
-                if not isinstance(order, dict):
+                if not isinstance(order, Mapping):
                     continue
 
+                # Customer names are looked up by id, once per customer
                 customer_id = order.get('customer_id')
-                customer_name = "Unknown"
-
-                # Find customer name
-                for customer in customers.values():
-                    if isinstance(customer, dict) and customer.get('id') == customer_id:
-                        customer_name = customer.get('name', 'Unknown')
-                        break
+                if customer_id not in customer_names:
+                    customer = self.storage.get_record('customers', customer_id) if customer_id else None
+                    customer_names[customer_id] = customer.get('name', 'Unknown') if customer else "Unknown"
+                customer_name = customer_names[customer_id]
 
                 # Format date if exists
                 order_date = order.get('date', '')
@@ -820,23 +891,15 @@ class AdminApp:
 
         try:
             order_id = self.orders_list.item(selection[0])['values'][0]
-            new_status = self.new_status.get()
-
-            orders = self.storage.load_data('orders', default=[])
-
-            updated = False
-            for order in orders:
-                if order['id'] == order_id:
-                    order['status'] = new_status
-                    updated = True
-                    break
-
-            if updated:
-                self.storage.save_data('orders', orders)
-                self.update_orders_list()
-                messagebox.showinfo("Success", "Order status updated successfully!")
-            else:
-                messagebox.showerror("Error", "Order not found")
+            new_status = OrderStatus(self.new_status.get())
+
+            self.order_lifecycle.transition(order_id, new_status)
+            self.update_orders_list()
+            messagebox.showinfo("Success", "Order status updated successfully!")
+        except KeyError:
+            messagebox.showerror("Error", "Order not found")
+        except InvalidStatusTransition as e:
+            messagebox.showerror("Error", str(e))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update order status: {str(e)}")
 
@@ -849,18 +912,14 @@ class AdminApp:
 
         try:
             order_id = self.orders_list.item(selection[0])['values'][0]
-            orders = self.storage.load_data('orders', default=[])
-            products = self.storage.load_data('products', default={})
-            customers = self.storage.load_data('customers', default={})
-
-            order = next((o for o in orders if o['id'] == order_id), None)
+            # Single-record reads; the order record comes with its persisted lines
+            order = self.storage.get_record('orders', order_id)
             if not order:
                 messagebox.showerror("Error", "Order not found")
                 return
 
-            # Find customer
-            customer = next((c for c in customers.values()
-                             if isinstance(c, dict) and c.get('id') == order.get('customer_id')), None)
+            customer_id = order.get('customer_id')
+            customer = self.storage.get_record('customers', customer_id) if customer_id else None
 
             # Create details window
             details_window = tk.Toplevel(self.root)
@@ -878,6 +937,11 @@ class AdminApp:
             ttk.Label(info_frame, text=f"Order ID: {order.get('id', 'N/A')}").pack(anchor='w')
             ttk.Label(info_frame, text=f"Date: {order.get('date', 'N/A')}").pack(anchor='w')
             ttk.Label(info_frame, text=f"Status: {order.get('status', 'unknown').capitalize()}").pack(anchor='w')
+            history = self.order_lifecycle.history(order_id)
+            if len(history) > 1:
+                changes = ", ".join(f"{event['status'].capitalize()} ({event['at'][:16].replace('T', ' ')})"
+                                    for event in history)
+                ttk.Label(info_frame, text=f"History: {changes}").pack(anchor='w')
             ttk.Label(info_frame, text=f"Total: ${Decimal(order.get('total_price', '0')):.2f}").pack(anchor='w')
             ttk.Label(info_frame, text=f"Shipping Cost: ${Decimal(order.get('shipping_cost', '0')):.2f}").pack(
                 anchor='w')
@@ -916,8 +980,8 @@ class AdminApp:
             # Add products to treeview
             order_items = order.get('items', [])
             for item in order_items:
-                product = products.get(item.get('product_id', ''), {})
-                product_name = product.get('name', 'Unknown Product')
+                product = self.inventory_manager.get_product(item.get('product_id', ''))
+                product_name = product.name if product else 'Unknown Product'
                 quantity = item.get('quantity', 1)
                 price = Decimal(item.get('price', '0'))
 
@@ -937,23 +1001,23 @@ class AdminApp:
             self.customers_list.delete(item)
 
         try:
-            customers = self.storage.load_data('customers', default={})
-            orders = self.storage.load_data('orders', default=[])
+            customers = self.storage.load_view('customers', default={})
+            # Order counts and spend are kept per customer; no order is read here
+            summaries = self.storage.customer_order_summaries()
 
             for customer_id, customer in customers.items():
-                if not isinstance(customer, dict):
+                if not isinstance(customer, Mapping):
                     continue
 
-                # Count orders for this customer
-                order_count = sum(1 for o in orders
-                                  if isinstance(o, dict) and o.get('customer_id') == customer_id)
+                summary = summaries.get(customer_id, {'orders': 0, 'spend': Decimal(0)})
 
                 self.customers_list.insert('', 'end', values=(
                     customer.get('id', 'N/A'),
                     customer.get('name', 'Unknown'),
                     customer.get('email', 'N/A'),
                     customer.get('phone', 'N/A'),
-                    order_count
+                    summary['orders'],
+                    f"${summary['spend']:.2f}"
                 ))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load customers: {str(e)}")
@@ -967,14 +1031,13 @@ class AdminApp:
 
         try:
             customer_id = self.customers_list.item(selection[0])['values'][0]
-            customers = self.storage.load_data('customers', default={})
-            orders = self.storage.load_data('orders', default=[])
-
-            customer = customers.get(customer_id)
+            customer = self.storage.get_record('customers', customer_id)
             if not customer:
                 messagebox.showerror("Error", "Customer not found")
                 return
 
+            summary = self.storage.get_customer_order_summary(customer_id)
+
             # Create details window
             details_window = tk.Toplevel(self.root)
             details_window.title(f"Customer Details - {customer.get('name', 'Unknown')}")
@@ -994,6 +1057,8 @@ class AdminApp:
             ttk.Label(info_frame, text=f"Address: {customer.get('address', 'N/A')}").pack(anchor='w')
             ttk.Label(info_frame, text=f"Registration Date: {customer.get('registration_date', 'N/A')}").pack(
                 anchor='w')
+            ttk.Label(info_frame, text=f"Orders: {summary['orders']}  Total Spent: ${summary['spend']:.2f}").pack(
+                anchor='w')
 
             # Orders list
             orders_frame = ttk.LabelFrame(main_frame, text="Customer Orders")
@@ -1019,10 +1084,7 @@ class AdminApp:
             scrollbar.pack(side='right', fill='y')
 
             # Add orders to treeview
-            customer_orders = [o for o in orders
-                               if isinstance(o, dict) and o.get('customer_id') == customer_id]
-
-            for order in customer_orders:
+            for order in self.storage.get_customer_orders(customer_id):
                 # Format date if exists
                 order_date = order.get('date', '')
                 if order_date:
@@ -1051,7 +1113,7 @@ class AdminApp:
 
         try:
             customer_id = self.customers_list.item(selection[0])['values'][0]
-            customers = self.storage.load_data('customers', default={})
+            customers = self.storage.load_view('customers', default={})
 
             if customer_id not in customers:
                 messagebox.showerror("Error", "Customer not found")
@@ -1062,14 +1124,10 @@ class AdminApp:
             if messagebox.askyesno("Confirm Delete",
                                    f"Are you sure you want to delete '{customer_name}'?\nThis will also delete all their orders."):
                 # Delete customer
-                del customers[customer_id]
-                self.storage.save_data('customers', customers)
+                self.storage.delete_customer(customer_id)
 
                 # Delete customer's orders
-                orders = self.storage.load_data('orders', default=[])
-                orders = [o for o in orders
-                          if isinstance(o, dict) and o.get('customer_id') != customer_id]
-                self.storage.save_data('orders', orders)
+                self.storage.delete_customer_orders(customer_id)
 
                 self.update_customers_list()
                 self.update_orders_list()
@@ -1097,15 +1155,18 @@ def main():
     root.title("E-commerce System")
     root.geometry("800x600")
 
-    storage = JsonStorage()
-    if not storage.load_data('products'):
-        storage.save_data('products', {})
-    if not storage.load_data('orders'):
-        storage.save_data('orders', [])
-    if not storage.load_data('customers'):
-        storage.save_data('customers', {})
-    if not storage.load_data('admins'):
-        storage.save_data('admins', {})
+    storage = JsonStorage(partition_orders="month", shared=True)
+    # Missing or empty collection files are created. Existing ones are only checked by size, not
+    # parsed, so the lazy catalogue below is the only thing that reads products.json at startup.
+    # Orders need no placeholder: the partitioned store keeps them in its manifest and partitions.
+    for name in ('products', 'customers', 'admins'):
+        path = os.path.join(storage.data_dir, f"{name}.json")
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            storage.save_data(name, {})
+
+    # The catalogue is indexed at startup; products are loaded when first shown or ordered.
+    # It uses the app's shared storage so several running apps do not overwrite each other's products.
+    InventoryManager(lazy=True, storage=storage)
 
     def on_customer_login(customer_data):
         CustomerApp(root, storage, customer_data)
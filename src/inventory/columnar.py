@@ -0,0 +1,329 @@
+from array import array
+from collections.abc import Mapping, ValuesView
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_UP
+from operator import mul
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.models.product import Product, ProductView
+
+try:
+    import numpy as np
+except ImportError:  # isteğe bağlı bağımlılık; yoksa aynı işlemler saf Python ile yapılır
+    np = None
+
+_CENT = Decimal("0.01")
+
+
+def to_cents(price: Decimal) -> int:
+    return int((Decimal(price) / _CENT).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+class ProductProxy:
+    """
+    Sütunlu katalogdaki bir satırın Product arayüzü. Kendi verisini tutmaz; alanları okur ve
+    yazarken kataloğun sütunlarına gider. __slots__ sayesinde ürün başına yalnızca iki referans tutar.
+    """
+    __slots__ = ('_catalogue', '_row')
+
+    def __init__(self, catalogue: "ColumnarCatalogue", row: int):
+        self._catalogue = catalogue
+        self._row = row
+
+    @property
+    def id(self) -> str:
+        return self._catalogue.ids[self._row]
+
+    @property
+    def name(self) -> str:
+        return self._catalogue.names[self._row]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._catalogue.names[self._row] = value
+
+    @property
+    def description(self) -> str:
+        return self._catalogue.descriptions[self._row]
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._catalogue.descriptions[self._row] = value
+
+    @property
+    def category(self) -> str:
+        return self._catalogue.category_names[self._catalogue.category_codes[self._row]]
+
+    @category.setter
+    def category(self, value: str) -> None:
+        self._catalogue.category_codes[self._row] = self._catalogue.category_code(value)
+
+    @property
+    def price(self) -> Decimal:
+        return Decimal(self._catalogue.price_cents[self._row]) * _CENT
+
+    @price.setter
+    def price(self, value: Decimal) -> None:
+        self._catalogue.price_cents[self._row] = to_cents(value)
+
+    @property
+    def stock_quantity(self) -> int:
+        return self._catalogue.stock[self._row]
+
+    @stock_quantity.setter
+    def stock_quantity(self, value: int) -> None:
+        self._catalogue.stock[self._row] = value
+
+    def is_available(self) -> bool:
+        return self.stock_quantity > 0
+
+    def view(self) -> ProductView:
+        return ProductView(self.id, self.name, self.description, self.price, self.category, self.stock_quantity)
+
+    def __repr__(self) -> str:
+        return f"ProductProxy(id={self.id!r}, name={self.name!r})"
+
+
+class ColumnarSnapshot(Mapping):
+    """
+    Kataloğun bir andaki salt okunur hali: ürün ID'si -> ProductView. Sütunlar kopyalanır (diziler ve
+    liste referansları); ProductView nesneleri yalnızca okunan ürünler için kurulur.
+    """
+
+    def __init__(self, catalogue: "ColumnarCatalogue"):
+        self._ids = list(catalogue.ids)
+        self._names = list(catalogue.names)
+        self._descriptions = list(catalogue.descriptions)
+        self._category_codes = array('I', catalogue.category_codes)
+        self._category_names = list(catalogue.category_names)
+        self._price_cents = array('q', catalogue.price_cents)
+        self._stock = array('q', catalogue.stock)
+        self._rows: Optional[Dict[str, int]] = None  # ilk anahtar erişiminde kurulur
+
+    def _view(self, row: int) -> ProductView:
+        return ProductView(self._ids[row], self._names[row], self._descriptions[row],
+                           Decimal(self._price_cents[row]) * _CENT,
+                           self._category_names[self._category_codes[row]], self._stock[row])
+
+    def __getitem__(self, product_id: str) -> ProductView:
+        if self._rows is None:
+            self._rows = {product_id: row for row, product_id in enumerate(self._ids)}
+        return self._view(self._rows[product_id])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def values(self) -> ValuesView:
+        return _SnapshotValues(self)
+
+
+class _SnapshotValues(ValuesView):
+    def __iter__(self) -> Iterator[ProductView]:
+        snapshot = self._mapping
+        return (snapshot._view(row) for row in range(len(snapshot)))
+
+
+class ColumnarCatalogue:
+    """
+    Ürünleri satır nesneleri yerine sütunlarda tutar: fiyat (kuruş) ve stok 64 bitlik tamsayı
+    dizilerinde (array('q')), kategori bir kod dizisinde, metin alanları listelerde saklanır.
+    Değerleme, toplu fiyat değişikliği, düşük stok filtresi ve kategori/fiyat sorguları tüm sütun üzerinde
+    tek geçişte çalışır; ürün başına görünüm ya da indeks girdisi tutulmaz. NumPy kuruluysa diziler
+    kopyalanmadan NumPy görünümü olarak işlenir.
+
+    Ürün ID'si -> vekil sözlüğü gibi de kullanılır (get, in, [], len, values).
+
+    Fiyatlar kuruşa yuvarlanır (ROUND_HALF_UP).
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.descriptions: List[str] = []
+        self.category_codes = array('I')
+        self.category_names: List[str] = []
+        self.price_cents = array('q')
+        self.stock = array('q')
+        self._rows: Dict[str, int] = {}
+        self._proxies: List[ProductProxy] = []
+        self._category_lookup: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self._rows
+
+    def category_code(self, category: str) -> int:
+        code = self._category_lookup.get(category)
+        if code is None:
+            code = self._category_lookup[category] = len(self.category_names)
+            self.category_names.append(category)
+        return code
+
+    def get(self, product_id: str, default: Optional[ProductProxy] = None) -> Optional[ProductProxy]:
+        row = self._rows.get(product_id)
+        return default if row is None else self._proxies[row]
+
+    def __getitem__(self, product_id: str) -> ProductProxy:
+        return self._proxies[self._rows[product_id]]
+
+    def __setitem__(self, product_id: str, product: Product) -> None:
+        # Kataloğun kendi vekilleri zaten sütunlara yazılıdır.
+        if self.get(product_id) is not product:
+            self.add(product)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.ids))
+
+    def values(self) -> List[ProductProxy]:
+        return list(self._proxies)
+
+    def add(self, product: Product) -> ProductProxy:
+        """Ürünü kataloğa yazar (varsa üzerine yazar) ve satırın vekil nesnesini döner."""
+        row = self._rows.get(product.id)
+        if row is not None:
+            proxy = self._proxies[row]
+            proxy.name = product.name
+            proxy.description = product.description
+            proxy.category = product.category
+            proxy.price = product.price
+            proxy.stock_quantity = product.stock_quantity
+            return proxy
+        row = len(self.ids)
+        self._rows[product.id] = row
+        self.ids.append(product.id)
+        self.names.append(product.name)
+        self.descriptions.append(product.description)
+        self.category_codes.append(self.category_code(product.category))
+        self.price_cents.append(to_cents(product.price))
+        self.stock.append(product.stock_quantity)
+        proxy = ProductProxy(self, row)
+        self._proxies.append(proxy)
+        return proxy
+
+    def remove(self, product_id: str) -> None:
+        """Satırı son satırla yer değiştirerek O(1) siler; taşınan satırın vekili güncellenir."""
+        row = self._rows.pop(product_id, None)
+        if row is None:
+            return
+        last = len(self.ids) - 1
+        if row != last:
+            for column in (self.ids, self.names, self.descriptions, self.category_codes, self.price_cents, self.stock):
+                column[row] = column[last]
+            moved = self._proxies[last]
+            moved._row = row
+            self._proxies[row] = moved
+            self._rows[self.ids[row]] = row
+        for column in (self.ids, self.names, self.descriptions, self.category_codes, self.price_cents, self.stock,
+                       self._proxies):
+            column.pop()
+
+    def _category_mask_rows(self, category: Optional[str]) -> Optional[List[int]]:
+        if category is None:
+            return None
+        code = self._category_lookup.get(category)
+        if code is None:
+            return []
+        return [row for row, value in enumerate(self.category_codes) if value == code]
+
+    def total_value_cents(self, category: Optional[str] = None) -> int:
+        """Stoktaki ürünlerin toplam değeri (fiyat x stok), kuruş cinsinden."""
+        if np is not None and len(self):
+            prices = np.frombuffer(self.price_cents, dtype=np.int64)
+            stock = np.frombuffer(self.stock, dtype=np.int64)
+            if category is not None:
+                mask = np.frombuffer(self.category_codes, dtype=np.uint32) == self._category_lookup.get(category, -1)
+                prices, stock = prices[mask], stock[mask]
+            return int(np.dot(prices, stock))
+        rows = self._category_mask_rows(category)
+        if rows is None:
+            return sum(map(mul, self.price_cents, self.stock))
+        return sum(self.price_cents[row] * self.stock[row] for row in rows)
+
+    def apply_price_change(self, percent: Decimal, category: Optional[str] = None) -> List[str]:
+        """
+        Fiyatları yüzde olarak değiştirir (ör. 10 = %10 zam, -5 = %5 indirim) ve fiyatı
+        değişen ürünlerin ID'lerini döner. Yeni fiyatlar kuruşa yuvarlanır ve negatif olamaz.
+        """
+        # Tamsayı aritmetiğiyle yarım kuruşlar yukarı yuvarlanır: (fiyat * (10000 + bp) + 5000) // 10000
+        factor = 10000 + to_cents(percent)  # yüzde -> baz puan
+        if np is not None and len(self):
+            prices = np.frombuffer(self.price_cents, dtype=np.int64)
+            mask = None
+            if category is not None:
+                mask = np.frombuffer(self.category_codes, dtype=np.uint32) == self._category_lookup.get(category, -1)
+            updated = np.maximum((prices * factor + 5000) // 10000, 0)
+            if mask is not None:
+                updated = np.where(mask, updated, prices)
+            changed = np.nonzero(updated != prices)[0]
+            prices[:] = updated
+            return [self.ids[row] for row in changed.tolist()]
+        rows = self._category_mask_rows(category)
+        changed = []
+        for row in (range(len(self)) if rows is None else rows):
+            old = self.price_cents[row]
+            new = max((old * factor + 5000) // 10000, 0)
+            if new != old:
+                self.price_cents[row] = new
+                changed.append(self.ids[row])
+        return changed
+
+    def low_stock(self, threshold: int, category: Optional[str] = None) -> List[str]:
+        """Stoğu threshold veya altında olan ürünlerin ID'leri (isteğe bağlı olarak tek kategoride), stoğa göre artan sırada."""
+        stock = self.stock
+        if np is not None and len(self):
+            mask = np.frombuffer(stock, dtype=np.int64) <= threshold
+            if category is not None:
+                mask &= np.frombuffer(self.category_codes, dtype=np.uint32) == self._category_lookup.get(category, -1)
+            rows = np.nonzero(mask)[0].tolist()
+        else:
+            rows = self._category_mask_rows(category)
+            if rows is None:
+                rows = [row for row, quantity in enumerate(stock) if quantity <= threshold]
+            else:
+                rows = [row for row in rows if stock[row] <= threshold]
+        rows.sort(key=lambda row: (stock[row], self.ids[row]))
+        return [self.ids[row] for row in rows]
+
+    def by_category(self, category: str) -> List[str]:
+        """Kategorideki ürünlerin ID'leri."""
+        if np is not None and len(self):
+            mask = np.frombuffer(self.category_codes, dtype=np.uint32) == self._category_lookup.get(category, -1)
+            return [self.ids[row] for row in np.nonzero(mask)[0].tolist()]
+        return [self.ids[row] for row in self._category_mask_rows(category)]
+
+    def categories(self) -> List[str]:
+        """En az bir ürünü olan kategoriler, sıralı."""
+        return sorted(self.category_names[code] for code in set(self.category_codes))
+
+    def by_price(self, min_price: Optional[Decimal] = None, max_price: Optional[Decimal] = None) -> List[str]:
+        """Fiyatı [min_price, max_price] aralığındaki ürünlerin ID'leri, fiyata göre artan sırada."""
+        low = None if min_price is None else int((Decimal(min_price) / _CENT).to_integral_value(ROUND_CEILING))
+        high = None if max_price is None else int((Decimal(max_price) / _CENT).to_integral_value(ROUND_FLOOR))
+        prices = self.price_cents
+        if np is not None and len(self):
+            values = np.frombuffer(prices, dtype=np.int64)
+            mask = np.ones(len(self), dtype=bool)
+            if low is not None:
+                mask &= values >= low
+            if high is not None:
+                mask &= values <= high
+            rows = np.nonzero(mask)[0].tolist()
+        else:
+            rows = [row for row, cents in enumerate(prices)
+                    if (low is None or cents >= low) and (high is None or cents <= high)]
+        rows.sort(key=lambda row: (prices[row], self.ids[row]))
+        return [self.ids[row] for row in rows]
+
+    def views(self, start: int, count: int) -> List[ProductView]:
+        """start satırından başlayan en çok count ürünün görünümü."""
+        return [self._proxies[row].view() for row in range(start, min(start + count, len(self)))]
+
+    def snapshot(self) -> ColumnarSnapshot:
+        return ColumnarSnapshot(self)
+
+    def proxies(self) -> Iterable[ProductProxy]:
+        return iter(self._proxies)
@@ -0,0 +1,118 @@
+import heapq
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+_CLOSED = object()
+
+
+class HoldRegistry:
+    """
+    Açık (commit ya da release edilmemiş) stok ayırmalarının kaydı.
+    Süreli ayırmalar bitiş zamanına göre bir min-heap'te tutulur; süresi uzatılan ya da kapanan
+    ayırmaların eski heap girdileri silinmez, çıkarılırken atlanır (lazy deletion).
+    Ürün başına ayrılmış miktar ayrıca tutulur; ekleme, kapatma ve sorgular O(log n) ya da daha iyidir.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self._heap: List[Tuple[float, str]] = []
+        self._expiry: Dict[str, Optional[float]] = {}  # ayırma ID'si -> bitiş zamanı (süresizse None)
+        self._lines: Dict[str, Dict[str, int]] = {}
+        self._held: Dict[str, int] = {}  # ürün ID'si -> açık ayırmalardaki toplam miktar
+
+    def __contains__(self, reservation_id: str) -> bool:
+        return reservation_id in self._expiry
+
+    def add(self, reservation_id: str, lines: Dict[str, int], expires_at: Optional[float] = None) -> None:
+        with self.condition:
+            self._expiry[reservation_id] = expires_at
+            self._lines[reservation_id] = lines
+            for product_id, quantity in lines.items():
+                self._held[product_id] = self._held.get(product_id, 0) + quantity
+            if expires_at is not None:
+                self._push(reservation_id, expires_at)
+
+    def _push(self, reservation_id: str, expires_at: float) -> None:
+        earliest = self._heap[0][0] if self._heap else None
+        heapq.heappush(self._heap, (expires_at, reservation_id))
+        if earliest is None or expires_at < earliest:
+            # Temizleyici daha erken uyanmalı.
+            self.condition.notify_all()
+
+    def extend(self, reservation_id: str, expires_at: float) -> bool:
+        with self.condition:
+            if reservation_id not in self._expiry:
+                return False
+            self._expiry[reservation_id] = expires_at
+            self._push(reservation_id, expires_at)
+            return True
+
+    def discard(self, reservation_id: str) -> bool:
+        with self.condition:
+            if self._expiry.pop(reservation_id, _CLOSED) is _CLOSED:
+                return False
+            for product_id, quantity in self._lines.pop(reservation_id).items():
+                remaining = self._held[product_id] - quantity
+                if remaining:
+                    self._held[product_id] = remaining
+                else:
+                    del self._held[product_id]
+            return True
+
+    def held(self, product_id: str) -> int:
+        return self._held.get(product_id, 0)
+
+    def expires_at(self, reservation_id: str) -> Optional[float]:
+        return self._expiry.get(reservation_id)
+
+    def next_expiry(self) -> Optional[float]:
+        """En yakın geçerli bitiş zamanı; geçersiz (eskimiş) heap girdileri bu sırada atılır."""
+        with self.condition:
+            while self._heap:
+                expires_at, reservation_id = self._heap[0]
+                if self._expiry.get(reservation_id, _CLOSED) == expires_at:
+                    return expires_at
+                heapq.heappop(self._heap)
+            return None
+
+    def pop_expired(self, now: float) -> List[str]:
+        """Süresi dolmuş ayırmaların ID'lerini heap'ten çıkarır; kayıttan silmek çağıranın işidir."""
+        expired = []
+        with self.condition:
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, reservation_id = heapq.heappop(self._heap)
+                if self._expiry.get(reservation_id, _CLOSED) == expires_at:
+                    expired.append(reservation_id)
+        return expired
+
+
+class HoldReaper(threading.Thread):
+    """Süresi dolan ayırmaları arka planda geri veren iş parçacığı; bir sonraki bitiş zamanına kadar uyur."""
+
+    def __init__(self, registry: HoldRegistry, release: Callable[[List[str]], None]):
+        super().__init__(name="stock-hold-reaper", daemon=True)
+        self._registry = registry
+        self._release = release
+        self._stopped = False
+
+    def run(self) -> None:
+        condition = self._registry.condition
+        while True:
+            with condition:
+                while not self._stopped:
+                    next_expiry = self._registry.next_expiry()
+                    now = time.monotonic()
+                    if next_expiry is not None and next_expiry <= now:
+                        break
+                    condition.wait(None if next_expiry is None else next_expiry - now)
+                if self._stopped:
+                    return
+            expired = self._registry.pop_expired(time.monotonic())
+            if expired:
+                self._release(expired)
+
+    def stop(self) -> None:
+        with self._registry.condition:
+            self._stopped = True
+            self._registry.condition.notify_all()
@@ -1,58 +1,332 @@
-from typing import Dict, Optional
-from decimal import Decimal
-from src.models.product import Product
+import atexit
+import itertools
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+from decimal import Decimal, ROUND_HALF_UP
+from src.models.product import Product, ProductView
+from src.data.collection_names import REORDER_THRESHOLDS
 from src.data.storage import JsonStorage
+from src.inventory.stock_ledger import StockLedger
+from src.inventory.product_index import ProductIndex
+from src.inventory.search import ProductSearchIndex
+from src.inventory.holds import HoldReaper, HoldRegistry
+from src.inventory.columnar import ColumnarCatalogue
+from src.inventory.lazy_catalogue import LazyCatalogue
+from src.inventory.reorder import LOW_STOCK, ReorderMonitor
+from src.notifications.notification_service import NotificationService
+
+class Reservation:
+    """
+    InventoryManager.reserve() sonucu.
+    lines: ürün ID'si -> ayrılan miktar, failures: ürün ID'si -> başarısızlık nedeni.
+    expires_at: süreli ayırmalarda time.monotonic() cinsinden bitiş zamanı.
+    """
+
+    def __init__(self, id: str, lines: Dict[str, int], failures: Dict[str, str], expires_at: Optional[float] = None):
+        self.id = id
+        self.lines = lines
+        self.failures = failures
+        self.expires_at = expires_at
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
 
 class InventoryManager:
 
     """
        Ürün envanterini yöneten Singleton sınıf.
        Ürün ekleme, silme, stok güncelleme gibi işlemleri içerir.
+
+       Stok miktarları belleğe eşlenmiş bir stok defterinde (StockLedger) tutulur;
+       ürün kataloğu (products.json) yalnızca açıklayıcı alanlar değiştiğinde yeniden yazılır.
+
+       Katalog değişiklikleri hemen yazılmaz: değişen ürünler kirli (dirty) olarak işaretlenir ve
+       flush_interval saniye sonra, kirli ürün sayısı flush_threshold'a ulaştığında, flush() çağrıldığında
+       ya da program kapanırken tek seferde diske yazılır. batch() bloğu içindeki değişiklikler
+       blok bitince tek bir yazmada toplanır.
+
+       Eşzamanlı sipariş işçileri için: stok değişiklikleri ürün ID'sine göre şeritlenmiş kilitlerle
+       korunur (farklı ürünlere gelen siparişler birbirini beklemez), get_product ve get_all_products kilit almaz.
+       lock_stripes şerit sayısıdır; 1 verilirse tüm stok değişiklikleri tek bir kilitte sıralanır.
+
+       columnar=True ile ürünler Product nesneleri yerine sütunlu bir katalogda (ColumnarCatalogue) tutulur;
+       get_product gibi yöntemler __slots__'lı vekil nesneler döner. Ürün başına görünüm ya da indeks girdisi
+       tutulmaz: katalog görünümü, kategori, fiyat ve stok sorguları sütunlardan türetilir, metin indeksi ilk
+       aramada kurulur. Çok büyük kataloglarda bellek kullanımını düşürür ve değerleme, toplu fiyat değişikliği
+       gibi işlemleri sütun üzerinde tek geçişte yapar.
+
+       lazy=True ile açılışta katalog ayrıştırılmaz: yalnızca ürün ID'si -> dosya konumu indeksi yüklenir,
+       Product nesneleri ilk erişimde kurulur ve en çok cache_size ürünlük bir önbellekte tutulur (bkz. LazyCatalogue).
+       Kategori, fiyat ve metin indeksleri ile tüm katalog görünümü ilk ihtiyaç duyulduğunda tek geçişte kurulur;
+       ekranlar get_products_page() ile kataloğu sayfa sayfa okuyabilir.
        """
 
     _instance = None # Singleton için tek bir örnek saklanır.
 
-    def __new__(cls):
+    # Ürünün açıklayıcı (katalogda saklanan) alanları
+    CATALOGUE_FIELDS = ('name', 'description', 'price', 'category')
+    # Yeniden sipariş eşiklerinin saklandığı koleksiyon
+    THRESHOLDS_COLLECTION = REORDER_THRESHOLDS
+
+    def __new__(cls, *args, **kwargs):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._initialized = False
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, flush_interval: float = 1.0, flush_threshold: int = 100, columnar: bool = False,
+                 lazy: bool = False, cache_size: int = 1024, storage: Optional[JsonStorage] = None,
+                 lock_stripes: int = 64):
         if not self._initialized:
-            self._products: Dict[str, Product] = {}
-            self._storage = JsonStorage()
+            if columnar and lazy:
+                raise ValueError("columnar and lazy cannot be combined")
+            # Uygulamanın deposu verilmelidir; birden çok süreç aynı veri dizinini kullanıyorsa bu depo shared=True olmalıdır.
+            self._storage = storage if storage is not None else JsonStorage()
+            if lazy and not isinstance(self._storage, JsonStorage):
+                raise ValueError("lazy mode requires JsonStorage")
+            self._columns: Optional[ColumnarCatalogue] = ColumnarCatalogue() if columnar else None
+            # Sütunlu modda ürün ID'si -> vekil eşlemesi kataloğun kendisidir.
+            self._products: Dict[str, Product] = (
+                LazyCatalogue(self._storage, self._product_from_record, cache_size=cache_size) if lazy
+                else self._columns if columnar else {})
+            self._lazy = lazy
+            # İkincil indeksler ve görünümler kurulu mu? Tembel modda ilk ihtiyaçta kurulur, sütunlu modda hiç kurulmaz.
+            self._indexed = False
+            # Metin indeksi güncel mi? Sütunlu modda ilk aramada kurulur (bkz. _ensure_search).
+            self._searchable = False
+            # Katalog anlık görüntüsü: ürün başına değişmez görünümler, her değişiklikte yalnızca ilgili girdi yenilenir.
+            self._views: Dict[str, ProductView] = {}
+            self._versions = itertools.count(1)
+            self._version = 0
+            self._snapshot: Tuple[int, Mapping[str, ProductView]] = (0, MappingProxyType({}))
+            self._index = ProductIndex()  # kategori, fiyat ve stok ikincil indeksleri
+            self._search = ProductSearchIndex()  # ad, açıklama ve kategori üzerinde metin araması
+            self._ledger = StockLedger(os.path.join(self._storage.data_dir, 'stock.ledger'), self._storage,
+                                       stripes=lock_stripes)
+            self.flush_interval = flush_interval
+            self.flush_threshold = flush_threshold
+            # Katalog (ürün ekleme/silme/açıklama değişikliği) ve yazma zamanlaması için; stok değişiklikleri
+            # bu kilidi almaz, stok defterinin ürün bazlı şerit kilitlerini kullanır.
+            self._lock = threading.RLock()
+            self._dirty: Set[str] = set()  # eklenen, değişen ya da silinen ürünlerin ID'leri
+            self._flush_timer: Optional[threading.Timer] = None
+            self._batch_depth = 0
+            self._reservations: Dict[str, Reservation] = {}  # onaylanmamış (commit/release bekleyen) ayırmalar
+            # batch() içinde eklenen, stok defterine henüz yazılmamış ürünler: ürün ID'si -> miktar (bkz. _seed_pending)
+            self._unseeded: Dict[str, int] = {}
+            thresholds = self._storage.load_data(self.THRESHOLDS_COLLECTION, default={})
+            # Eşik altına inen/çıkan ürünler; stok her değiştiğinde yalnızca o ürün değerlendirilir.
+            self._reorder = ReorderMonitor(thresholds.get('products'), thresholds.get('categories'))
+            self._holds = HoldRegistry()  # açık ayırmaların bitiş heap'i ve ürün başına ayrılan miktarlar
+            self._reaper: Optional[HoldReaper] = None
             self._load_products()
+            # atexit kayıtları ters sırada çalışır: önce açık ayırmalar iade edilir, sonra katalog yazılır,
+            # en son defter kapanır.
+            atexit.register(self._ledger.close)
+            atexit.register(self.flush)
+            atexit.register(self._release_open_reservations)
             self._initialized = True
 
     def _load_products(self):
 
+        if self._lazy:
+            # Ürünler ilk erişimde LazyCatalogue tarafından _product_from_record ile kurulur. Stok defterinde
+            # henüz olmayanların (ör. ilk açılış) kayıtları şimdi okunur ve slotları tek yazmayla ayrılır.
+            missing = [product_id for product_id in self._products if product_id not in self._ledger]
+            if missing:
+                self._ledger.ensure_many({record['id']: record['stock_quantity']
+                                          for record in self._products.records(missing)})
+            self._version = next(self._versions)
+            return
         products_data = self._storage.load_data('products', default={})
+        # Yeni ürünlerin stok defteri slotları ürün başına değil, tek bir eşleme yazmasıyla ayrılır.
+        self._ledger.ensure_many({record['id']: record['stock_quantity'] for record in products_data.values()})
         for product_data in products_data.values():
-            product = Product(
-                id=product_data['id'],
-                name=product_data['name'],
-                description=product_data['description'],
-                price=Decimal(product_data['price']),
-                category=product_data['category'],
-                stock_quantity=product_data['stock_quantity']
-            )
+            product = self._product_from_record(product_data)
+            if self._columns is not None:
+                self._columns.add(product)
+                continue
             self._products[product.id] = product
+            self._views[product.id] = product.view()
+        self._version = next(self._versions)
+        if self._columns is not None:
+            return
+        self._index.rebuild(self._products.values())
+        self._search.rebuild(self._products.values())
+        self._indexed = self._searchable = True
+
+    def _product_from_record(self, product_data: Dict[str, Any]) -> Product:
+        product = Product(
+            id=product_data['id'],
+            name=product_data['name'],
+            description=product_data['description'],
+            price=Decimal(product_data['price']),
+            category=product_data['category'],
+            stock_quantity=product_data['stock_quantity']
+        )
+        # Stok defteri katalogdaki stok değerinden önceliklidir.
+        product.stock_quantity = self._ledger.ensure(product.id, product.stock_quantity)
+        # Başlangıç durumu sessizce kurulur; yalnızca bundan sonraki eşik geçişleri bildirilir.
+        self._reorder.update(product.id, product.category, product.stock_quantity)
+        return product
+
+    def _ensure_indexes(self) -> None:
+        """Tembel modda ikincil indeksleri ve katalog görünümünü kataloğun tek bir taramasıyla kurar."""
+        if self._indexed or self._columns is not None:
+            return
+        with self._lock:
+            if self._indexed:
+                return
+            views = {product.id: product.view() for product in self._products.values()}
+            self._index.rebuild(views.values())
+            self._search.rebuild(views.values())
+            self._views.update(views)
+            self._indexed = self._searchable = True
+            # Tarama sırasında stoğu değişen ürünler (bundan sonrası _set_stock ile izlenir) düzeltilir.
+            for product_id, view in views.items():
+                if self._ledger.get(product_id) != view.stock_quantity:
+                    with self._ledger.hold(product_id):
+                        product = self._products.get(product_id)
+                        if product is not None:
+                            self._index.update_stock(product_id, product.stock_quantity)
+                            self._views[product_id] = product.view()
+            self._version = next(self._versions)
 
     def add_product(self, product: Product) -> None:
 
-        self._products[product.id] = product
-        self._save_products()
+        with self._lock:
+            if self._columns is not None:
+                # Ürün sütunlara yazılır; bundan sonra katalogda onun vekili tutulur.
+                product = self._columns.add(product)
+            self._products[product.id] = product
+            if self._batch_depth and product.id not in self._ledger:
+                # Blok içindeki yeni ürünlerin slotları blok sonunda tek yazmayla ayrılır.
+                self._unseeded[product.id] = product.stock_quantity
+            else:
+                self._unseeded.pop(product.id, None)
+                self._ledger.set(product.id, product.stock_quantity)
+            if self._indexed:
+                self._index.add(product)
+            if self._searchable:
+                self._search.add(product)
+            self._publish(product)
+            self._check_reorder(product)
+            self._mark_dirty(product.id)
 
     def remove_product(self, product_id: str) -> None:
 
-        if product_id in self._products:
-            del self._products[product_id]
-            self._save_products()
+        with self._lock:
+            if product_id in self._products:
+                if self._columns is not None:
+                    # Son satır silinen satırın yerine taşınır; o ürünün stok yazmaları bu sırada beklemelidir.
+                    with self._ledger.hold(self._columns.ids[-1]):
+                        self._columns.remove(product_id)
+                else:
+                    del self._products[product_id]
+                self._unseeded.pop(product_id, None)
+                self._ledger.remove(product_id)
+                self._index.remove(product_id)
+                self._search.remove(product_id)
+                self._views.pop(product_id, None)
+                self._reorder.forget(product_id)
+                self._version = next(self._versions)
+                self._mark_dirty(product_id)
+
+    def update_product(self, product_id: str, **fields) -> bool:
+        """
+        Ürünün alanlarını günceller. Katalog yalnızca açıklayıcı alanlar
+        değiştiğinde yeniden yazılır; stok değişikliği yalnızca stok defterine gider.
+        """
+        product = self.get_product(product_id)
+        if not product:
+            return False
+
+        catalogue_changed = False
+        for field, value in fields.items():
+            if field == 'stock_quantity':
+                with self._ledger.hold(product_id):
+                    self._ledger.set(product_id, value)
+                    self._set_stock(product, value)
+            elif field in self.CATALOGUE_FIELDS:
+                if getattr(product, field) != value:
+                    with self._lock, self._ledger.hold(product_id):
+                        setattr(product, field, value)
+                        # Tembel modda değişen ürün kaydedilene kadar önbellekten düşmemesi için sabitlenir.
+                        self._products[product_id] = product
+                    catalogue_changed = True
+            else:
+                raise ValueError(f"Unknown product field: {field}")
+
+        if catalogue_changed:
+            # Ürünün kilidi de alınır; eşzamanlı bir stok değişikliği eski alanlarla görünüm yayımlayamaz.
+            with self._lock, self._ledger.hold(product_id):
+                if self._indexed:
+                    self._index.update(product)
+                if self._searchable:
+                    self._search.add(product)
+                self._publish(product)
+                # Kategori değiştiyse geçerli eşik de değişmiş olabilir.
+                self._check_reorder(product)
+                self._mark_dirty(product_id)
+        return True
 
     def get_product(self, product_id: str) -> Optional[Product]:
-        #ID'sine göre bir ürünü döner. Bulamazsa None döner.
-        return self._products.get(product_id)
+        #ID'sine göre bir ürünü döner. Bulamazsa None döner. Kilit almaz.
+        if product_id in self._unseeded:
+            # Stok işlemlerinden önce ürünün defter slotu bulunmalıdır.
+            self._seed_pending()
+        product = self._products.get(product_id)
+        if product is not None:
+            # Başka bir süreç stoğu değiştirmiş olabilir; güncel değer defterden okunur.
+            # Yalnızca değer farklıysa ürünün kilidi alınıp nesne güncellenir.
+            if self._ledger.get(product_id) not in (None, product.stock_quantity):
+                with self._ledger.hold(product_id):
+                    stock = self._ledger.get(product_id)
+                    if stock is not None:
+                        self._set_stock(product, stock)
+        return product
+
+    def _set_stock(self, product: Product, quantity: int) -> None:
+        # Çağıran, ürünün defter kilidini (self._ledger.hold) tutmalıdır.
+        if product.stock_quantity != quantity:
+            product.stock_quantity = quantity
+            if self._indexed:
+                self._index.update_stock(product.id, quantity)
+            self._publish(product)
+            self._check_reorder(product)
+
+    def _check_reorder(self, product: Product) -> None:
+        event = self._reorder.update(product.id, product.category, product.stock_quantity)
+        if event is None:
+            return
+        event_type, threshold = event
+        if event_type == LOW_STOCK:
+            message = (f"Low stock: {product.name} ({product.id}) has {product.stock_quantity} left, "
+                       f"reorder threshold is {threshold}")
+        else:
+            message = (f"Stock replenished: {product.name} ({product.id}) now has {product.stock_quantity}, "
+                       f"reorder threshold is {threshold}")
+        NotificationService().notify(event_type, message)
+
+    def _publish(self, product: Product) -> None:
+        # Görünüm sürüm artırılmadan önce yenilenir; böylece bir anlık görüntü hiçbir zaman
+        # etiketlendiği sürümden eski veri içermez.
+        if product.id in self._products:
+            if self._indexed:
+                self._views[product.id] = product.view()
+            self._version = next(self._versions)
+
+    @property
+    def catalogue_version(self) -> int:
+        """Katalogdaki (stok dahil) her değişiklikte artan sayaç; çağıranlar değişiklik olmadığında işi atlayabilir."""
+        return self._version
 
     def update_stock(self, product_id: str, quantity_change: int) -> bool:
 
@@ -60,35 +334,453 @@ class InventoryManager:
         if not product:
             return False
 
-        new_quantity = product.stock_quantity + quantity_change
-        if new_quantity < 0:
+        # Kontrol ve güncelleme yalnızca bu ürünün kilidi altında tek adımda yapılır; farklı ürünlerin
+        # stok değişiklikleri birbirini beklemez. Ürünün stok slotu yerinde güncellenir, katalog yeniden yazılmaz.
+        with self._ledger.hold(product_id):
+            new_quantity = self._ledger.adjust(product_id, quantity_change)
+            if new_quantity is None:
+                return False
+            self._set_stock(product, new_quantity)
+        return True
+
+    def reserve(self, lines: Iterable[Tuple[str, int]], ttl: Optional[float] = None) -> Reservation:
+        """
+        Sipariş satırlarının tamamını tek adımda doğrular ve stoktan düşer.
+        Satırlardan biri bile karşılanamazsa hiçbir stok düşülmez; her başarısız satırın
+        nedeni Reservation.failures içinde döner. Başarılı ayırma commit() ya da release() ile kapatılmalıdır.
+        ttl (saniye) verilirse ayırma bir tutmadır (hold): süresi içinde commit edilmezse
+        arka plandaki temizleyici stoğu otomatik olarak geri verir.
+        """
+        requested, failures = self._collect_lines(lines)
+
+        with self._ledger.hold(*requested):
+            if failures:
+                # Stoktan düşülmez ama diğer satırlar için de neden raporlanır.
+                applied = False
+                results = {}
+                for product_id, quantity in requested.items():
+                    stock = self._ledger.get(product_id)
+                    results[product_id] = None if stock is None else stock - quantity
+            else:
+                applied, results = self._ledger.adjust_many({pid: -qty for pid, qty in requested.items()})
+            for product_id, quantity in results.items():
+                if quantity is None:
+                    failures[product_id] = "Product not found"
+                elif quantity < 0:
+                    available = quantity + requested[product_id]
+                    failures[product_id] = f"Insufficient stock: requested {requested[product_id]}, available {available}"
+                elif applied and product_id in self._products:
+                    self._set_stock(self._products[product_id], quantity)
+
+        return self._open_reservation(requested, failures, ttl)
+
+    def reserve_many(self, orders: Iterable[Iterable[Tuple[str, int]]],
+                     ttl: Optional[float] = None) -> List[Reservation]:
+        """
+        Birden çok siparişin satırlarını tek geçişte doğrular ve ayırır; sipariş başına bir Reservation döner.
+        Her sipariş kendi içinde ya tamamen ayrılır ya hiç; siparişler sırayla değerlendirilir, yani stok
+        yetmediğinde önce gelen sipariş kazanır. Toplu içe aktarmalar için: ilgili ürünlerin kilitleri bir kez
+        alınır ve tüm stok değişiklikleri stok defterine tek bir adjust_many ile yazılır.
+        """
+        collected = [self._collect_lines(lines) for lines in orders]
+        product_ids = {product_id for requested, _ in collected for product_id in requested}
+
+        with self._ledger.hold(*product_ids):
+            available = {product_id: self._ledger.get(product_id) for product_id in product_ids}
+            deltas: Dict[str, int] = {}
+            for requested, failures in collected:
+                shortfalls = {}
+                for product_id, quantity in requested.items():
+                    stock = available[product_id]
+                    if stock is None:
+                        shortfalls[product_id] = "Product not found"
+                    elif stock < quantity:
+                        shortfalls[product_id] = f"Insufficient stock: requested {quantity}, available {stock}"
+                failures.update(shortfalls)
+                if failures:
+                    continue
+                for product_id, quantity in requested.items():
+                    available[product_id] -= quantity
+                    deltas[product_id] = deltas.get(product_id, 0) - quantity
+            if deltas:
+                # Kilitler tutulduğu ve miktarlar yukarıda doğrulandığı için bu değişiklik başarısız olamaz.
+                _, results = self._ledger.adjust_many(deltas)
+                for product_id, quantity in results.items():
+                    product = self._products.get(product_id)
+                    if product is not None:
+                        self._set_stock(product, quantity)
+
+        return [self._open_reservation(requested, failures, ttl) for requested, failures in collected]
+
+    def _collect_lines(self, lines: Iterable[Tuple[str, int]]) -> Tuple[Dict[str, int], Dict[str, str]]:
+        requested: Dict[str, int] = {}
+        failures: Dict[str, str] = {}
+        for product_id, quantity in lines:
+            if quantity <= 0:
+                failures[product_id] = f"Invalid quantity: {quantity}"
+            elif self.get_product(product_id) is None:
+                # get_product tembel modda ürünü (ve stok defteri kaydını) ilk kez yükleyebilir.
+                failures[product_id] = "Product not found"
+            else:
+                # Aynı ürün birden çok satırda geçiyorsa miktarlar toplanır.
+                requested[product_id] = requested.get(product_id, 0) + quantity
+        return requested, failures
+
+    def _open_reservation(self, requested: Dict[str, int], failures: Dict[str, str],
+                          ttl: Optional[float]) -> Reservation:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        reservation = Reservation(str(uuid.uuid4()), requested, failures, expires_at)
+        if reservation.ok:
+            self._reservations[reservation.id] = reservation
+            self._holds.add(reservation.id, requested, expires_at)
+            if expires_at is not None:
+                self._start_reaper()
+        return reservation
+
+    def extend_hold(self, reservation: Reservation, ttl: float) -> bool:
+        """Açık bir tutmanın süresini şu andan itibaren ttl saniyeye uzatır."""
+        expires_at = time.monotonic() + ttl
+        if not self._holds.extend(reservation.id, expires_at):
+            return False
+        reservation.expires_at = expires_at
+        return True
+
+    def get_held_quantity(self, product_id: str) -> int:
+        """Ürünün açık ayırmalarda (commit ya da release bekleyen) tutulan miktarı."""
+        return self._holds.held(product_id)
+
+    def get_available_quantity(self, product_id: str) -> int:
+        """Satılabilir miktar. Ayırmalar stoktan hemen düşüldüğünden açık tutmalar zaten hariçtir."""
+        product = self.get_product(product_id)
+        return product.stock_quantity if product else 0
+
+    def _start_reaper(self) -> None:
+        if self._reaper is None:
+            with self._lock:
+                if self._reaper is None:
+                    self._reaper = HoldReaper(self._holds, self._release_expired)
+                    self._reaper.start()
+
+    def _release_expired(self, reservation_ids: List[str]) -> None:
+        for reservation_id in reservation_ids:
+            reservation = self._reservations.get(reservation_id)
+            if reservation is not None:
+                self.release(reservation)
+
+    def _release_open_reservations(self) -> None:
+        """
+        Program kapanırken kesinleşmemiş ayırmaların stoğunu iade eder. Ayırmalar stok defterinden hemen
+        düşülür ve yalnızca bu süreçte kaydedilir; iade edilmezlerse stok defterde kalıcı olarak eksik kalır.
+        """
+        if self._reaper is not None:
+            self._reaper.stop()
+        for reservation in list(self._reservations.values()):
+            self.release(reservation)
+
+    def commit(self, reservation: Reservation) -> bool:
+        """Ayırmayı kesinleştirir; stok defteri tek seferde diske zorlanır."""
+        if self._reservations.pop(reservation.id, None) is None:
             return False
+        self._holds.discard(reservation.id)
+        self._ledger.flush()
+        return True
 
-        product.stock_quantity = new_quantity
-        self._save_products()
+    def commit_many(self, reservations: Iterable[Reservation]) -> List[bool]:
+        """Ayırmaları kesinleştirir; stok defteri yalnızca bir kez diske zorlanır."""
+        committed = []
+        for reservation in reservations:
+            ok = self._reservations.pop(reservation.id, None) is not None
+            if ok:
+                self._holds.discard(reservation.id)
+            committed.append(ok)
+        if any(committed):
+            self._ledger.flush()
+        return committed
+
+    def release(self, reservation: Reservation) -> bool:
+        """Kesinleşmemiş bir ayırmayı geri alır ve ayrılan stoğu iade eder."""
+        if self._reservations.pop(reservation.id, None) is None:
+            return False
+        self._holds.discard(reservation.id)
+        with self._ledger.hold(*reservation.lines):
+            # Bu arada silinen ürünler atlanır; kalanların stoğu iade edilir.
+            returned = {pid: qty for pid, qty in reservation.lines.items() if pid in self._ledger}
+            _, results = self._ledger.adjust_many(returned)
+            for product_id, quantity in results.items():
+                product = self._products.get(product_id)
+                if product is not None and quantity is not None:
+                    self._set_stock(product, quantity)
         return True
 
-    def get_all_products(self) -> Dict[str, Product]:
-        return self._products.copy()
+    def get_all_products(self) -> Mapping[str, ProductView]:
+        """
+        Kataloğun salt okunur anlık görüntüsü (ürün ID'si -> değişmez ProductView).
+        Aynı nesne bir sonraki değişikliğe kadar yeniden kullanılır; kilit almaz.
+        Tembel modda ilk çağrı tüm kataloğu tarar; ekranlar bunun yerine get_products_page() kullanabilir.
+        """
+        self._ensure_indexes()
+        version, snapshot = self._snapshot
+        current = self._version
+        if version != current:
+            if self._columns is not None:
+                # Görünümler sütunların kopyasından okunurken kurulur; satır taşıyan silmeler kilitle beklenir.
+                with self._lock:
+                    snapshot = self._columns.snapshot()
+            else:
+                # dict.copy() GIL altında tek adımda yapılır.
+                snapshot = MappingProxyType(self._views.copy())
+            self._snapshot = (current, snapshot)
+        return snapshot
+
+    def get_products_page(self, start: int, count: int) -> List[ProductView]:
+        """Kataloğun start'tan başlayan en çok count ürünü; tembel modda yalnızca bu ürünler yüklenir."""
+        if self._lazy:
+            return [product.view() for product in self._products.page(start, count)]
+        if self._columns is not None:
+            with self._lock:
+                return self._columns.views(start, count)
+        return list(itertools.islice(self.get_all_products().values(), start, start + count))
+
+    def _lookup(self, product_ids: Iterable[str]) -> Dict[str, Product]:
+        products = self._products
+        return {pid: products[pid] for pid in product_ids if pid in products}
 
     def get_products_by_category(self, category: str) -> Dict[str, Product]:
+        if self._columns is not None:
+            with self._lock:
+                return self._lookup(self._columns.by_category(category))
+        self._ensure_indexes()
+        return self._lookup(self._index.by_category(category))
+
+    def get_categories(self) -> List[str]:
+        if self._columns is not None:
+            with self._lock:
+                return self._columns.categories()
+        self._ensure_indexes()
+        return self._index.categories()
+
+    def get_products_by_price_range(self, min_price: Optional[Decimal] = None,
+                                    max_price: Optional[Decimal] = None) -> Dict[str, Product]:
+        """Fiyatı [min_price, max_price] aralığındaki ürünleri fiyata göre artan sırada döner."""
+        if self._columns is not None:
+            with self._lock:
+                return self._lookup(self._columns.by_price(min_price, max_price))
+        self._ensure_indexes()
+        return self._lookup(self._index.by_price(min_price, max_price))
+
+    def search_products(self, query: str, limit: Optional[int] = None) -> Dict[str, Product]:
+        """Ad, açıklama ve kategoride önek araması yapar; sonuçlar ilgiye göre sıralıdır."""
+        self._ensure_search()
+        with self._lock:
+            return self._lookup(self._search.search(query, limit))
+
+    def _ensure_search(self) -> None:
+        """Metin indeksini kurar; sütunlu modda ilk aramada vekillerden kurulur ve bundan sonra artımlı güncellenir."""
+        if self._columns is None:
+            self._ensure_indexes()
+            return
+        if not self._searchable:
+            with self._lock:
+                if not self._searchable:
+                    self._search.rebuild(self._columns.proxies())
+                    self._searchable = True
+
+    def get_low_stock_products(self, threshold: int, category: Optional[str] = None) -> Dict[str, Product]:
+        """Stoğu threshold veya altında olan ürünleri (isteğe bağlı olarak tek kategoride) döner."""
+        if self._columns is not None:
+            with self._lock:
+                return self._lookup(self._columns.low_stock(threshold, category))
+        self._ensure_indexes()
+        if category is None:
+            # Sıralı stok indeksi: stoğa göre artan sırada.
+            return self._lookup(self._index.by_stock(None, threshold))
+        low = set(self._index.by_stock(None, threshold))
+        return self._lookup(pid for pid in self._index.by_category(category) if pid in low)
+
+    def set_reorder_threshold(self, product_id: str, threshold: Optional[int]) -> bool:
+        """Ürün için yeniden sipariş eşiği belirler (None: ürün eşiğini kaldırır, kategori eşiği geçerli olur)."""
+        product = self.get_product(product_id)
+        if product is None:
+            return False
+        with self._lock:
+            if threshold is None:
+                self._reorder.product_thresholds.pop(product_id, None)
+            else:
+                self._reorder.product_thresholds[product_id] = threshold
+            self._save_threshold('products', product_id, threshold)
+        with self._ledger.hold(product_id):
+            self._check_reorder(product)
+        return True
+
+    def set_category_reorder_threshold(self, category: str, threshold: Optional[int]) -> None:
+        """Kategorideki (kendi eşiği olmayan) tüm ürünler için eşik belirler; yalnızca o kategori yeniden değerlendirilir."""
+        with self._lock:
+            if threshold is None:
+                self._reorder.category_thresholds.pop(category, None)
+            else:
+                self._reorder.category_thresholds[category] = threshold
+            self._save_threshold('categories', category, threshold)
+        for product in self.get_products_by_category(category).values():
+            with self._ledger.hold(product.id):
+                self._check_reorder(product)
+
+    def _save_threshold(self, section: str, key: str, threshold: Optional[int]) -> None:
+        # Yalnızca değişen eşik yazılır; dosya yeniden okunduğundan diğer süreçlerin eşikleri korunur.
+        def put(thresholds):
+            values = thresholds.setdefault(section, {})
+            if threshold is None:
+                values.pop(key, None)
+            else:
+                values[key] = threshold
+            return True
+
+        self._storage.update(self.THRESHOLDS_COLLECTION, put, default={})
+
+    def get_reorder_threshold(self, product_id: str) -> Optional[int]:
+        """Ürün için geçerli eşik (ürün eşiği yoksa kategori eşiği)."""
+        product = self._products.get(product_id)
+        return None if product is None else self._reorder.threshold_for(product_id, product.category)
+
+    def get_below_threshold(self) -> Dict[str, Product]:
+        """
+        Stoğu yeniden sipariş eşiğine inmiş ürünler; eşik altındaki ürün sayısıyla orantılı sürede döner.
+        Tembel modda yalnızca şimdiye kadar yüklenmiş ürünler değerlendirilmiştir.
+        """
+        return self._lookup(self._reorder.below())
+
+    def get_most_urgent(self, count: int) -> Dict[str, Product]:
+        """Eşik altındaki ürünlerden stok/eşik oranı en düşük count tanesi, en aciliyle başlayarak (bkz. ReorderMonitor)."""
+        return self._lookup(self._reorder.most_urgent(count))
+
+    def get_inventory_value(self, category: Optional[str] = None) -> Decimal:
+        """Stoktaki ürünlerin toplam değeri (fiyat x stok)."""
+        if self._columns is not None:
+            with self._lock:
+                return Decimal(self._columns.total_value_cents(category)) / 100
+        self._ensure_indexes()
+        products = self._views.copy().values()
+        return sum((p.price * p.stock_quantity for p in products if category is None or p.category == category),
+                   Decimal(0))
+
+    def apply_price_change(self, percent: Decimal, category: Optional[str] = None) -> int:
+        """
+        Tüm ürünlerin (ya da bir kategorinin) fiyatını yüzde olarak değiştirir; ör. 10 = %10 zam,
+        -5 = %5 indirim. Yeni fiyatlar kuruşa yuvarlanır. Fiyatı değişen ürün sayısını döner.
+        """
+        self._ensure_indexes()
+        with self._lock:
+            if self._columns is not None:
+                changed = self._columns.apply_price_change(percent, category)
+                if changed:
+                    # Görünüm ve fiyat indeksi tutulmadığından yalnızca sürüm artırılır ve ürünler kirli işaretlenir.
+                    self._version = next(self._versions)
+                    self._dirty.update(changed)
+                    self._mark_dirty(changed[-1])
+                return len(changed)
+            changed = []
+            factor = 1 + Decimal(percent) / 100
+            for product in self._products.values():
+                if category is not None and product.category != category:
+                    continue
+                price = max((product.price * factor).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP), Decimal(0))
+                if price != product.price:
+                    product.price = price
+                    self._products[product.id] = product  # tembel modda kaydedilene kadar sabitlenir
+                    changed.append(product.id)
+            if not changed:
+                return 0
+            # Görünümler yalnızca değişen ürünler için yenilenir; fiyat indeksi görünümlerden tek seferde yeniden sıralanır.
+            for product_id in changed:
+                with self._ledger.hold(product_id):
+                    self._publish(self._products[product_id])
+                self._dirty.add(product_id)
+            self._index.rebuild(self._views.copy().values())
+            self._mark_dirty(changed[-1])
+            return len(changed)
+
+    @contextmanager
+    def batch(self):
+        """Blok içindeki tüm katalog değişikliklerini blok sonunda tek bir yazmada toplar."""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                outermost = self._batch_depth == 0
+            if outermost:
+                self._seed_pending()
+                self.flush()
+
+    def _seed_pending(self) -> None:
+        """batch() içinde eklenen yeni ürünlerin stok defteri slotlarını tek bir eşleme yazmasıyla ayırır."""
+        with self._lock:
+            pending, self._unseeded = self._unseeded, {}
+            if not pending:
+                return
+            stock = self._ledger.ensure_many(pending)
+            for product_id, quantity in pending.items():
+                if stock[product_id] != quantity:
+                    # Ürünü bu arada başka bir süreç deftere eklemiş; add_product gibi bu sürecin miktarı yazılır.
+                    self._ledger.set(product_id, quantity)
+
+    def _mark_dirty(self, product_id: str) -> None:
+        with self._lock:
+            self._dirty.add(product_id)
+            if self._batch_depth:
+                return
+            if len(self._dirty) >= self.flush_threshold or self.flush_interval <= 0:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self, force: bool = False) -> None:
+        """Bekleyen katalog değişikliklerini diske yazar; kirli ürün yoksa (force verilmedikçe) hiçbir şey yazılmaz."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty and not force:
+                return
+            self._save_products()
+            self._dirty.clear()
+
+    def save_products(self) -> None:
+        """Kataloğu ve stok defterini diske yazar."""
+        self.flush(force=True)
+        self._ledger.flush()
+
+    @staticmethod
+    def _record(p: Product) -> Dict[str, Any]:
         return {
-            pid: product
-            for pid, product in self._products.items()
-            if product.category == category
+            'id': p.id,
+            'name': p.name,
+            'description': p.description,
+            'price': str(p.price),
+            'category': p.category,
+            'stock_quantity': p.stock_quantity
         }
 
     def _save_products(self):
 
-        products_data = {
-            p.id: {
-                'id': p.id,
-                'name': p.name,
-                'description': p.description,
-                'price': str(p.price),
-                'category': p.category,
-                'stock_quantity': p.stock_quantity
-            }
-            for p in self._products.values()
-        }
-        self._storage.save_data('products', products_data)
\ No newline at end of file
+        if self._lazy:
+            # Yalnızca değişen kayıtlar yeniden serileştirilir; diğerleri dosyadan olduğu gibi kopyalanır.
+            self._products.save(self._record)
+            return
+        # Katalog dosyası yeniden okunup yalnızca bu süreçte eklenen, değişen ya da silinen ürünler yazılır
+        # (kirli ürün yoksa tüm ürünler); başka süreçlerin eklediği ürünler korunur.
+        product_ids = list(self._dirty) or list(self._products)
+
+        def merge(products_data):
+            for product_id in product_ids:
+                product = self._products.get(product_id)
+                if product is None:
+                    products_data.pop(product_id, None)
+                else:
+                    products_data[product_id] = self._record(product)
+            return True
+
+        self._storage.update('products', merge, default={})
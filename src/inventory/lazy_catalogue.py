@@ -0,0 +1,294 @@
+import json
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from contextlib import nullcontext
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.data.cache import stat_signature
+from src.data.serializers import JsonCodec
+from src.data.storage import JsonStorage
+from src.models.product import Product
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_codec = JsonCodec()
+
+
+def scan_offsets(raw: bytes) -> Tuple[List[str], array]:
+    """
+    Bir JSON nesnesi dosyasındaki her kaydın anahtarını ve değerinin (başlangıç, uzunluk) bayt
+    aralığını döner. Değerler Product nesnesine çevrilmez; yalnızca sınırları bulunur.
+    """
+    # latin-1 her baytı tek bir karaktere çevirir; böylece karakter konumları bayt konumlarıyla aynı kalır.
+    text = raw.decode("latin-1")
+    ids: List[str] = []
+    spans = array('q')
+
+    def skip(pos: int) -> int:
+        return _WHITESPACE.match(text, pos).end()
+
+    def expect(pos: int, char: str) -> int:
+        if text[pos:pos + 1] != char:
+            raise ValueError(f"Expected '{char}' at offset {pos}")
+        return skip(pos + 1)
+
+    pos = expect(skip(0), "{")
+    if text[pos:pos + 1] == "}":
+        return ids, spans
+    while True:
+        _, end = _decoder.raw_decode(text, pos)
+        # Anahtar UTF-8 baytlarından çözülür (latin-1 metinde ASCII dışı karakterler bozuk görünür).
+        ids.append(json.loads(raw[pos:end]))
+        start = expect(skip(end), ":")
+        _, end = _decoder.raw_decode(text, start)
+        spans.extend((start, end - start))
+        pos = skip(end)
+        if text[pos:pos + 1] == "}":
+            return ids, spans
+        pos = expect(pos, ",")
+
+
+class LazyCatalogue:
+    """
+    Ürün kataloğunu (products.json) açılışta ayrıştırmak yerine yalnızca ürün ID'si -> dosyadaki
+    bayt aralığı indeksini yükler; Product nesneleri ilk erişimde tek kaydın baytları okunarak kurulur
+    ve en çok cache_size ürün tutan bir LRU önbellekte saklanır.
+
+    Aralık indeksi dosyanın yanında (<ad>.offsets.json) saklanır ve dosyanın mtime/boyut/inode
+    imzasıyla doğrulanır; imza tutmazsa dosya bir kez taranıp indeks yeniden yazılır.
+
+    Eklenen ya da değiştirilen ürünler kaydedilene kadar önbellekten bağımsız olarak sabitlenir
+    (pinned), böylece önbellekten düşen bir ürünün değişikliği kaybolmaz. save() dosyayı yeniden yazarken
+    değişmeyen kayıtların baytlarını olduğu gibi kopyalar. Stok miktarının güncel değeri stok defterindedir;
+    değişmeyen kayıtlardaki stok alanı eski kalabilir. Dosya bu arada başka bir süreç tarafından yeniden
+    yazıldıysa save() önce onun sürümünü okur ve yalnızca bu nesnedeki eklemeleri, değişiklikleri ve silmeleri
+    üzerine uygular (paylaşımlı depoda dosya kilidi altında).
+
+    Sözlük gibi kullanılır (get, in, [], len, values); values() ürünleri önbelleğe almadan tek tek kurar.
+    """
+
+    def __init__(self, storage: JsonStorage, loader: Callable[[Dict[str, Any]], Product],
+                 filename: str = "products", cache_size: int = 1024):
+        self._storage = storage
+        self._loader = loader
+        self.filename = filename
+        self.cache_size = cache_size
+        self._path = os.path.join(storage.data_dir, f"{filename}.json")
+        self._lock = threading.RLock()
+        self._ids: List[str] = []  # dosyadaki sıraya göre; silinen ürünler kaydedilene kadar yerinde kalır
+        self._spans = array('q')  # satır başına (başlangıç, uzunluk)
+        self._rows: Dict[str, int] = {}  # ürün ID'si -> satır (silinen ürünler çıkarılır)
+        self._cache: "OrderedDict[str, Product]" = OrderedDict()
+        self._pinned: Dict[str, Product] = {}  # kaydedilmemiş eklemeler ve değişiklikler
+        self._deleted: Set[str] = set()  # kaydedilmemiş silmeler
+        self._signature: Optional[Tuple] = None  # indekslenen dosyanın imzası
+        self._file = None
+        self._open()
+
+    # Aralık indeksi
+    def _index_path(self) -> str:
+        return os.path.join(self._storage.data_dir, f"{self.filename}.offsets.json")
+
+    def _open(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        signature = stat_signature([self._path])
+        self._signature = signature[0] if signature else None
+        if signature is None:
+            self._set_index([], array('q'))
+            return
+        self._file = open(self._path, "rb")
+        index = self._read_index()
+        if index is not None and tuple(index["signature"]) == signature[0]:
+            self._set_index(index["ids"], array('q', index["spans"]))
+            return
+        self._file.seek(0)
+        ids, spans = scan_offsets(self._file.read())
+        self._set_index(ids, spans)
+        self._write_index(signature[0])
+
+    def _read_index(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._index_path(), "rb") as file:
+                return json.loads(file.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write_index(self, signature: Tuple) -> None:
+        index = {"signature": list(signature), "ids": self._ids, "spans": self._spans.tolist()}
+        self._storage.save_raw(f"{self.filename}.offsets", _codec.dumps(index))
+
+    def _set_index(self, ids: List[str], spans: array) -> None:
+        self._ids = ids
+        self._spans = spans
+        self._rows = {product_id: row for row, product_id in enumerate(ids)}
+
+    # Okuma
+    def _read_record(self, row: int) -> Dict[str, Any]:
+        start, length = self._spans[2 * row], self._spans[2 * row + 1]
+        self._file.seek(start)
+        return json.loads(self._file.read(length))
+
+    def _find(self, product_id: str, cache: bool) -> Optional[Product]:
+        with self._lock:
+            product = self._pinned.get(product_id)
+            if product is not None:
+                return product
+            product = self._cache.get(product_id)
+            if product is not None:
+                self._cache.move_to_end(product_id)
+                return product
+            row = self._rows.get(product_id)
+            if row is None:
+                return None
+            product = self._loader(self._read_record(row))
+            if cache:
+                self._cache[product_id] = product
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            return product
+
+    def get(self, product_id: str, default: Optional[Product] = None) -> Optional[Product]:
+        product = self._find(product_id, cache=True)
+        return default if product is None else product
+
+    def __getitem__(self, product_id: str) -> Product:
+        product = self._find(product_id, cache=True)
+        if product is None:
+            raise KeyError(product_id)
+        return product
+
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self._pinned or product_id in self._rows
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows) + sum(1 for product_id in self._pinned if product_id not in self._rows)
+
+    def _live_ids(self) -> Iterator[str]:
+        # Sıra: dosyadaki kayıtlar, ardından henüz kaydedilmemiş yeni ürünler.
+        with self._lock:
+            ids, rows, pinned = list(self._ids), self._rows, list(self._pinned)
+        for row, product_id in enumerate(ids):
+            if rows.get(product_id) == row:
+                yield product_id
+        for product_id in pinned:
+            if product_id not in rows:
+                yield product_id
+
+    def __iter__(self) -> Iterator[str]:
+        return self._live_ids()
+
+    def values(self) -> Iterator[Product]:
+        """Tüm ürünleri sırayla üretir; önbellekte olmayanlar önbelleğe alınmaz."""
+        for product_id in self._live_ids():
+            product = self._find(product_id, cache=False)
+            if product is not None:
+                yield product
+
+    def records(self, product_ids: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Verilen ürünlerin dosyadaki ham kayıtları; Product nesnesi kurulmaz, önbelleğe alınmaz."""
+        for product_id in product_ids:
+            with self._lock:
+                row = self._rows.get(product_id)
+                record = None if row is None else self._read_record(row)
+            if record is not None:
+                yield record
+
+    def page(self, start: int, count: int) -> List[Product]:
+        """Dosya sırasına göre start'tan başlayan en çok count ürün."""
+        return [product for product in (self.get(product_id) for product_id in
+                                        islice(self._live_ids(), start, start + count)) if product is not None]
+
+    # Yazma
+    def __setitem__(self, product_id: str, product: Product) -> None:
+        with self._lock:
+            self._cache.pop(product_id, None)
+            self._deleted.discard(product_id)
+            self._pinned[product_id] = product
+
+    def __delitem__(self, product_id: str) -> None:
+        with self._lock:
+            if product_id not in self:
+                raise KeyError(product_id)
+            self._pinned.pop(product_id, None)
+            self._cache.pop(product_id, None)
+            self._rows.pop(product_id, None)
+            self._deleted.add(product_id)
+
+    def save(self, to_record: Callable[[Product], Dict[str, Any]]) -> None:
+        """
+        Kataloğu yeniden yazar: değişmeyen kayıtlar eski dosyadan bayt olarak kopyalanır, sabitlenmiş
+        ürünler to_record ile yeniden serileştirilir, silinenler atlanır. Yeni aralık indeksi yazma sırasında
+        hesaplanır; dosyanın yeniden taranması gerekmez.
+        """
+        shared = self._storage.shared
+        with self._lock, self._storage._file_lock(self.filename) if shared else nullcontext():
+            signature = stat_signature([self._path])
+            if (signature[0] if signature else None) != self._signature:
+                # Dosya başka bir süreç tarafından yeniden yazılmış: onun sürümü indekslenir ve bu nesnedeki
+                # silmeler yeniden uygulanır; sabitlenmiş ürünler zaten ayrı tutulur.
+                self._open()
+                self._cache.clear()
+                for product_id in self._deleted:
+                    self._rows.pop(product_id, None)
+            old = b""
+            if self._file is not None:
+                self._file.seek(0)
+                old = self._file.read()
+                # Açık dosya yeniden adlandırmayı bazı platformlarda (Windows) engeller.
+                self._file.close()
+                self._file = None
+            pieces = [b"{"]
+            position = 1
+            ids: List[str] = []
+            spans = array('q')
+
+            def emit(product_id: str, body: bytes) -> None:
+                nonlocal position
+                key = (b"," if ids else b"") + _codec.dumps(product_id) + b":"
+                pieces.append(key)
+                position += len(key)
+                ids.append(product_id)
+                spans.extend((position, len(body)))
+                pieces.append(body)
+                position += len(body)
+
+            for row, product_id in enumerate(self._ids):
+                if self._rows.get(product_id) != row:
+                    continue
+                product = self._pinned.get(product_id)
+                if product is not None:
+                    emit(product_id, _codec.dumps(to_record(product)))
+                else:
+                    start, length = self._spans[2 * row], self._spans[2 * row + 1]
+                    emit(product_id, old[start:start + length])
+            for product_id, product in self._pinned.items():
+                if product_id not in self._rows:
+                    emit(product_id, _codec.dumps(to_record(product)))
+            pieces.append(b"}")
+            del old
+
+            self._storage.save_raw(self.filename, b"".join(pieces))
+            self._file = open(self._path, "rb")
+            self._set_index(ids, spans)
+            self._signature = stat_signature([self._path])[0]
+            self._write_index(self._signature)
+            self._deleted.clear()
+            # Kaydedilen ürünler artık dosyada; sabitlenmiş nesneler önbelleğe geri alınır.
+            for product_id, product in self._pinned.items():
+                self._cache[product_id] = product
+            self._pinned.clear()
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,133 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.models.product import Product
+
+
+class _SortedIndex:
+    """(değer, ürün ID'si) çiftlerinden oluşan sıralı liste; aralık sorguları ikili arama ile yapılır."""
+
+    def __init__(self):
+        self._entries: List[Tuple[Any, str]] = []
+
+    def build(self, entries: List[Tuple[Any, str]]) -> None:
+        self._entries = sorted(entries)
+
+    def add(self, value: Any, product_id: str) -> None:
+        insort(self._entries, (value, product_id))
+
+    def remove(self, value: Any, product_id: str) -> None:
+        position = bisect_left(self._entries, (value, product_id))
+        if position < len(self._entries) and self._entries[position] == (value, product_id):
+            del self._entries[position]
+
+    def range(self, low: Any = None, high: Any = None) -> List[str]:
+        """low <= değer <= high olan ürün ID'lerini değere göre sıralı döner (sınırlar isteğe bağlı)."""
+        start = 0 if low is None else bisect_left(self._entries, (low,))
+        # (high, en büyük karakter) değeri high olan tüm girdilerin ardından gelir.
+        end = len(self._entries) if high is None else bisect_right(self._entries, (high, "\U0010ffff"))
+        return [product_id for _, product_id in self._entries[start:end]]
+
+
+class ProductIndex:
+    """
+    Ürünler için artımlı (incremental) ikincil indeksler:
+    kategori -> ID kümesi, fiyata göre sıralı indeks ve stoğa göre sıralı indeks.
+    Ekleme, silme ve güncellemeler yalnızca ilgili girdileri değiştirir; tüm katalog yeniden taranmaz.
+    Tüm işlemler kısa bir iç kilit altında yapılır; farklı iş parçacıklarından güvenle çağrılabilir.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._categories: Dict[str, Set[str]] = {}
+        self._prices = _SortedIndex()
+        self._stocks = _SortedIndex()
+        # ürün ID'si -> indekslenmiş (kategori, fiyat, stok); eski girdileri bulmak için
+        self._entries: Dict[str, Tuple[str, Decimal, int]] = {}
+
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self._entries
+
+    def rebuild(self, products: Iterable[Product]) -> None:
+        """İndeksleri toplu olarak yeniden kurar; her liste tek seferde sıralanır."""
+        with self._lock:
+            self._categories = {}
+            self._entries = {}
+            for product in products:
+                self._entries[product.id] = (product.category, product.price, product.stock_quantity)
+                self._categories.setdefault(product.category, set()).add(product.id)
+            self._prices.build([(price, pid) for pid, (_, price, _) in self._entries.items()])
+            self._stocks.build([(stock, pid) for pid, (_, _, stock) in self._entries.items()])
+
+    def add(self, product: Product) -> None:
+        with self._lock:
+            if product.id in self._entries:
+                self.update(product)
+                return
+            self._entries[product.id] = (product.category, product.price, product.stock_quantity)
+            self._categories.setdefault(product.category, set()).add(product.id)
+            self._prices.add(product.price, product.id)
+            self._stocks.add(product.stock_quantity, product.id)
+
+    def remove(self, product_id: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(product_id, None)
+            if entry is None:
+                return
+            category, price, stock = entry
+            ids = self._categories.get(category)
+            if ids is not None:
+                ids.discard(product_id)
+                if not ids:
+                    del self._categories[category]
+            self._prices.remove(price, product_id)
+            self._stocks.remove(stock, product_id)
+
+    def update(self, product: Product) -> None:
+        """Ürünün kategori, fiyat ve stok girdilerini yalnızca değişenler için yeniler."""
+        with self._lock:
+            entry = self._entries.get(product.id)
+            if entry is None:
+                self.add(product)
+                return
+            category, price, stock = entry
+            if category != product.category:
+                ids = self._categories[category]
+                ids.discard(product.id)
+                if not ids:
+                    del self._categories[category]
+                self._categories.setdefault(product.category, set()).add(product.id)
+            if price != product.price:
+                self._prices.remove(price, product.id)
+                self._prices.add(product.price, product.id)
+            if stock != product.stock_quantity:
+                self._stocks.remove(stock, product.id)
+                self._stocks.add(product.stock_quantity, product.id)
+            self._entries[product.id] = (product.category, product.price, product.stock_quantity)
+
+    def update_stock(self, product_id: str, quantity: int) -> None:
+        with self._lock:
+            entry = self._entries.get(product_id)
+            if entry is None or entry[2] == quantity:
+                return
+            self._stocks.remove(entry[2], product_id)
+            self._stocks.add(quantity, product_id)
+            self._entries[product_id] = (entry[0], entry[1], quantity)
+
+    def by_category(self, category: str) -> Set[str]:
+        with self._lock:
+            return set(self._categories.get(category, ()))
+
+    def categories(self) -> List[str]:
+        with self._lock:
+            return sorted(self._categories)
+
+    def by_price(self, min_price: Optional[Decimal] = None, max_price: Optional[Decimal] = None) -> List[str]:
+        with self._lock:
+            return self._prices.range(min_price, max_price)
+
+    def by_stock(self, min_quantity: Optional[int] = None, max_quantity: Optional[int] = None) -> List[str]:
+        with self._lock:
+            return self._stocks.range(min_quantity, max_quantity)
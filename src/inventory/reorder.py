@@ -0,0 +1,100 @@
+import heapq
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+LOW_STOCK = "low_stock"
+STOCK_REPLENISHED = "stock_replenished"
+
+
+class ReorderMonitor:
+    """
+    Ürün ya da kategori bazlı yeniden sipariş eşiklerini ve şu anda eşiğin altında (ya da eşitinde)
+    kalan ürünleri izler. Ürün eşiği kategori eşiğinden önceliklidir.
+    Stok her değiştiğinde yalnızca o ürün değerlendirilir; eşik altındaki ürünler ayrı bir sözlükte
+    tutulduğundan listelemek O(k)'dır (k = eşik altındaki ürün sayısı).
+
+    Aciliyet sırası için eşik altındaki ürünler ayrıca stok/eşik oranına göre bir min-heap'te tutulur.
+    Değişen ürünün eski girdisi heap'ten silinmez, yeni girdi eklenir; sözlükteki güncel değerle
+    uyuşmayan girdiler okunurken atlanır (tembel geçersizleştirme). Eskiyen girdiler canlı olanları
+    belirgin biçimde aştığında heap sözlükten yeniden kurulur.
+    """
+    # Yeniden kurma için asgari eskimiş girdi sayısı
+    COMPACT_MIN_STALE = 1024
+
+    def __init__(self, product_thresholds: Optional[Dict[str, int]] = None,
+                 category_thresholds: Optional[Dict[str, int]] = None):
+        self._lock = threading.Lock()
+        self.product_thresholds: Dict[str, int] = dict(product_thresholds or {})
+        self.category_thresholds: Dict[str, int] = dict(category_thresholds or {})
+        self._below: Dict[str, Tuple[int, int]] = {}  # ürün ID'si -> (stok, eşik)
+        self._heap: List[Tuple[float, str, int, int]] = []  # (stok/eşik oranı, ürün ID'si, stok, eşik)
+
+    def threshold_for(self, product_id: str, category: str) -> Optional[int]:
+        threshold = self.product_thresholds.get(product_id)
+        if threshold is None:
+            threshold = self.category_thresholds.get(category)
+        return threshold
+
+    def update(self, product_id: str, category: str, stock: int) -> Optional[Tuple[str, int]]:
+        """
+        Ürünün yeni stoğunu değerlendirir. Eşik aşıldıysa (olay türü, eşik) döner:
+        stok eşiğe indiğinde LOW_STOCK, yeniden eşiğin üstüne çıktığında STOCK_REPLENISHED.
+        """
+        threshold = self.threshold_for(product_id, category)
+        with self._lock:
+            was_below = product_id in self._below
+            if threshold is not None and stock <= threshold:
+                if self._below.get(product_id) != (stock, threshold):
+                    self._below[product_id] = (stock, threshold)
+                    self._push(product_id, stock, threshold)
+                return None if was_below else (LOW_STOCK, threshold)
+            if was_below:
+                _, old_threshold = self._below.pop(product_id)
+                # Eşik kaldırıldıysa bu bir stok girişi değildir; olay üretilmez.
+                return (STOCK_REPLENISHED, old_threshold) if threshold is not None else None
+            return None
+
+    def forget(self, product_id: str) -> None:
+        with self._lock:
+            self._below.pop(product_id, None)
+
+    def below(self) -> Dict[str, Tuple[int, int]]:
+        """Eşiğin altındaki ürünler: ürün ID'si -> (stok, eşik)."""
+        with self._lock:
+            return dict(self._below)
+
+    def most_urgent(self, count: int) -> List[str]:
+        """
+        Eşik altındaki ürünlerden stok/eşik oranı en düşük (eşiğin en çok altında) olan count tanesi,
+        en aciliyle başlayarak. O(count log n) sürer; atlanan eskimiş girdiler heap'ten kalıcı olarak çıkar.
+        """
+        with self._lock:
+            valid = []
+            seen = set()
+            while self._heap and len(valid) < count:
+                entry = heapq.heappop(self._heap)
+                _, product_id, stock, threshold = entry
+                if product_id in seen or self._below.get(product_id) != (stock, threshold):
+                    continue
+                seen.add(product_id)
+                valid.append(entry)
+            for entry in valid:
+                heapq.heappush(self._heap, entry)
+            return [entry[1] for entry in valid]
+
+    def _push(self, product_id: str, stock: int, threshold: int) -> None:
+        # Kilit altında çağrılır.
+        heapq.heappush(self._heap, (_ratio(stock, threshold), product_id, stock, threshold))
+        stale = len(self._heap) - len(self._below)
+        if stale > self.COMPACT_MIN_STALE and stale > len(self._below):
+            self._heap = [(_ratio(*value), pid) + value for pid, value in self._below.items()]
+            heapq.heapify(self._heap)
+
+    def to_dict(self) -> Dict[str, Dict[str, int]]:
+        return {"products": dict(self.product_thresholds), "categories": dict(self.category_thresholds)}
+
+
+def _ratio(stock: int, threshold: int) -> float:
+    # Eşiği 0 (ya da negatif) olan ürün ancak stoğu tükenince eşik altındadır; en acil sayılır.
+    return stock / threshold if threshold > 0 else -math.inf
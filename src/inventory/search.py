@@ -0,0 +1,119 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional
+
+from src.models.product import Product
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Metni küçük harfe çevirip kelimelere böler (Türkçe karakterler dahil)."""
+    # casefold() 'İ' harfini 'i' + birleşik nokta yapar; önce düz 'i' harfine çevrilir.
+    return _TOKEN.findall((text or "").replace("İ", "i").casefold())
+
+
+class ProductSearchIndex:
+    """
+    Ürün adı, açıklaması ve kategorisi üzerinde ters indeks (inverted index).
+    Her kelime -> {ürün ID'si: ağırlık} eşlemesi tutulur; kelimeler ayrıca sıralı bir listede
+    saklandığından önek (prefix) araması ikili arama ile yapılır. Ürün değiştiğinde yalnızca
+    o ürünün kelimeleri güncellenir.
+    """
+
+    # Alan ağırlıkları: ad eşleşmesi açıklama eşleşmesinden daha değerlidir.
+    FIELD_WEIGHTS = (('name', 3), ('category', 2), ('description', 1))
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._terms: List[str] = []  # sıralı, tekil kelimeler
+        self._documents: Dict[str, Dict[str, int]] = {}  # ürün ID'si -> {kelime: ağırlık}
+
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self._documents
+
+    @classmethod
+    def _weights(cls, product: Product) -> Dict[str, int]:
+        weights: Dict[str, int] = {}
+        for field, weight in cls.FIELD_WEIGHTS:
+            for token in tokenize(getattr(product, field)):
+                weights[token] = weights.get(token, 0) + weight
+        return weights
+
+    def rebuild(self, products: Iterable[Product]) -> None:
+        self._postings = {}
+        self._documents = {}
+        for product in products:
+            weights = self._weights(product)
+            self._documents[product.id] = weights
+            for token, weight in weights.items():
+                self._postings.setdefault(token, {})[product.id] = weight
+        self._terms = sorted(self._postings)
+
+    def add(self, product: Product) -> None:
+        """Ürünü indekse ekler; zaten varsa kelimelerini günceller."""
+        old = self._documents.get(product.id, {})
+        new = self._weights(product)
+        if old == new:
+            return
+        for token in old.keys() - new.keys():
+            self._unpost(token, product.id)
+        for token, weight in new.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                insort(self._terms, token)
+            postings[product.id] = weight
+        self._documents[product.id] = new
+
+    def remove(self, product_id: str) -> None:
+        for token in self._documents.pop(product_id, {}):
+            self._unpost(token, product_id)
+
+    def _unpost(self, token: str, product_id: str) -> None:
+        postings = self._postings.get(token)
+        if postings is None:
+            return
+        postings.pop(product_id, None)
+        if not postings:
+            del self._postings[token]
+            position = bisect_left(self._terms, token)
+            if position < len(self._terms) and self._terms[position] == token:
+                del self._terms[position]
+
+    def _expand(self, prefix: str) -> List[str]:
+        """prefix ile başlayan tüm kelimeler."""
+        start = bisect_left(self._terms, prefix)
+        end = bisect_left(self._terms, prefix + "\U0010ffff", start)
+        return self._terms[start:end]
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Sorgudaki her kelimeyi önek olarak eşleştirir ve hepsini içeren ürünlerin ID'lerini
+        puana göre azalan sırada döner. Tam kelime eşleşmeleri önek eşleşmelerinden önce gelir.
+        Boş sorgu boş liste döner.
+        """
+        scores: Optional[Dict[str, int]] = None
+        for term in dict.fromkeys(tokenize(query)):
+            term_scores: Dict[str, int] = {}
+            for token in self._expand(term):
+                # Tam eşleşme önek eşleşmesinin iki katı sayılır.
+                factor = 2 if token == term else 1
+                get = term_scores.get
+                for product_id, weight in self._postings[token].items():
+                    score = weight * factor
+                    if score > get(product_id, 0):
+                        term_scores[product_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {pid: score + term_scores[pid] for pid, score in scores.items() if pid in term_scores}
+            if not scores:
+                return []
+        if scores is None:
+            return []
+        key = lambda pid: (-scores[pid], pid)
+        if limit is not None:
+            return heapq.nsmallest(limit, scores, key=key)
+        return sorted(scores, key=key)
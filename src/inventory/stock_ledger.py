@@ -0,0 +1,294 @@
+import itertools
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.data.collection_names import STOCK_SLOTS
+from src.data.locking import InterProcessLock, StripedLock, lock_range, supports_range_locks, unlock_range
+from src.data.stock_ledger_file import (GENERATION_OFFSET as _GENERATION_OFFSET, HEADER_SIZE as _HEADER_SIZE,
+                                        MAGIC as _MAGIC, SLOT as _SLOT)
+
+_INITIAL_SLOTS = 64
+
+
+class StockLedger:
+    """
+    Stok miktarlarını sabit genişlikli ikili bir dosyada tutar.
+    Her ürün bir slota (8 baytlık işaretli tamsayı) sahiptir; dosya belleğe eşlenir (mmap)
+    ve stok değişikliği yalnızca o slotun yerinde güncellenmesidir.
+    Ürün -> slot eşlemesi yalnızca ürün eklenip silindiğinde değişir ve ayrı bir JSON koleksiyonunda saklanır;
+    eşleme her değişiklikte defterin süreçler arası kilidi altında depodan yeniden okunup yazılır, böylece aynı
+    defteri kullanan süreçler aynı slotu iki farklı ürüne vermez. Yeni bir slotun başlangıç miktarı slot
+    eşlemede yayımlanmadan önce yazılır.
+
+    Her süreç eşlemeyi önbellekte tutar. Silinen ürünün slotu boşaltılıp başka bir ürüne verilebileceğinden
+    boşaltma, dosya başlığındaki nesil sayacını slotun bayt aralığı kilidi altında artırır. Stok değişiklikleri
+    slot kilitlerini aldıktan sonra sayacı kontrol eder; sayaç değişmişse eşleme depodan yeniden okunur ve
+    kilitler yeniden alınır. Böylece eski eşlemeyle başka bir ürünün slotuna yazılmaz.
+
+    Okumalar (get) kilit almaz; okunan değer sayaç okumadan önce ve sonra aynıysa geçerlidir. Stok değişiklikleri ürün ID'sine göre şeritlenmiş kilitlerle
+    sıralanır; süreçler arasında yalnızca ilgili slotun bayt aralığı kilitlenir, böylece farklı
+    ürünlere yapılan değişiklikler birbirini beklemez.
+    """
+    SLOTS_COLLECTION = STOCK_SLOTS
+
+    def __init__(self, path: str, storage, stripes: int = 64):
+        self.path = path
+        self._storage = storage
+        self._lock = threading.Lock()  # slot eşlemesi ve dosya büyütme için
+        self._stripes = StripedLock(stripes)  # stripes=1 tüm stok değişikliklerini tek kilitte sıralar
+        # Bayt aralığı kilidi olmayan platformlarda oku-kontrol et-yaz adımları tüm defter kilitlenerek yapılır.
+        self._process_lock = InterProcessLock(path + ".lock")
+        self._open()
+        self._refresh_lock = threading.Lock()  # önbellekteki eşleme ile okunduğu neslin birlikte değişmesi için
+        self._generation = -1  # önbellekteki eşlemenin okunduğu nesil
+        self._slots: Dict[str, int] = {}
+        self._refresh_slots()
+
+    def _open(self):
+        with self._process_lock:
+            if not os.path.exists(self.path) or os.path.getsize(self.path) < _HEADER_SIZE:
+                with open(self.path, "wb") as file:
+                    file.write(_MAGIC.ljust(_HEADER_SIZE, b"\0"))
+                    file.write(b"\0" * (_SLOT.size * _INITIAL_SLOTS))
+                # Eşleme dosyası ile ledger birlikte yeniden kurulmalıdır.
+                self._storage.save_data(self.SLOTS_COLLECTION, {})
+        self._file = open(self.path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        if self._mm[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"Invalid stock ledger file: {self.path}")
+        self._capacity = (len(self._mm) - _HEADER_SIZE) // _SLOT.size
+
+    def _ensure_capacity(self, slot: int) -> None:
+        """Dosyayı ve eşlemeyi slot'u içerecek kadar büyütür (başka bir süreç büyütmüşse yalnızca yeniden eşler)."""
+        if slot < self._capacity:
+            return
+        with self._process_lock:
+            capacity = (os.fstat(self._file.fileno()).st_size - _HEADER_SIZE) // _SLOT.size
+            if capacity <= slot:
+                capacity = max(capacity * 2, slot + 1)
+                self._file.truncate(_HEADER_SIZE + capacity * _SLOT.size)
+            # Eski eşleme kapatılmaz: kilitsiz okuyucular onu kullanıyor olabilir ve aynı dosyayı gösterdiği
+            # için üzerinden yapılan yazmalar kaybolmaz; son referans bırakıldığında kendiliğinden kapanır.
+            self._mm = mmap.mmap(self._file.fileno(), 0)
+            self._capacity = capacity
+
+    def _claim(self, seeds: Dict[str, int]) -> Dict[str, int]:
+        """
+        Defterde olmayan ürünlere slot ayırır, başlangıç miktarlarını (seeds) yazar ve yeni ayrılan
+        ürünlerin ID'si -> slot eşlemesini döner. Eşleme defterin süreçler arası kilidi altında depodan
+        yeniden okunur: ürün başka bir süreç tarafından eklenmişse onun slotu kullanılır. Miktar, slot
+        eşleme dosyasında yayımlanmadan önce yazılır; slotu gören bir süreç onu hiçbir zaman boş okumaz,
+        aynı anda slot ayıran süreçler ise kilidi bekler. Çağıran self._lock'u tutmalıdır.
+        """
+        with self._process_lock:
+            slots = dict(self._storage.load_data(self.SLOTS_COLLECTION, default={}))
+            used = set(slots.values())
+            free = (index for index in itertools.count() if index not in used)
+            claimed = {product_id: next(free) for product_id in seeds if product_id not in slots}
+            slots.update(claimed)
+            # Başka süreçlerin ayırdığı slotlar da bu eşlemenin kapsamına girmelidir.
+            self._ensure_capacity(max(slots.values(), default=-1))
+            if claimed:
+                for product_id, slot in claimed.items():
+                    _SLOT.pack_into(self._mm, self._offset(slot), seeds[product_id])
+
+                def publish(current):
+                    current.update(claimed)
+                    return True
+
+                self._storage.update(self.SLOTS_COLLECTION, publish, default={})
+            with self._refresh_lock:
+                # Sayaç yalnızca süreçler arası kilit altında artar; okunan eşleme bu neslin eşlemesidir.
+                self._slots, self._generation = slots, self._current_generation()
+            return claimed
+
+    @staticmethod
+    def _offset(slot: int) -> int:
+        return _HEADER_SIZE + slot * _SLOT.size
+
+    def _current_generation(self) -> int:
+        return _SLOT.unpack_from(self._mm, _GENERATION_OFFSET)[0]
+
+    def _refresh_slots(self) -> None:
+        """Başka bir süreç slot boşalttıysa (nesil sayacı değiştiyse) eşlemeyi depodan yeniden okur."""
+        if self._current_generation() == self._generation:
+            return
+        with self._refresh_lock:
+            # Sayaç eşlemeden önce okunur: boşaltan süreç eşlemeyi sayacı artırmadan önce yazar.
+            generation = self._current_generation()
+            if generation == self._generation:
+                return
+            slots = dict(self._storage.load_data(self.SLOTS_COLLECTION, default={}))
+            self._ensure_capacity(max(slots.values(), default=-1))
+            self._slots, self._generation = slots, generation
+
+    @contextmanager
+    def _locked_slots(self, product_ids: Iterable[str]):
+        """
+        Ürünlerin slotlarını (defterde olmayanlar için None) bayt aralığı kilitleri altında verir.
+        Kilitler alındıktan sonra nesil sayacı değişmişse eşleme yenilenir ve kilitler yeniden alınır.
+        """
+        product_ids = list(product_ids)
+        while True:
+            self._refresh_slots()
+            generation = self._generation
+            slots = {product_id: self._slots.get(product_id) for product_id in product_ids}
+            with self._guard_slots(slot for slot in slots.values() if slot is not None):
+                if self._current_generation() == generation:
+                    yield slots
+                    return
+
+    def __contains__(self, product_id: str) -> bool:
+        self._refresh_slots()
+        return product_id in self._slots
+
+    def hold(self, *product_ids: str):
+        """
+        Verilen ürünlerin şerit kilitlerini tutan bağlam yöneticisi. Stok okuma ve yazmasını
+        başka bir durumla (ör. bellekteki ürün nesnesi) birlikte atomik yapmak isteyen çağıranlar içindir.
+        """
+        return self._stripes.hold(*product_ids)
+
+    @contextmanager
+    def _guard_slots(self, slots: Iterable[int]):
+        """Slotların bayt aralıklarını süreçler arası kilitler; kilitler artan slot sırasıyla alınır."""
+        if not supports_range_locks():
+            with self._process_lock:
+                yield
+            return
+        fd = self._file.fileno()
+        locked: List[int] = []
+        try:
+            for slot in sorted(set(slots)):
+                lock_range(fd, self._offset(slot), _SLOT.size)
+                locked.append(slot)
+            yield
+        finally:
+            for slot in reversed(locked):
+                unlock_range(fd, self._offset(slot), _SLOT.size)
+
+    def get(self, product_id: str) -> Optional[int]:
+        while True:
+            self._refresh_slots()
+            generation = self._generation
+            slot = self._slots.get(product_id)
+            if slot is None:
+                return None
+            quantity = _SLOT.unpack_from(self._mm, self._offset(slot))[0]
+            if self._current_generation() == generation:
+                return quantity
+
+    def set(self, product_id: str, quantity: int) -> None:
+        with self._stripes.hold(product_id):
+            with self._locked_slots([product_id]) as slots:
+                slot = slots[product_id]
+                if slot is not None:
+                    _SLOT.pack_into(self._mm, self._offset(slot), quantity)
+                    return
+            self.add(product_id, quantity)
+
+    def adjust(self, product_id: str, delta: int) -> Optional[int]:
+        """
+        Stoğu delta kadar değiştirir ve yeni miktarı döner.
+        Sonuç negatif olacaksa ya da ürün yoksa hiçbir şey yazılmaz ve None döner.
+        """
+        with self._stripes.hold(product_id), self._locked_slots([product_id]) as slots:
+            slot = slots[product_id]
+            if slot is None:
+                return None
+            offset = self._offset(slot)
+            quantity = _SLOT.unpack_from(self._mm, offset)[0] + delta
+            if quantity < 0:
+                return None
+            _SLOT.pack_into(self._mm, offset, quantity)
+            return quantity
+
+    def adjust_many(self, deltas: Dict[str, int]) -> Tuple[bool, Dict[str, Optional[int]]]:
+        """
+        Birden çok ürünün stoğunu yalnızca bu ürünlerin kilitleri altında, ya hep ya hiç mantığıyla değiştirir.
+        Her ürün için işlem sonrası miktarı (ürün yoksa None) döner; herhangi biri eksiye
+        düşecekse ya da ürün yoksa hiçbir slot yazılmaz ve ilk değer False olur.
+        """
+        with self._stripes.hold(*deltas):
+            with self._locked_slots(deltas) as slots:
+                results: Dict[str, Optional[int]] = {}
+                for product_id, delta in deltas.items():
+                    slot = slots[product_id]
+                    if slot is None:
+                        results[product_id] = None
+                    else:
+                        results[product_id] = _SLOT.unpack_from(self._mm, self._offset(slot))[0] + delta
+                if any(quantity is None or quantity < 0 for quantity in results.values()):
+                    return False, results
+                for product_id, quantity in results.items():
+                    _SLOT.pack_into(self._mm, self._offset(slots[product_id]), quantity)
+                return True, results
+
+    def add(self, product_id: str, quantity: int) -> None:
+        with self._lock:
+            if product_id not in self and product_id in self._claim({product_id: quantity}):
+                return
+            with self._locked_slots([product_id]) as slots:
+                if slots[product_id] is not None:
+                    _SLOT.pack_into(self._mm, self._offset(slots[product_id]), quantity)
+                    return
+            # Ürün bu arada başka bir süreç tarafından silinmiş.
+            self._claim({product_id: quantity})
+
+    def ensure(self, product_id: str, quantity: int) -> int:
+        """
+        Ürün defterde yoksa quantity ile ekler ve quantity döner. Ürün zaten varsa (başka bir süreç
+        eklemiş olabilir) defterdeki miktar değiştirilmeden döner.
+        """
+        with self._lock:
+            if product_id not in self and product_id in self._claim({product_id: quantity}):
+                return quantity
+            return self.get(product_id)
+
+    def ensure_many(self, quantities: Dict[str, int]) -> Dict[str, int]:
+        """
+        ensure()'un toplu hali: defterde olmayan ürünlerin slotları tek bir eşleme yazmasıyla ayrılır
+        (katalog yükleme ve toplu ekleme için). Ürün ID'si -> defterdeki miktar döner.
+        """
+        with self._lock:
+            self._refresh_slots()
+            missing = {product_id: quantity for product_id, quantity in quantities.items()
+                       if product_id not in self._slots}
+            if missing:
+                self._claim(missing)
+            return {product_id: self.get(product_id) for product_id in quantities}
+
+    def remove(self, product_id: str) -> None:
+        with self._stripes.hold(product_id), self._lock, self._process_lock:
+            result: Dict[str, Any] = {}
+
+            def release(slots):
+                result.update(slot=slots.pop(product_id, None), slots=dict(slots))
+                return result["slot"] is not None
+
+            self._storage.update(self.SLOTS_COLLECTION, release, default={})
+            slot = result["slot"]
+            generation = self._current_generation()
+            if slot is not None:
+                # Eşleme yazıldıktan sonra sayaç, slotu kullanan değişikliklerle aynı kilit altında artırılır;
+                # slot ancak bundan sonra başka bir ürüne verilebilir.
+                self._ensure_capacity(slot)
+                with self._guard_slots([slot]):
+                    generation += 1
+                    _SLOT.pack_into(self._mm, _GENERATION_OFFSET, generation)
+                    _SLOT.pack_into(self._mm, self._offset(slot), 0)
+            with self._refresh_lock:
+                self._slots, self._generation = result["slots"], generation
+
+    def flush(self) -> None:
+        """Değişiklikleri diske zorlar."""
+        self._mm.flush()
+
+    def close(self) -> None:
+        if not self._mm.closed:
+            self._mm.flush()
+            self._mm.close()
+            self._file.close()
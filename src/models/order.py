@@ -1,7 +1,8 @@
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import List
+from collections.abc import Sequence
+from typing import Dict, FrozenSet, List, Optional
 from src.models.product import Product
 from src.shipping.shipping_strategy import ShippingStrategy
 
@@ -13,39 +14,127 @@ class OrderStatus(Enum): #order statuses
     DELIVERED = "delivered"
     CANCELLED = "cancelled"
 
+    def can_transition_to(self, new_status: "OrderStatus") -> bool:
+        """Check if an order in this status may move to new_status (see ORDER_TRANSITIONS)."""
+        return new_status in ORDER_TRANSITIONS[self]
+
+
+# Legal status changes. Orders can be cancelled until they ship; delivered and cancelled are final.
+ORDER_TRANSITIONS: Dict[OrderStatus, FrozenSet[OrderStatus]] = {
+    OrderStatus.CREATED: frozenset({OrderStatus.CONFIRMED, OrderStatus.CANCELLED}),
+    OrderStatus.CONFIRMED: frozenset({OrderStatus.PROCESSING, OrderStatus.CANCELLED}),
+    OrderStatus.PROCESSING: frozenset({OrderStatus.SHIPPED, OrderStatus.CANCELLED}),
+    OrderStatus.SHIPPED: frozenset({OrderStatus.DELIVERED}),
+    OrderStatus.DELIVERED: frozenset(),
+    OrderStatus.CANCELLED: frozenset(),
+}
+
+
+class InvalidStatusTransition(ValueError):
+    """Raised when an order is moved to a status not allowed by ORDER_TRANSITIONS."""
+
+    def __init__(self, current: OrderStatus, new_status: OrderStatus):
+        super().__init__(f"Cannot change order status from {current.value} to {new_status.value}")
+        self.current = current
+        self.new_status = new_status
+
+
 class OrderItem:
-    """Represents an item in an order."""
+    """
+    Represents an item in an order.
+    The line total is kept up to date when quantity or unit price changes,
+    and the owning order's running total is adjusted by the difference.
+    """
+    __slots__ = ('product', '_quantity', '_unit_price', '_total', '_order')
+
     def __init__(self, product: Product, quantity: int, unit_price: Decimal):
         self.product = product
-        self.quantity = quantity
-        self.unit_price = unit_price
+        self._quantity = quantity
+        self._unit_price = unit_price
+        self._total = unit_price * quantity
+        self._order: Optional['Order'] = None
+
+    @property
+    def quantity(self) -> int:
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, quantity: int) -> None:
+        self._quantity = quantity
+        self._retotal()
+
+    @property
+    def unit_price(self) -> Decimal:
+        return self._unit_price
+
+    @unit_price.setter
+    def unit_price(self, unit_price: Decimal) -> None:
+        self._unit_price = unit_price
+        self._retotal()
+
+    def _retotal(self) -> None:
+        total = self._unit_price * self._quantity
+        if self._order is not None:
+            self._order._items_total += total - self._total
+        self._total = total
 
     @property
     def total_price(self) -> Decimal:
-        """Calculate the total price for this order item."""
-        return self.unit_price * self.quantity
+        """Total price for this order item."""
+        return self._total
+
+
+class OrderItems(Sequence):
+    """Read-only view of an order's items; use Order.add_item/remove_item to change them."""
+    __slots__ = ('_items',)
+
+    def __init__(self, items: List[OrderItem]):
+        self._items = items
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return repr(self._items)
+
 
 class Order:
-    """Represents an order in the e-commerce system."""
+    """
+    Represents an order in the e-commerce system.
+    The items total is a running sum maintained by add_item, remove_item and
+    item quantity/price changes, so reading it does not re-sum the items.
+    """
+    __slots__ = ('id', 'customer_id', '_items', '_items_total', 'status', 'creation_date',
+                 'shipping_strategy', 'shipping_address', 'shipping_cost')
+
     def __init__(self,id: str,customer_id: str,shipping_address: str = "",shipping_strategy: ShippingStrategy = None):
         self.id = id
         self.customer_id = customer_id
-        self.items: List[OrderItem] = []
+        self._items: List[OrderItem] = []
+        self._items_total = Decimal('0')
         self.status = OrderStatus.CREATED
         self.creation_date = datetime.now()
         self.shipping_strategy = shipping_strategy
         self.shipping_address = shipping_address
         self.shipping_cost = Decimal('0')
 
+    @property
+    def items(self) -> OrderItems:
+        """Items in the order (read-only)."""
+        return OrderItems(self._items)
+
     @property
     def total_items_price(self) -> Decimal:
-        """Calculate the total price of all items in the order."""
-        return sum(item.total_price for item in self.items)
+        """Total price of all items in the order."""
+        return self._items_total
 
     @property
     def total_price(self) -> Decimal:
-        """Calculate the total price including shipping."""
-        return self.total_items_price + self.shipping_cost
+        """Total price including shipping."""
+        return self._items_total + self.shipping_cost
 
     def add_item(self, product: Product, quantity: int) -> bool:
         """
@@ -55,11 +144,27 @@ class Order:
         if not product.is_available() or product.stock_quantity < quantity:
             return False
 
-        self.items.append(OrderItem(
-            product=product,
-            quantity=quantity,
-            unit_price=product.price
-        ))
+        self.add_reserved_item(product, quantity)
+        return True
+
+    def add_reserved_item(self, product: Product, quantity: int) -> OrderItem:
+        """
+        Add an item whose stock has already been reserved (see InventoryManager.reserve),
+        so availability is not checked again.
+        """
+        item = OrderItem(product=product, quantity=quantity, unit_price=product.price)
+        item._order = self
+        self._items.append(item)
+        self._items_total += item.total_price
+        return item
+
+    def remove_item(self, item: OrderItem) -> bool:
+        """Remove an item from the order. Returns False if the item is not in this order."""
+        if item._order is not self:
+            return False
+        self._items.remove(item)
+        item._order = None
+        self._items_total -= item.total_price
         return True
 
     def set_shipping_strategy(self, strategy: ShippingStrategy) -> None:
@@ -73,6 +178,27 @@ class Order:
 
         self.shipping_cost = self.shipping_strategy.calculate_cost()
 
+    def to_dict(self) -> dict:
+        """Storage record for the order, including its lines (see JsonStorage.add_order)."""
+        return {
+            'id': self.id,
+            'customer_id': self.customer_id,
+            'total_price': str(self.total_price),
+            'shipping_cost': str(self.shipping_cost),
+            'status': self.status.value,
+            'date': self.creation_date.isoformat(),
+            'items': [{
+                'product_id': item.product.id,
+                'quantity': item.quantity,
+                'price': str(item.unit_price)
+            } for item in self._items]
+        }
+
     def update_status(self, new_status: OrderStatus) -> None:
-        """Update the order status."""
+        """
+        Update the order status.
+        Raises InvalidStatusTransition if the change is not allowed by ORDER_TRANSITIONS.
+        """
+        if not self.status.can_transition_to(new_status):
+            raise InvalidStatusTransition(self.status, new_status)
         self.status = new_status
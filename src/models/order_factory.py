@@ -1,11 +1,34 @@
 import uuid
-from typing import List, Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 from src.models.order import Order
 from src.models.product import Product
 from src.models.customer import Customer
-from src.inventory.inventory_manager import InventoryManager
+from src.inventory.inventory_manager import InventoryManager, Reservation
 from src.notifications.notification_service import NotificationService, CustomerNotificationObserver
-from src.shipping.shipping_strategy import ShippingStrategyFactory
+from src.shipping.shipping_strategy import ShippingStrategy, ShippingStrategyFactory
+
+
+class OrderRequest(NamedTuple):
+    """One order in an OrderFactory.create_orders batch."""
+    customer: Customer
+    products: List[Tuple[Product, int]]
+    shipping_type: str
+    shipping_address: str
+
+
+class OrderResult:
+    """
+    Outcome of one OrderRequest: the created order, or the reason it failed.
+    """
+
+    def __init__(self, request: OrderRequest, order: Optional[Order] = None, error: Optional[str] = None):
+        self.request = request
+        self.order = order
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.order is not None
 
 
 class OrderFactory:
@@ -14,10 +37,16 @@ class OrderFactory:
     """
 
     @staticmethod
-    def create_order(customer: Customer, products: List[tuple[Product, int]], shipping_type: str, shipping_address: str) -> Optional[Order]:
+    def create_order(customer: Customer, products: List[tuple[Product, int]], shipping_type: str, shipping_address: str,
+                     reservation: Optional[Reservation] = None) -> Optional[Order]:
         """
         Create a new order with the specified products and shipping details.
         Returns None if the order cannot be created (e.g., insufficient stock).
+
+        If a reservation (e.g. a checkout hold from InventoryManager.reserve(..., ttl=...)) is
+        given, its stock is used instead of reserving again; an expired hold fails the order.
+        The reservation must cover exactly the ordered quantities per product; otherwise the
+        order fails and the hold is left to the caller (to release or reuse).
         """
         # Create a new order with a unique ID
         order_id = str(uuid.uuid4())
@@ -27,10 +56,25 @@ class OrderFactory:
         # Get inventory manager instance
         inventory_manager = InventoryManager()
 
-        # Try to add all products to the order
+        # Reserve stock for all lines at once; nothing is taken if any line fails
+        if reservation is None:
+            reservation = inventory_manager.reserve((product.id, quantity) for product, quantity in products)
+        if not reservation.ok:
+            for product_id, reason in reservation.failures.items():
+                print(f"Cannot reserve product {product_id}: {reason}")
+            return None  # Order creation failed due to insufficient stock
+
+        # A caller's hold must match the order; otherwise items could ship without stock being taken
+        requested: Dict[str, int] = {}
+        for product, quantity in products:
+            requested[product.id] = requested.get(product.id, 0) + quantity
+        if reservation.lines != requested:
+            print(f"Reservation {reservation.id} does not match the ordered products")
+            return None
+
+        # Stock is already validated by the reservation, so items are added directly
         for product, quantity in products:
-            if not order.add_item(product, quantity):
-                return None  # Order creation failed due to insufficient stock
+            order.add_reserved_item(product, quantity)
 
         # Set up shipping strategy
         try:
@@ -39,24 +83,98 @@ class OrderFactory:
             order.calculate_shipping_cost()  # Burada artık parametre yok
         except (ValueError, Exception) as e:
             print(f"Error setting up shipping: {e}")
+            inventory_manager.release(reservation)
             return None
 
-        # Update inventory
-        for item in order.items:
-            inventory_manager.update_stock(item.product.id, -item.quantity)
+        if not inventory_manager.commit(reservation):
+            print(f"Reservation {reservation.id} has expired")
+            return None
 
-        # Set up notification observer for the customer
+        # Notify the customer through the "order_status" event. The observer is detached right after,
+        # so it does not receive later orders' messages or pile up in the shared service.
         notification_service = NotificationService()
         observer = CustomerNotificationObserver(customer)
         notification_service.attach("order_status", observer)
-
-        # Send initial notification
-        notification_service.notify(
-            "order_status",
-            f"Order {order_id} has been created successfully"
-        )
+        try:
+            notification_service.notify("order_status", f"Order {order_id} has been created successfully")
+        finally:
+            notification_service.detach("order_status", observer)
 
         # Add order to customer's history
         customer.add_order(order)
 
         return order
+
+    @staticmethod
+    def create_orders(batch: Iterable[OrderRequest], storage=None) -> List[OrderResult]:
+        """
+        Create many orders at once (marketplace imports, B2B uploads).
+        Returns one OrderResult per request, in the same order.
+
+        Stock for the whole batch is validated and reserved in a single pass
+        (InventoryManager.reserve_many); each order is all-or-nothing and earlier
+        requests win when stock runs out. The stock ledger is flushed once for the batch,
+        and if a storage is given the created orders are saved with one add_orders call.
+        """
+        requests = list(batch)
+        results = [OrderResult(request) for request in requests]
+        inventory_manager = InventoryManager()
+
+        # Shipping strategies are stateless, so one instance per type serves the whole batch
+        strategies: Dict[str, ShippingStrategy] = {}
+        pending = []  # (index, strategy) of requests with a valid shipping type
+        for index, request in enumerate(requests):
+            shipping_type = request.shipping_type.lower()
+            strategy = strategies.get(shipping_type)
+            if strategy is None:
+                try:
+                    strategy = strategies[shipping_type] = ShippingStrategyFactory.get_strategy(shipping_type)
+                except ValueError as e:
+                    results[index].error = f"Error setting up shipping: {e}"
+                    continue
+            pending.append((index, strategy))
+
+        reservations = inventory_manager.reserve_many(
+            [(product.id, quantity) for product, quantity in requests[index].products] for index, _ in pending
+        )
+
+        accepted = []
+        for (index, strategy), reservation in zip(pending, reservations):
+            if not reservation.ok:
+                results[index].error = "; ".join(
+                    f"Cannot reserve product {product_id}: {reason}"
+                    for product_id, reason in reservation.failures.items()
+                )
+                continue
+            request = requests[index]
+            order = Order(id=str(uuid.uuid4()), customer_id=request.customer.id,
+                          shipping_address=request.shipping_address, shipping_strategy=strategy)
+            for product, quantity in request.products:
+                order.add_reserved_item(product, quantity)
+            order.calculate_shipping_cost()
+            results[index].order = order
+            accepted.append(reservation)
+
+        inventory_manager.commit_many(accepted)
+        created = [result for result in results if result.ok]
+        if storage is not None and created:
+            storage.add_orders(result.order.to_dict() for result in created)
+
+        # Each customer's observer is attached to the "order_status" event only while their own
+        # orders are announced, so no customer receives another customer's messages.
+        notification_service = NotificationService()
+        by_customer: Dict[str, List[OrderResult]] = {}
+        for result in created:
+            by_customer.setdefault(result.request.customer.id, []).append(result)
+        for customer_results in by_customer.values():
+            customer = customer_results[0].request.customer
+            observer = CustomerNotificationObserver(customer)
+            notification_service.attach("order_status", observer)
+            try:
+                for result in customer_results:
+                    notification_service.notify("order_status", f"Order {result.order.id} has been created successfully")
+                    customer.add_order(result.order)
+            finally:
+                notification_service.detach("order_status", observer)
+
+        return results
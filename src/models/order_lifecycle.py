@@ -0,0 +1,109 @@
+import threading
+from typing import Any, Dict, List, Optional
+from src.models.order import InvalidStatusTransition, OrderStatus
+
+
+class OrderLifecycle:
+    """
+    Validated order status changes backed by the storage's order status event log.
+
+    Every order added, updated or deleted through the storage appends an event
+    ({'id', 'status', 'at'}) to the log. This class replays the log once and then only
+    reads new events, keeping an order id -> status map and one insertion-ordered set
+    of order ids per status. Status filters and fulfilment queues therefore cost
+    O(orders in that status), not O(all orders).
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self._lock = threading.RLock()
+        self._offset = 0
+        self._status: Dict[str, OrderStatus] = {}
+        # Dicts keep insertion order: ids are listed oldest transition first (FIFO work queues)
+        self._by_status: Dict[OrderStatus, Dict[str, None]] = {status: {} for status in OrderStatus}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Apply events written since the last refresh (also by other screens or processes)."""
+        with self._lock:
+            events, self._offset = self.storage.read_order_events(self._offset)
+            for event in events:
+                if event.get("reset"):
+                    self._status.clear()
+                    for ids in self._by_status.values():
+                        ids.clear()
+                    continue
+                self._apply(event.get("id"), event.get("status"))
+
+    def _apply(self, order_id: str, status: Optional[str]) -> None:
+        old = self._status.pop(order_id, None)
+        if old is not None:
+            self._by_status[old].pop(order_id, None)
+        try:
+            new = OrderStatus(status)
+        except ValueError:
+            # Deleted order (None) or a status this version does not know
+            return
+        self._status[order_id] = new
+        self._by_status[new][order_id] = None
+
+    # Queries
+    def status_of(self, order_id: str) -> Optional[OrderStatus]:
+        self.refresh()
+        with self._lock:
+            return self._status.get(order_id)
+
+    def order_ids(self, status: OrderStatus, limit: Optional[int] = None) -> List[str]:
+        """Ids of orders currently in status, in the order they reached it (oldest first)."""
+        self.refresh()
+        with self._lock:
+            ids = self._by_status[status]
+            if limit is None:
+                return list(ids)
+            result = []
+            for order_id in ids:
+                if len(result) >= limit:
+                    break
+                result.append(order_id)
+            return result
+
+    def counts(self) -> Dict[OrderStatus, int]:
+        self.refresh()
+        with self._lock:
+            return {status: len(ids) for status, ids in self._by_status.items()}
+
+    def history(self, order_id: str) -> List[Dict[str, Any]]:
+        """
+        Status changes of one order: [{'status', 'at'}, ...], oldest first.
+        Reads the whole event log, so it is meant for a single order's detail view.
+        """
+        history: List[Dict[str, Any]] = []
+        events, _ = self.storage.read_order_events(0)
+        for event in events:
+            if event.get("id") != order_id or event.get("status") is None:
+                continue
+            # A log reset re-records the current status; only actual changes are kept
+            if history and history[-1]["status"] == event["status"]:
+                continue
+            history.append({"status": event["status"], "at": event["at"]})
+        return history
+
+    # Transitions
+    def transition(self, order_id: str, new_status: OrderStatus) -> None:
+        """
+        Move an order to new_status.
+        Raises KeyError if the order does not exist and InvalidStatusTransition if the
+        change is not allowed by ORDER_TRANSITIONS.
+        """
+        def apply(order: Dict[str, Any]) -> bool:
+            # Runs inside the storage's read-modify-write cycle, so the status checked is the one replaced
+            # even when another process changes the order concurrently
+            current = OrderStatus(order.get('status', OrderStatus.CREATED.value))
+            if not current.can_transition_to(new_status):
+                raise InvalidStatusTransition(current, new_status)
+            order['status'] = new_status.value
+            return True
+
+        if not self.storage.modify_order(order_id, apply):
+            raise KeyError(order_id)
+        self.refresh()
@@ -1,4 +1,22 @@
 from decimal import Decimal
+from typing import NamedTuple
+
+
+class ProductView(NamedTuple):
+    """
+    Immutable copy of a product's fields, used in read-only catalogue snapshots.
+    """
+    id: str
+    name: str
+    description: str
+    price: Decimal
+    category: str
+    stock_quantity: int
+
+    def is_available(self) -> bool:
+        """Check if the product is available in stock."""
+        return self.stock_quantity > 0
+
 
 class Product:
     """
@@ -17,6 +35,10 @@ class Product:
         """Check if the product is available in stock."""
         return self.stock_quantity > 0
 
+    def view(self) -> ProductView:
+        """Return an immutable copy of the product's current state."""
+        return ProductView(self.id, self.name, self.description, self.price, self.category, self.stock_quantity)
+
     def decrease_stock(self, quantity: int) -> bool:
         """
         Decrease the stock quantity by the specified amount.
@@ -29,6 +29,13 @@ class CustomerNotificationObserver(NotificationObserver):
         print(timestamped_message)  # Terminale yaz
         logging.info(timestamped_message)  # Log dosyasına yaz
 
+# 🔔 Yönetici bildirimleri için observer (ör. düşük stok uyarıları)
+class AdminNotificationObserver(NotificationObserver):
+    def update(self, message: str) -> None:
+        timestamped_message = f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Admin Notification: {message}"
+        print(timestamped_message)
+        logging.warning(timestamped_message)
+
 # 🔔 Bildirim servisi (singleton)
 class NotificationService:
     _instance = None
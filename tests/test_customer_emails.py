@@ -0,0 +1,31 @@
+"""Müşteri e-posta indeksi: indekste yalnızca e-postalar durur, kayıtlar müşteri dosyasından okunur."""
+import json
+import os
+
+from src.data.storage import JsonStorage
+
+
+def _index_values(data_dir):
+    with open(os.path.join(data_dir, "customer_emails.jsonl")) as f:
+        return [json.loads(line)["value"] for line in f]
+
+
+def test_index_stores_emails_only(tmp_path):
+    storage = JsonStorage(str(tmp_path))
+    assert storage.register_customer("c1", "Ada", "ada@example.com", "secret", "Ankara", "555")
+    assert not storage.register_customer("c2", "Eda", "ada@example.com", "other", "İzmir", "556")
+    assert _index_values(str(tmp_path)) == ["ada@example.com"]
+    assert storage.authenticate_customer("ada@example.com", "secret")["name"] == "Ada"
+
+
+def test_legacy_index_with_records_is_rewritten(tmp_path):
+    data_dir = str(tmp_path)
+    customer = {"id": "c1", "name": "Ada", "email": "ada@example.com", "password": "secret"}
+    with open(os.path.join(data_dir, "customers.json"), "w") as f:
+        json.dump({"c1": customer}, f)
+    with open(os.path.join(data_dir, "customer_emails.jsonl"), "w") as f:
+        f.write(json.dumps({"key": "c1", "value": customer}) + "\n")
+
+    storage = JsonStorage(data_dir, shared=True)
+    assert storage.authenticate_customer("ada@example.com", "secret") == customer
+    assert _index_values(data_dir) == ["ada@example.com"]
@@ -0,0 +1,116 @@
+"""Paylaşımlı moddaki JsonStorage ve StockLedger için iki süreçli testler."""
+import json
+import multiprocessing
+import os
+
+from src.data.order_partitions import OrderPartitions
+from src.data.storage import JsonStorage
+from src.inventory.stock_ledger import StockLedger
+
+# Süreçler fork ile açılır: alt süreçte yapılan yama yalnızca o süreci etkiler.
+_mp = multiprocessing.get_context("fork")
+
+
+def _run(*processes):
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+
+def _ledger(data_dir):
+    return StockLedger(os.path.join(data_dir, "stock.ledger"), JsonStorage(data_dir, shared=True))
+
+
+def _increment(data_dir, times):
+    storage = JsonStorage(data_dir, shared=True, cas_retries=1000)
+
+    def bump(counter):
+        counter["value"] += 1
+        return True
+
+    for _ in range(times):
+        storage.update("counter", bump, {"value": 0})
+
+
+def test_concurrent_updates_are_not_lost(tmp_path):
+    data_dir = str(tmp_path)
+    _run(*(_mp.Process(target=_increment, args=(data_dir, 50)) for _ in range(4)))
+    assert JsonStorage(data_dir, shared=True).load_data("counter") == {"value": 200}
+
+
+def _consume(data_dir, product_id, times):
+    ledger = _ledger(data_dir)
+    for _ in range(times):
+        assert ledger.adjust(product_id, -1) is not None
+    ledger.close()
+
+
+def test_concurrent_adjusts_share_one_slot(tmp_path):
+    data_dir = str(tmp_path)
+    ledger = _ledger(data_dir)
+    ledger.ensure_many({"p1": 400, "p2": 10})
+    _run(*(_mp.Process(target=_consume, args=(data_dir, "p1", 100)) for _ in range(4)))
+    assert ledger.get("p1") == 0
+    assert ledger.get("p2") == 10
+
+
+def _replace_product(data_dir):
+    ledger = _ledger(data_dir)
+    ledger.remove("p4")
+    ledger.add("NEW", 50)
+    ledger.close()
+
+
+def test_removed_slot_is_not_written_through_a_stale_map(tmp_path):
+    data_dir = str(tmp_path)
+    ledger = _ledger(data_dir)
+    ledger.ensure_many({f"p{i}": 10 for i in range(6)})
+    # Diğer süreç p4'ü siler ve boşalan slotu yeni bir ürüne verir; bu süreçteki slot haritası eskidir.
+    _run(_mp.Process(target=_replace_product, args=(data_dir,)))
+    assert ledger.adjust("p4", -3) is None
+    assert ledger.adjust_many({"p5": -1, "NEW": -1}) == (True, {"p5": 9, "NEW": 49})
+    assert ledger.get("NEW") == 49
+    assert "p4" not in ledger
+
+
+def _open_partitioned(data_dir, started=None, resume=None):
+    if started is not None:
+        migrate = OrderPartitions._migrate_legacy_file
+
+        def paused_migrate(self):
+            # Göç başladığını bildirir ve diğer süreç açılana kadar bekler.
+            started.set()
+            resume.wait(10)
+            migrate(self)
+
+        OrderPartitions._migrate_legacy_file = paused_migrate
+    JsonStorage(data_dir, partition_orders="month", shared=True)
+
+
+def test_concurrent_openers_migrate_legacy_orders_once(tmp_path):
+    data_dir = str(tmp_path)
+    orders = [
+        {"id": f"o{i}", "customer_id": "c1", "total_price": "1.00", "status": "pending",
+         "date": f"2025-0{i % 9 + 1}-01"}
+        for i in range(30)
+    ]
+    with open(os.path.join(data_dir, "orders.json"), "w") as f:
+        json.dump(orders, f)
+
+    started, resume = _mp.Event(), _mp.Event()
+    first = _mp.Process(target=_open_partitioned, args=(data_dir, started, resume))
+    first.start()
+    assert started.wait(10)
+    # İkinci süreç ilk süreç göçün ortasındayken açılır.
+    second = _mp.Process(target=_open_partitioned, args=(data_dir,))
+    second.start()
+    second.join(0.5)
+    resume.set()
+    first.join(30)
+    second.join(30)
+    assert first.exitcode == 0 and second.exitcode == 0
+
+    storage = JsonStorage(data_dir, partition_orders="month", shared=True)
+    assert sorted(order["id"] for order in storage.load_orders()) == sorted(order["id"] for order in orders)